@@ -4,4 +4,8 @@ OUTPUT_DIR = "output"
 UPLOAD_DIR = "uploads"
 REFERENCE_FACE_POSITION =  0
 REFERENCE_FRAME_NUMBER = 107
+# Every identity to swap, as FRAME_NUMBER:FACE_POSITION pairs matched in a single pass
+REFERENCE_FACE_PAIRS = [f"{REFERENCE_FRAME_NUMBER}:{REFERENCE_FACE_POSITION}", "229:0"]
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Number of long-lived facefusion worker processes
+WORKER_COUNT = int(os.environ.get("WORKER_COUNT", "1"))
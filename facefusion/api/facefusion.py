@@ -1,14 +1,17 @@
-from fastapi import FastAPI, BackgroundTasks, UploadFile, HTTPException
+from fastapi import FastAPI, BackgroundTasks, Form, UploadFile, HTTPException
 from fastapi.responses import JSONResponse, FileResponse
-from . constants import TARGET_VIDEO, OUTPUT_DIR, UPLOAD_DIR, REFERENCE_FACE_POSITION, REFERENCE_FRAME_NUMBER
-import subprocess
+from . constants import TARGET_VIDEO, OUTPUT_DIR, UPLOAD_DIR, REFERENCE_FACE_PAIRS, WORKER_COUNT
+from . import worker_pool
+from contextlib import asynccontextmanager
 import os
 import uuid
 import shutil
 from pydantic import BaseModel
 from typing import Optional
 import logging
+import re
 import sys
+import threading
 from datetime import datetime
 
 # Enhanced logging setup
@@ -22,10 +25,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keep a pool of warm facefusion workers for the lifetime of the service."""
+    worker_pool.start_workers(WORKER_COUNT, handle_job_result, build_warmup_command())
+    yield
+    worker_pool.stop_workers()
+
+app = FastAPI(lifespan=lifespan)
 
 # (Swap to proper database)
 job_statuses = {}
+# Paths needed to finalize a job once its worker reports back
+job_payloads = {}
+# Guards job_statuses and job_payloads, the worker pool listener updates them from its own thread
+job_lock = threading.Lock()
 
 class JobStatus(BaseModel):
     job_id: str
@@ -41,11 +56,56 @@ def generate_unique_filename(original_filename: str) -> str:
     ext = os.path.splitext(original_filename)[1]
     return f"{str(uuid.uuid4())[:8]}{ext}"
 
-async def process_face_fusion(
+def parse_reference_face_pairs(reference_face_pairs: str) -> list:
+    """Split a comma or space separated list of FRAME_NUMBER:FACE_POSITION pairs."""
+    pairs = [pair for pair in re.split(r"[,\s]+", reference_face_pairs.strip()) if pair]
+    if not pairs or not all(re.fullmatch(r"\d+(:\d+)?", pair) for pair in pairs):
+        raise ValueError(f"Invalid reference face pairs: {reference_face_pairs}")
+    return pairs
+
+
+def build_processor_arguments() -> list:
+    """Processor and model selection shared by the jobs and the worker warm-up."""
+    return [
+        "--processors", "face_swapper",
+        "--face-swapper-model", "inswapper_128",
+    ]
+
+
+def build_execution_arguments() -> list:
+    """Execution and memory settings shared by the jobs and the worker warm-up."""
+    return [
+        # Keep the inference sessions of the worker alive between jobs
+        "--video-memory-strategy", "tolerant",
+    ]
+
+
+def build_warmup_command() -> list:
+    """Build the arguments that load every model a face swapper pass needs."""
+    return ["headless-run", *build_processor_arguments(), *build_execution_arguments(), "--warmup"]
+
+
+def build_headless_command(source_path: str, target_path: str, output_path: str, reference_face_pairs: list) -> list:
+    """Build the headless-run arguments for a single face swapper pass."""
+    return [
+        "headless-run",
+        *build_processor_arguments(),
+        "--source-paths", source_path,
+        "--target-path", target_path,
+        "--output-path", output_path,
+        "--reference-face-pairs", *reference_face_pairs,
+        "--output-video-quality", "95",
+        "--face-detector-score", "0.3",
+        *build_execution_arguments(),
+    ]
+
+
+def process_face_fusion(
     job_id: str,
     source_path: str,
+    reference_face_pairs: list,
 ):
-    """Background task to process face fusion."""
+    """Background task to queue a face fusion job on the worker pool."""
     start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     try:
         logger.info(f"Starting job {job_id} with source path: {source_path}")
@@ -59,137 +119,102 @@ async def process_face_fusion(
         # Create output directory if it doesn't exist
         os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-        # Generate unique output filename for the first run
-        first_output_path = os.path.join(OUTPUT_DIR, f"output_{job_id}_first_run.mp4")
-
-        # Construct command for the first run
-        first_command = [
-            sys.executable,  # Use current Python interpreter
-            "facefusion.py",
-            "headless-run",
-            "--processors", "face_swapper",
-            "--face-swapper-model", "inswapper_128",
-            "--source-paths", source_path,
-            "--target-path", TARGET_VIDEO,
-            "--output-path", first_output_path,
-            "--reference-face-position", str(REFERENCE_FACE_POSITION),
-            "--reference-frame-number", str(REFERENCE_FRAME_NUMBER),
-            "--output-video-quality", "95",
-            "--face-detector-score", "0.3",
-        ]
-
-        # Log the first command
-        first_command_str = " ".join(first_command)
-        logger.info(f"Executing first command: {first_command_str}")
-
-        # Run the first command
-        first_process = subprocess.Popen(
-            first_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True  # Return strings instead of bytes
-        )
-
-        stdout, stderr = first_process.communicate()
-        logger.info(f"First process stdout: {stdout}")
-        if stderr:
-            logger.error(f"First process stderr: {stderr}")
+        output_path = os.path.join(OUTPUT_DIR, f"output_{job_id}_final.mp4")
+
+        # Every reference is matched and swapped in the same pass
+        command = build_headless_command(source_path, TARGET_VIDEO, output_path, reference_face_pairs)
+        # The target video never changes, reuse its face index across jobs
+        command.append("--target-analysis")
+        command_str = " ".join(command)
+        logger.info(f"Queueing job {job_id}: {command_str}")
+
+        with job_lock:
+            job_payloads[job_id] = {
+                "source_path": source_path,
+                "temp_paths": [],
+                "output_path": output_path,
+                "command": command_str,
+                "start_time": start_time
+            }
+            job_statuses[job_id] = JobStatus(
+                job_id=job_id,
+                status="queued",
+                command=command_str,
+                start_time=start_time
+            )
+        worker_pool.submit_job(job_id, [command])
 
-        if first_process.returncode != 0 or not os.path.exists(first_output_path):
-            error_msg = f"First process failed with return code {first_process.returncode}\nSTDOUT:\n{stdout}\nSTDERR:\n{stderr}"
-            logger.error(f"Job {job_id} failed during first run: {error_msg}")
+    except Exception as e:
+        end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        error_msg = f"Error processing job {job_id}: {str(e)}"
+        logger.exception(error_msg)  # This will also log the stack trace
+        with job_lock:
             job_statuses[job_id] = JobStatus(
                 job_id=job_id,
                 status="failed",
                 error=error_msg,
-                command=first_command_str,
                 start_time=start_time,
-                end_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                end_time=end_time
             )
-            return
-
-        # Generate unique output filename for the second run
-        second_output_path = os.path.join(OUTPUT_DIR, f"output_{job_id}_final.mp4")
-
-        # Construct command for the second run
-        second_command = [
-            sys.executable,  # Use current Python interpreter
-            "facefusion.py",
-            "headless-run",
-            "--processors", "face_swapper",
-            "--face-swapper-model", "inswapper_128",
-            "--source-paths", source_path,
-            "--target-path", first_output_path,  # Use the output of the first run as the new target
-            "--output-path", second_output_path,
-            "--reference-face-position", "0",  # Updated parameters for the second run
-            "--reference-frame-number", "229",
-            "--output-video-quality", "95",
-            "--face-detector-score", "0.3",
-        ]
-
-        # Log the second command
-        second_command_str = " ".join(second_command)
-        logger.info(f"Executing second command: {second_command_str}")
-
-        # Run the second command
-        second_process = subprocess.Popen(
-            second_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True  # Return strings instead of bytes
-        )
-
-        stdout, stderr = second_process.communicate()
-        logger.info(f"Second process stdout: {stdout}")
-        if stderr:
-            logger.error(f"Second process stderr: {stderr}")
 
-        end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        if second_process.returncode == 0 and os.path.exists(second_output_path):
-            logger.info(f"Job {job_id} completed successfully")
+def handle_job_result(job_id: str, status: str, error: Optional[str]) -> None:
+    """Update the job status once a worker picked up or finished a job."""
+    if status == "started":
+        logger.info(f"Job {job_id} started on a worker")
+        with job_lock:
+            job_status = job_statuses.get(job_id)
+            if job_status:
+                job_status.status = "processing"
+        return
+
+    with job_lock:
+        job_payload = job_payloads.pop(job_id, {})
+    end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    output_path = job_payload.get("output_path")
+
+    if status == "completed" and output_path and os.path.exists(output_path):
+        logger.info(f"Job {job_id} completed successfully")
+        with job_lock:
             job_statuses[job_id] = JobStatus(
                 job_id=job_id,
                 status="completed",
-                output_path=second_output_path,
-                command=f"First command: {first_command_str}\nSecond command: {second_command_str}",
-                start_time=start_time,
+                output_path=output_path,
+                command=job_payload.get("command"),
+                start_time=job_payload.get("start_time"),
                 end_time=end_time
             )
 
-            # Delete the source file and first run output after processing
-            os.remove(source_path)
-            os.remove(first_output_path)
-        else:
-            error_msg = f"Second process failed with return code {second_process.returncode}\nSTDOUT:\n{stdout}\nSTDERR:\n{stderr}"
-            logger.error(f"Job {job_id} failed during second run: {error_msg}")
+        # Delete the source file and intermediate outputs after processing
+        for file_path in [job_payload.get("source_path")] + job_payload.get("temp_paths", []):
+            if file_path and os.path.exists(file_path):
+                os.remove(file_path)
+    else:
+        error_msg = error or f"Job {job_id} did not produce {output_path}"
+        logger.error(f"Job {job_id} failed: {error_msg}")
+        with job_lock:
             job_statuses[job_id] = JobStatus(
                 job_id=job_id,
                 status="failed",
                 error=error_msg,
-                command=f"First command: {first_command_str}\nSecond command: {second_command_str}",
-                start_time=start_time,
+                command=job_payload.get("command"),
+                start_time=job_payload.get("start_time"),
                 end_time=end_time
             )
 
-    except Exception as e:
-        end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        error_msg = f"Error processing job {job_id}: {str(e)}"
-        logger.exception(error_msg)  # This will also log the stack trace
-        job_statuses[job_id] = JobStatus(
-            job_id=job_id,
-            status="failed",
-            error=error_msg,
-            start_time=start_time,
-            end_time=end_time
-        )
-
 @app.post("/process-face-fusion/")
 async def create_face_fusion_job(
     background_tasks: BackgroundTasks,
     source_image: UploadFile,
+    reference_face_pairs: Optional[str] = Form(None),
 ):
     try:
+        # Validate the optional references, defaults to the configured pairs
+        try:
+            job_reference_face_pairs = parse_reference_face_pairs(reference_face_pairs) if reference_face_pairs else REFERENCE_FACE_PAIRS
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
         # Validate target video exists
         if not os.path.exists(TARGET_VIDEO):
             error_msg = f"Target video '{TARGET_VIDEO}' not found"
@@ -213,25 +238,29 @@ async def create_face_fusion_job(
             shutil.copyfileobj(source_image.file, buffer)
 
         # Initialize job status
-        job_statuses[job_id] = JobStatus(
-            job_id=job_id,
-            status="processing",
-            start_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
+        with job_lock:
+            job_statuses[job_id] = JobStatus(
+                job_id=job_id,
+                status="queued",
+                start_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            )
 
         # Add background task
         background_tasks.add_task(
             process_face_fusion,
             job_id,
             source_path,
+            job_reference_face_pairs,
         )
 
         return JSONResponse({
             "job_id": job_id,
-            "message": "Processing started",
-            "status": "processing"
+            "message": "Processing queued",
+            "status": "queued"
         })
 
+    except HTTPException:
+        raise
     except Exception as e:
         error_msg = f"Error creating job: {str(e)}"
         logger.exception(error_msg)
@@ -241,13 +270,14 @@ async def create_face_fusion_job(
 async def get_job_status(job_id: str):
     """Get the status of a processing job."""
     logger.info(f"Checking status for job {job_id}")
-    if job_id not in job_statuses:
+    with job_lock:
+        job_status = job_statuses.get(job_id)
+
+    if job_status is None:
         error_msg = f"Job {job_id} not found"
         logger.error(error_msg)
         raise HTTPException(status_code=404, detail=error_msg)
 
-    job_status = job_statuses[job_id]
-
     if job_status.status == "completed":
         return FileResponse(job_status.output_path, media_type="video/mp4", filename=f"output_{job_id}.mp4")
     else:
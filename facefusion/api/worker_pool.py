@@ -0,0 +1,219 @@
+import logging
+import multiprocessing
+import queue
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Result callback signature: (job_id, status, error)
+ResultHandler = Callable[[str, str, Optional[str]], None]
+
+WORKER_POOL: Dict[str, Any] = {
+    'context': None,
+    'job_queue': None,
+    'result_queue': None,
+    'workers': [],
+    'running_jobs': {},
+    'listener': None,
+    'result_handler': None,
+    'warmup_command': None
+}
+
+# Processor sets whose models this worker process already downloaded and hash-checked
+PRE_CHECKED_PROCESSORS: Set[Tuple[str, ...]] = set()
+
+
+def start_workers(worker_count: int, result_handler: ResultHandler, warmup_command: Optional[List[str]] = None) -> None:
+    """Spawn the long-lived facefusion workers and the result listener, optionally warming up their models first."""
+    context = multiprocessing.get_context('spawn')
+    WORKER_POOL['context'] = context
+    WORKER_POOL['job_queue'] = context.Queue()
+    WORKER_POOL['result_queue'] = context.Queue()
+    WORKER_POOL['result_handler'] = result_handler
+    WORKER_POOL['running_jobs'] = {}
+    WORKER_POOL['warmup_command'] = warmup_command
+    WORKER_POOL['workers'] = [spawn_worker() for _ in range(max(worker_count, 1))]
+
+    listener = threading.Thread(target=listen_results, name='worker-pool-listener', daemon=True)
+    listener.start()
+    WORKER_POOL['listener'] = listener
+    logger.info(f"Started {len(WORKER_POOL['workers'])} facefusion worker(s)")
+
+
+def stop_workers(timeout: float = 10.0) -> None:
+    """Ask every worker to finish its current job and exit."""
+    workers = WORKER_POOL.get('workers')
+
+    for _ in workers:
+        WORKER_POOL['job_queue'].put(None)
+    for worker in workers:
+        worker.join(timeout)
+        if worker.is_alive():
+            worker.terminate()
+    WORKER_POOL['workers'] = []
+
+    if WORKER_POOL.get('result_queue'):
+        WORKER_POOL['result_queue'].put(None)
+    if WORKER_POOL.get('listener'):
+        WORKER_POOL['listener'].join(timeout)
+    logger.info("Stopped facefusion workers")
+
+
+def submit_job(job_id: str, step_commands: List[List[str]]) -> None:
+    """Queue a job made of one or more headless-run commands, executed in order by one worker."""
+    WORKER_POOL['job_queue'].put((job_id, step_commands))
+
+
+def count_pending_jobs() -> int:
+    """Approximate number of jobs waiting for a free worker."""
+    try:
+        return WORKER_POOL['job_queue'].qsize()
+    except NotImplementedError:
+        return 0
+
+
+def spawn_worker() -> multiprocessing.Process:
+    context = WORKER_POOL.get('context')
+    worker = context.Process(target=run_worker, args=(WORKER_POOL.get('job_queue'), WORKER_POOL.get('result_queue'), WORKER_POOL.get('warmup_command')), daemon=True)
+    worker.start()
+    return worker
+
+
+def listen_results() -> None:
+    """Forward worker results to the result handler and replace workers that died mid-job."""
+    result_queue = WORKER_POOL.get('result_queue')
+    result_handler = WORKER_POOL.get('result_handler')
+    running_jobs = WORKER_POOL.get('running_jobs')
+
+    while True:
+        try:
+            result = result_queue.get(timeout=1.0)
+        except queue.Empty:
+            restore_workers()
+            continue
+        if result is None:
+            break
+
+        worker_pid, job_id, status, error = result
+        if status == 'started':
+            running_jobs[worker_pid] = job_id
+        else:
+            running_jobs.pop(worker_pid, None)
+        try:
+            result_handler(job_id, status, error)
+        except Exception:
+            logger.exception(f"Result handler failed for job {job_id}")
+
+
+def restore_workers() -> None:
+    result_handler = WORKER_POOL.get('result_handler')
+    running_jobs = WORKER_POOL.get('running_jobs')
+    workers = WORKER_POOL.get('workers')
+
+    for index, worker in enumerate(workers):
+        if not worker.is_alive():
+            job_id = running_jobs.pop(worker.pid, None)
+            logger.error(f"Worker {worker.pid} exited with code {worker.exitcode}, restarting")
+            if job_id:
+                result_handler(job_id, 'failed', f"Worker exited unexpectedly with code {worker.exitcode}")
+            workers[index] = spawn_worker()
+
+
+def run_worker(job_queue: multiprocessing.Queue, result_queue: multiprocessing.Queue, warmup_command: Optional[List[str]] = None) -> None:
+    """Worker entry point: keeps facefusion imported and its inference pools warm across jobs."""
+    import os
+
+    from facefusion.face_store import clear_static_faces
+
+    worker_pid = os.getpid()
+
+    if warmup_command:
+        try:
+            warm_up_worker(warmup_command)
+        except (Exception, SystemExit):
+            logger.exception(f"Worker {worker_pid} failed to prepare its models")
+
+    while True:
+        payload = job_queue.get()
+        if payload is None:
+            break
+
+        job_id, step_commands = payload
+        result_queue.put((worker_pid, job_id, 'started', None))
+        try:
+            if process_job(job_id, step_commands):
+                result_queue.put((worker_pid, job_id, 'completed', None))
+            else:
+                result_queue.put((worker_pid, job_id, 'failed', f"Processing of job {job_id} failed"))
+        except (Exception, SystemExit) as exception:
+            logger.exception(f"Worker {worker_pid} failed on job {job_id}")
+            result_queue.put((worker_pid, job_id, 'failed', repr(exception)))
+        finally:
+            clear_static_faces()
+
+
+def warm_up_worker(warmup_command: List[str]) -> None:
+    """Check the models of the command's processors and, with --warmup, build their inference pools before the first job."""
+    from facefusion import logger as facefusion_logger, state_manager
+    from facefusion.args import apply_args
+    from facefusion.core import warm_up
+    from facefusion.program import create_program
+
+    sys.argv = ['facefusion.py'] + warmup_command
+    program = create_program()
+    args = vars(program.parse_args(warmup_command))
+    apply_args(args, state_manager.init_item)
+    facefusion_logger.init(state_manager.get_item('log_level'))
+
+    if pre_check_worker() and state_manager.get_item('warmup'):
+        warm_up()
+
+
+def pre_check_worker() -> bool:
+    """Download and hash-check the models of the current processors, once per worker and processor set."""
+    from facefusion import state_manager
+    from facefusion.core import common_pre_check, processors_pre_check
+
+    processors = tuple(state_manager.get_item('processors'))
+
+    if processors not in PRE_CHECKED_PROCESSORS:
+        if not (common_pre_check() and processors_pre_check()):
+            logger.error(f"Pre check failed for processors {', '.join(processors)}")
+            return False
+        PRE_CHECKED_PROCESSORS.add(processors)
+    return True
+
+
+def process_job(job_id: str, step_commands: List[List[str]]) -> bool:
+    """Run every command as a step of a facefusion job, the same way headless-run does."""
+    from facefusion import logger as facefusion_logger, state_manager
+    from facefusion.args import apply_args, reduce_step_args
+    from facefusion.core import process_step
+    from facefusion.jobs import job_manager, job_runner
+    from facefusion.program import create_program
+
+    for step_index, step_command in enumerate(step_commands):
+        sys.argv = ['facefusion.py'] + step_command
+        program = create_program()
+        args = vars(program.parse_args(step_command))
+        apply_args(args, state_manager.init_item)
+        facefusion_logger.init(state_manager.get_item('log_level'))
+        facefusion_job_id = 'api-' + job_id + '-' + str(step_index)
+
+        if not pre_check_worker():
+            return False
+        if not job_manager.init_jobs(state_manager.get_item('jobs_path')):
+            return False
+        if not job_manager.create_job(facefusion_job_id):
+            return False
+        try:
+            if not (job_manager.add_step(facefusion_job_id, reduce_step_args(args)) and job_manager.submit_job(facefusion_job_id)):
+                return False
+            if not job_runner.run_job(facefusion_job_id, process_step):
+                return False
+        finally:
+            # The API tracks its own job status, drop the facefusion job file either way
+            job_manager.delete_job(facefusion_job_id)
+    return True
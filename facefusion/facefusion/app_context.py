@@ -1,10 +1,19 @@
 import os
 import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
 
 from facefusion.typing import AppContext
 
+APP_CONTEXT : ContextVar[Optional[AppContext]] = ContextVar('app_context', default = None)
+
 
 def detect_app_context() -> AppContext:
+	app_context = APP_CONTEXT.get()
+
+	if app_context:
+		return app_context
 	frame = sys._getframe(1)
 
 	while frame:
@@ -14,3 +23,17 @@ def detect_app_context() -> AppContext:
 			return 'ui'
 		frame = frame.f_back
 	return 'cli'
+
+
+def set_app_context(app_context : Optional[AppContext]) -> None:
+	APP_CONTEXT.set(app_context)
+
+
+@contextmanager
+def use_app_context(app_context : AppContext) -> Iterator[None]:
+	app_context_token = APP_CONTEXT.set(app_context)
+
+	try:
+		yield
+	finally:
+		APP_CONTEXT.reset(app_context_token)
@@ -1,7 +1,7 @@
 from facefusion import state_manager
 from facefusion.filesystem import is_image, is_video, list_directory
 from facefusion.jobs import job_store
-from facefusion.normalizer import normalize_fps, normalize_padding
+from facefusion.normalizer import normalize_fps, normalize_model_concurrency, normalize_padding, normalize_reference_face_pairs
 from facefusion.processors.core import get_processors_modules
 from facefusion.typing import ApplyStateItem, Args
 from facefusion.vision import create_image_resolutions, create_video_resolutions, detect_image_resolution, detect_video_fps, detect_video_resolution, pack_resolution
@@ -57,6 +57,8 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('face_detector_size', args.get('face_detector_size'))
 	apply_state_item('face_detector_angles', args.get('face_detector_angles'))
 	apply_state_item('face_detector_score', args.get('face_detector_score'))
+	apply_state_item('face_tracker_interval', args.get('face_tracker_interval'))
+	apply_state_item('face_tracker_score', args.get('face_tracker_score'))
 	# face landmarker
 	apply_state_item('face_landmarker_model', args.get('face_landmarker_model'))
 	apply_state_item('face_landmarker_score', args.get('face_landmarker_score'))
@@ -70,6 +72,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('reference_face_position', args.get('reference_face_position'))
 	apply_state_item('reference_face_distance', args.get('reference_face_distance'))
 	apply_state_item('reference_frame_number', args.get('reference_frame_number'))
+	apply_state_item('reference_face_pairs', normalize_reference_face_pairs(args.get('reference_face_pairs')))
 	# face masker
 	apply_state_item('face_occluder_model', args.get('face_occluder_model'))
 	apply_state_item('face_parser_model', args.get('face_parser_model'))
@@ -81,7 +84,9 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('trim_frame_start', args.get('trim_frame_start'))
 	apply_state_item('trim_frame_end', args.get('trim_frame_end'))
 	apply_state_item('temp_frame_format', args.get('temp_frame_format'))
+	apply_state_item('temp_frame_mode', args.get('temp_frame_mode'))
 	apply_state_item('keep_temp', args.get('keep_temp'))
+	apply_state_item('target_analysis', args.get('target_analysis'))
 	# output creation
 	apply_state_item('output_image_quality', args.get('output_image_quality'))
 	if is_image(args.get('target_path')):
@@ -109,6 +114,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	# processors
 	available_processors = [ file.get('name') for file in list_directory('facefusion/processors/modules') ]
 	apply_state_item('processors', args.get('processors'))
+	apply_state_item('processor_chain_mode', args.get('processor_chain_mode'))
 	for processor_module in get_processors_modules(available_processors):
 		processor_module.apply_args(args, apply_state_item)
 	# uis
@@ -117,17 +123,30 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('ui_workflow', args.get('ui_workflow'))
 	# execution
 	apply_state_item('execution_device_id', args.get('execution_device_id'))
+	apply_state_item('execution_device_ids', args.get('execution_device_ids'))
 	apply_state_item('execution_providers', args.get('execution_providers'))
 	apply_state_item('execution_thread_count', args.get('execution_thread_count'))
 	apply_state_item('execution_queue_count', args.get('execution_queue_count'))
+	apply_state_item('execution_batch_size', args.get('execution_batch_size'))
+	apply_state_item('execution_batch_window', args.get('execution_batch_window'))
+	apply_state_item('execution_mode', args.get('execution_mode'))
+	apply_state_item('execution_graph_optimization', args.get('execution_graph_optimization'))
+	apply_state_item('execution_quantized_models', args.get('execution_quantized_models'))
+	apply_state_item('execution_replica_count', args.get('execution_replica_count'))
+	apply_state_item('execution_concurrency', args.get('execution_concurrency'))
+	apply_state_item('execution_model_concurrency', normalize_model_concurrency(args.get('execution_model_concurrency')))
+	apply_state_item('warmup', args.get('warmup'))
 	# download
 	apply_state_item('download_providers', args.get('download_providers'))
 	apply_state_item('download_scope', args.get('download_scope'))
 	# memory
 	apply_state_item('video_memory_strategy', args.get('video_memory_strategy'))
 	apply_state_item('system_memory_limit', args.get('system_memory_limit'))
+	apply_state_item('inference_memory_limit', args.get('inference_memory_limit'))
+	apply_state_item('face_store_memory_limit', args.get('face_store_memory_limit'))
 	# misc
 	apply_state_item('log_level', args.get('log_level'))
+	apply_state_item('inference_statistics_path', args.get('inference_statistics_path'))
 	# jobs
 	apply_state_item('job_id', args.get('job_id'))
 	apply_state_item('job_status', args.get('job_status'))
@@ -1,8 +1,11 @@
 import logging
 from typing import List, Sequence
 
+import numpy
+from onnxruntime import GraphOptimizationLevel
+
 from facefusion.common_helper import create_float_range, create_int_range
-from facefusion.typing import Angle, DownloadProvider, DownloadProviderSet, DownloadScope, ExecutionProvider, ExecutionProviderSet, FaceDetectorModel, FaceDetectorSet, FaceLandmarkerModel, FaceMaskRegion, FaceMaskRegionSet, FaceMaskType, FaceOccluderModel, FaceParserModel, FaceSelectorMode, FaceSelectorOrder, Gender, JobStatus, LogLevel, LogLevelSet, OutputAudioEncoder, OutputVideoEncoder, OutputVideoPreset, Race, Score, TempFrameFormat, UiWorkflow, VideoMemoryStrategy
+from facefusion.typing import Angle, DownloadProvider, DownloadProviderSet, DownloadScope, ExecutionConcurrencyModel, ExecutionGraphOptimization, ExecutionGraphOptimizationSet, ExecutionMode, ExecutionProvider, ExecutionProviderSet, ExecutionQuantizedModel, FaceDetectorModel, FaceDetectorSet, FaceLandmarkerModel, FaceMaskRegion, FaceMaskRegionSet, FaceMaskType, FaceOccluderModel, FaceParserModel, FaceSelectorMode, FaceSelectorOrder, Gender, InferenceInputTypeSet, JobStatus, LogLevel, LogLevelSet, OutputAudioEncoder, OutputVideoEncoder, OutputVideoPreset, ProcessorChainMode, Race, Score, TempFrameFormat, TempFrameMode, UiWorkflow, VideoMemoryStrategy
 
 face_detector_set : FaceDetectorSet =\
 {
@@ -35,6 +38,8 @@ face_mask_region_set : FaceMaskRegionSet =\
 }
 face_mask_regions : List[FaceMaskRegion] = list(face_mask_region_set.keys())
 temp_frame_formats : List[TempFrameFormat] = [ 'bmp', 'jpg', 'png' ]
+temp_frame_modes : List[TempFrameMode] = [ 'disk', 'pipe' ]
+processor_chain_modes : List[ProcessorChainMode] = [ 'fused', 'sequential' ]
 output_audio_encoders : List[OutputAudioEncoder] = [ 'aac', 'libmp3lame', 'libopus', 'libvorbis' ]
 output_video_encoders : List[OutputVideoEncoder] = [ 'libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc', 'h264_amf', 'hevc_amf', 'h264_qsv', 'hevc_qsv', 'h264_videotoolbox', 'hevc_videotoolbox' ]
 output_video_presets : List[OutputVideoPreset] = [ 'ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow' ]
@@ -53,6 +58,25 @@ execution_provider_set : ExecutionProviderSet =\
 	'tensorrt': 'TensorrtExecutionProvider'
 }
 execution_providers : List[ExecutionProvider] = list(execution_provider_set.keys())
+execution_graph_optimization_set : ExecutionGraphOptimizationSet =\
+{
+	'disabled': GraphOptimizationLevel.ORT_DISABLE_ALL,
+	'basic': GraphOptimizationLevel.ORT_ENABLE_BASIC,
+	'extended': GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+	'all': GraphOptimizationLevel.ORT_ENABLE_ALL
+}
+execution_graph_optimizations : List[ExecutionGraphOptimization] = list(execution_graph_optimization_set.keys())
+execution_modes : List[ExecutionMode] = [ 'sequential', 'parallel' ]
+execution_concurrency_models : List[ExecutionConcurrencyModel] = [ 'age_modifier', 'deep_swapper', 'expression_restorer', 'face_detector', 'face_editor', 'face_enhancer', 'frame_colorizer' ]
+execution_quantized_models : List[ExecutionQuantizedModel] = [ 'arcface_w600k_r50_int8', 'inswapper_128_int8', 'retinaface_10g_int8', 'scrfd_2.5g_int8', 'xseg_1_int8', 'xseg_2_int8', 'yoloface_8n_int8' ]
+inference_input_type_set : InferenceInputTypeSet =\
+{
+	'tensor(float)': numpy.float32,
+	'tensor(float16)': numpy.float16,
+	'tensor(double)': numpy.float64,
+	'tensor(int32)': numpy.int32,
+	'tensor(int64)': numpy.int64
+}
 download_provider_set : DownloadProviderSet =\
 {
 	'github':
@@ -85,9 +109,17 @@ job_statuses : List[JobStatus] = [ 'drafted', 'queued', 'completed', 'failed' ]
 
 execution_thread_count_range : Sequence[int] = create_int_range(1, 32, 1)
 execution_queue_count_range : Sequence[int] = create_int_range(1, 4, 1)
+execution_batch_size_range : Sequence[int] = create_int_range(1, 32, 1)
+execution_batch_window_range : Sequence[int] = create_int_range(1, 100, 1)
+execution_replica_count_range : Sequence[int] = create_int_range(0, 32, 1)
+execution_concurrency_range : Sequence[int] = create_int_range(0, 32, 1)
 system_memory_limit_range : Sequence[int] = create_int_range(0, 128, 4)
+inference_memory_limit_range : Sequence[int] = create_int_range(0, 128, 1)
+face_store_memory_limit_range : Sequence[int] = create_int_range(0, 4096, 64)
 face_detector_angles : Sequence[Angle] = create_int_range(0, 270, 90)
 face_detector_score_range : Sequence[Score] = create_float_range(0.0, 1.0, 0.05)
+face_tracker_interval_range : Sequence[int] = create_int_range(0, 60, 1)
+face_tracker_score_range : Sequence[Score] = create_float_range(0.0, 1.0, 0.05)
 face_landmarker_score_range : Sequence[Score] = create_float_range(0.0, 1.0, 0.05)
 face_mask_blur_range : Sequence[float] = create_float_range(0.0, 1.0, 0.05)
 face_mask_padding_range : Sequence[int] = create_int_range(0, 100, 1)
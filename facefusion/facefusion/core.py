@@ -1,32 +1,40 @@
 import itertools
 import shutil
 import signal
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from time import time
+from types import ModuleType
+from typing import List
 
 import numpy
 
-from facefusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, logger, process_manager, state_manager, voice_extractor, wording
+from facefusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, voice_extractor, wording
+from facefusion.app_context import detect_app_context, set_app_context
 from facefusion.args import apply_args, collect_job_args, reduce_job_args, reduce_step_args
 from facefusion.common_helper import get_first
 from facefusion.content_analyser import analyse_image, analyse_video
 from facefusion.download import conditional_download_hashes, conditional_download_sources
 from facefusion.exit_helper import conditional_exit, graceful_exit, hard_exit
 from facefusion.face_analyser import get_average_face, get_many_faces, get_one_face
+from facefusion.face_index import analyse_face_index, clear_face_index
 from facefusion.face_selector import sort_and_filter_faces
-from facefusion.face_store import append_reference_face, clear_reference_faces, get_reference_faces
-from facefusion.ffmpeg import copy_image, extract_frames, finalize_image, merge_video, replace_audio, restore_audio
+from facefusion.face_store import append_reference_face, clear_reference_faces, clear_static_faces, get_reference_faces
+from facefusion.face_tracker import clear_face_tracks
+from facefusion.ffmpeg import close_video_encoder, copy_image, extract_frames, finalize_image, merge_video, open_video_decoder, open_video_encoder, read_video_frames, replace_audio, restore_audio, write_video_frame
 from facefusion.filesystem import filter_audio_paths, is_image, is_video, list_directory, resolve_file_pattern
+from facefusion.inference_profiler import clear_inference_profiles
 from facefusion.jobs import job_helper, job_manager, job_runner
 from facefusion.jobs.job_list import compose_job_list
 from facefusion.memory import limit_system_memory
-from facefusion.processors.core import get_processors_modules
+from facefusion.processors.core import get_processors_modules, multi_process_chain, multi_process_stream
 from facefusion.program import create_program
 from facefusion.program_helper import validate_args
-from facefusion.statistics import conditional_log_statistics
+from facefusion.statistics import conditional_log_statistics, conditional_write_inference_statistics
 from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_file_path, get_temp_frame_paths, move_temp_file
-from facefusion.typing import Args, ErrorCode
-from facefusion.vision import get_video_frame, pack_resolution, read_image, read_static_images, restrict_image_resolution, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, unpack_resolution
+from facefusion.typing import Args, ErrorCode, Fps, VisionFrame
+from facefusion.vision import count_trim_frame_total, get_video_frame, pack_resolution, read_image, read_static_images, restrict_image_resolution, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, unpack_resolution
 
 
 def cli() -> None:
@@ -60,6 +68,8 @@ def route(args : Args) -> None:
 		hard_exit(error_code)
 	if not pre_check():
 		return conditional_exit(2)
+	if state_manager.get_item('warmup') and not warm_up():
+		return conditional_exit(2)
 	if state_manager.get_item('command') == 'run':
 		import facefusion.uis.core as ui
 
@@ -101,18 +111,7 @@ def pre_check() -> bool:
 
 
 def common_pre_check() -> bool:
-	common_modules =\
-	[
-		content_analyser,
-		face_classifier,
-		face_detector,
-		face_landmarker,
-		face_masker,
-		face_recognizer,
-		voice_extractor
-	]
-
-	return all(module.pre_check() for module in common_modules)
+	return all(module.pre_check() for module in get_common_modules())
 
 
 def processors_pre_check() -> bool:
@@ -122,7 +121,7 @@ def processors_pre_check() -> bool:
 	return True
 
 
-def force_download() -> ErrorCode:
+def get_common_modules() -> List[ModuleType]:
 	common_modules =\
 	[
 		content_analyser,
@@ -133,6 +132,40 @@ def force_download() -> ErrorCode:
 		face_recognizer,
 		voice_extractor
 	]
+
+	return common_modules
+
+
+def warm_up() -> bool:
+	if common_pre_check() and processors_pre_check():
+		warm_up_modules = [ module for module in get_common_modules() if module is not voice_extractor ] + get_processors_modules(state_manager.get_item('processors'))
+
+		with ThreadPoolExecutor(max_workers = len(warm_up_modules), initializer = set_app_context, initargs = (detect_app_context(),)) as executor:
+			list(executor.map(warm_up_module, warm_up_modules))
+		return True
+	return False
+
+
+def warm_up_module(module : ModuleType) -> None:
+	start_time = time()
+	inference_pool = module.get_inference_pool()
+
+	if inference_pool:
+		seconds = '{:.2f}'.format(time() - start_time)
+		logger.info(wording.get('loading_inference_pool_succeed').format(module_name = module.__name__, seconds = seconds), __name__)
+
+		for model_name, inference_session in inference_pool.items():
+			start_time = time()
+
+			if inference_manager.warm_up_inference_session(inference_session):
+				seconds = '{:.2f}'.format(time() - start_time)
+				logger.info(wording.get('warming_up_model_succeed').format(model_name = model_name, seconds = seconds), __name__)
+			else:
+				logger.warn(wording.get('warming_up_model_failed').format(model_name = model_name), __name__)
+
+
+def force_download() -> ErrorCode:
+	common_modules = get_common_modules()
 	available_processors = [ file.get('name') for file in list_directory('facefusion/processors/modules') ]
 	processor_modules = get_processors_modules(available_processors)
 
@@ -292,6 +325,9 @@ def process_batch(args : Args) -> ErrorCode:
 
 def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
 	clear_reference_faces()
+	clear_static_faces()
+	clear_face_index()
+	clear_face_tracks()
 	step_total = job_manager.count_step_total(job_id)
 	step_args.update(collect_job_args())
 	apply_args(step_args, state_manager.set_item)
@@ -305,6 +341,7 @@ def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
 
 def conditional_process() -> ErrorCode:
 	start_time = time()
+	clear_inference_profiles()
 	for processor_module in get_processors_modules(state_manager.get_item('processors')):
 		if not processor_module.pre_process('output'):
 			return 2
@@ -321,21 +358,24 @@ def conditional_append_reference_faces() -> None:
 		source_frames = read_static_images(state_manager.get_item('source_paths'))
 		source_faces = get_many_faces(source_frames)
 		source_face = get_average_face(source_faces)
-		if is_video(state_manager.get_item('target_path')):
-			reference_frame = get_video_frame(state_manager.get_item('target_path'), state_manager.get_item('reference_frame_number'))
-		else:
-			reference_frame = read_image(state_manager.get_item('target_path'))
-		reference_faces = sort_and_filter_faces(get_many_faces([ reference_frame ]))
-		reference_face = get_one_face(reference_faces, state_manager.get_item('reference_face_position'))
-		append_reference_face('origin', reference_face)
+		reference_face_pairs = state_manager.get_item('reference_face_pairs') or [ (state_manager.get_item('reference_frame_number'), state_manager.get_item('reference_face_position')) ]
 
-		if source_face and reference_face:
-			for processor_module in get_processors_modules(state_manager.get_item('processors')):
-				abstract_reference_frame = processor_module.get_reference_frame(source_face, reference_face, reference_frame)
-				if numpy.any(abstract_reference_frame):
-					abstract_reference_faces = sort_and_filter_faces(get_many_faces([ abstract_reference_frame ]))
-					abstract_reference_face = get_one_face(abstract_reference_faces, state_manager.get_item('reference_face_position'))
-					append_reference_face(processor_module.__name__, abstract_reference_face)
+		for reference_frame_number, reference_face_position in reference_face_pairs:
+			if is_video(state_manager.get_item('target_path')):
+				reference_frame = get_video_frame(state_manager.get_item('target_path'), reference_frame_number)
+			else:
+				reference_frame = read_image(state_manager.get_item('target_path'))
+			reference_faces = sort_and_filter_faces(get_many_faces([ reference_frame ]))
+			reference_face = get_one_face(reference_faces, reference_face_position)
+			append_reference_face('origin', reference_face)
+
+			if source_face and reference_face:
+				for processor_module in get_processors_modules(state_manager.get_item('processors')):
+					abstract_reference_frame = processor_module.get_reference_frame(source_face, reference_face, reference_frame)
+					if numpy.any(abstract_reference_frame):
+						abstract_reference_faces = sort_and_filter_faces(get_many_faces([ abstract_reference_frame ]))
+						abstract_reference_face = get_one_face(abstract_reference_faces, reference_face_position)
+						append_reference_face(processor_module.__name__, abstract_reference_face)
 
 
 def process_image(start_time : float) -> ErrorCode:
@@ -380,6 +420,7 @@ def process_image(start_time : float) -> ErrorCode:
 		seconds = '{:.2f}'.format((time() - start_time) % 60)
 		logger.info(wording.get('processing_image_succeed').format(seconds = seconds), __name__)
 		conditional_log_statistics()
+		conditional_write_inference_statistics()
 	else:
 		logger.error(wording.get('processing_image_failed'), __name__)
 		process_manager.end()
@@ -398,44 +439,15 @@ def process_video(start_time : float) -> ErrorCode:
 	# create temp
 	logger.debug(wording.get('creating_temp'), __name__)
 	create_temp_directory(state_manager.get_item('target_path'))
-	# extract frames
 	process_manager.start()
 	temp_video_resolution = pack_resolution(restrict_video_resolution(state_manager.get_item('target_path'), unpack_resolution(state_manager.get_item('output_video_resolution'))))
 	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
-	logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__)
-	if extract_frames(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end):
-		logger.debug(wording.get('extracting_frames_succeed'), __name__)
-	else:
-		if is_process_stopping():
-			process_manager.end()
-			return 4
-		logger.error(wording.get('extracting_frames_failed'), __name__)
-		process_manager.end()
-		return 1
-	# process frames
-	temp_frame_paths = get_temp_frame_paths(state_manager.get_item('target_path'))
-	if temp_frame_paths:
-		for processor_module in get_processors_modules(state_manager.get_item('processors')):
-			logger.info(wording.get('processing'), processor_module.__name__)
-			processor_module.process_video(state_manager.get_item('source_paths'), temp_frame_paths)
-			processor_module.post_process()
-		if is_process_stopping():
-			return 4
+	if state_manager.get_item('temp_frame_mode') == 'pipe':
+		error_code = stream_video(temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end)
 	else:
-		logger.error(wording.get('temp_frames_not_found'), __name__)
-		process_manager.end()
-		return 1
-	# merge video
-	logger.info(wording.get('merging_video').format(resolution = state_manager.get_item('output_video_resolution'), fps = state_manager.get_item('output_video_fps')), __name__)
-	if merge_video(state_manager.get_item('target_path'), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')):
-		logger.debug(wording.get('merging_video_succeed'), __name__)
-	else:
-		if is_process_stopping():
-			process_manager.end()
-			return 4
-		logger.error(wording.get('merging_video_failed'), __name__)
-		process_manager.end()
-		return 1
+		error_code = extract_merge_video(temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end)
+	if error_code:
+		return error_code
 	# handle audio
 	if state_manager.get_item('skip_audio'):
 		logger.info(wording.get('skipping_audio'), __name__)
@@ -468,6 +480,7 @@ def process_video(start_time : float) -> ErrorCode:
 		seconds = '{:.2f}'.format((time() - start_time))
 		logger.info(wording.get('processing_video_succeed').format(seconds = seconds), __name__)
 		conditional_log_statistics()
+		conditional_write_inference_statistics()
 	else:
 		logger.error(wording.get('processing_video_failed'), __name__)
 		process_manager.end()
@@ -476,6 +489,92 @@ def process_video(start_time : float) -> ErrorCode:
 	return 0
 
 
+def extract_merge_video(temp_video_resolution : str, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> ErrorCode:
+	# extract frames
+	logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__)
+	if extract_frames(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end):
+		logger.debug(wording.get('extracting_frames_succeed'), __name__)
+	else:
+		if is_process_stopping():
+			process_manager.end()
+			return 4
+		logger.error(wording.get('extracting_frames_failed'), __name__)
+		process_manager.end()
+		return 1
+	# process frames
+	temp_frame_paths = get_temp_frame_paths(state_manager.get_item('target_path'))
+	if temp_frame_paths:
+		processor_modules = get_processors_modules(state_manager.get_item('processors'))
+		if state_manager.get_item('target_analysis'):
+			analyse_face_index(state_manager.get_item('target_path'), temp_frame_paths)
+		if state_manager.get_item('processor_chain_mode') == 'sequential':
+			for processor_module in processor_modules:
+				logger.info(wording.get('processing'), processor_module.__name__)
+				processor_module.process_video(state_manager.get_item('source_paths'), temp_frame_paths)
+				processor_module.post_process()
+		else:
+			logger.info(wording.get('processing'), __name__)
+			multi_process_chain(state_manager.get_item('source_paths'), temp_frame_paths, processor_modules)
+			for processor_module in processor_modules:
+				processor_module.post_process()
+		if is_process_stopping():
+			return 4
+	else:
+		logger.error(wording.get('temp_frames_not_found'), __name__)
+		process_manager.end()
+		return 1
+	# merge video
+	logger.info(wording.get('merging_video').format(resolution = state_manager.get_item('output_video_resolution'), fps = state_manager.get_item('output_video_fps')), __name__)
+	if merge_video(state_manager.get_item('target_path'), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')):
+		logger.debug(wording.get('merging_video_succeed'), __name__)
+	else:
+		if is_process_stopping():
+			process_manager.end()
+			return 4
+		logger.error(wording.get('merging_video_failed'), __name__)
+		process_manager.end()
+		return 1
+	return 0
+
+
+def stream_video(temp_video_resolution : str, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> ErrorCode:
+	stream_frame_total = count_trim_frame_total(state_manager.get_item('target_path'), trim_frame_start, trim_frame_end)
+	processor_modules = get_processors_modules(state_manager.get_item('processors'))
+	logger.info(wording.get('streaming_video').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__)
+	decoder_process = open_video_decoder(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end)
+	encoder_processes : List[subprocess.Popen[bytes]] = []
+
+	# processors like the frame enhancer change the frame size, the encoder is opened with the first processed frame
+	def write_vision_frame(vision_frame : VisionFrame) -> None:
+		if not encoder_processes:
+			stream_video_resolution = pack_resolution((vision_frame.shape[1], vision_frame.shape[0]))
+			encoder_processes.append(open_video_encoder(state_manager.get_item('target_path'), stream_video_resolution, state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')))
+		write_video_frame(get_first(encoder_processes), vision_frame)
+
+	try:
+		vision_frames = read_video_frames(decoder_process, temp_video_resolution)
+		multi_process_stream(state_manager.get_item('source_paths'), processor_modules, vision_frames, write_vision_frame, stream_frame_total)
+	except BrokenPipeError:
+		logger.debug(wording.get('streaming_video_failed'), __name__)
+	decoder_process.stdout.close()
+	if decoder_process.poll() is None:
+		decoder_process.terminate()
+	decoder_process.wait()
+	encoder_process = get_first(encoder_processes)
+	is_encoded = encoder_process and close_video_encoder(encoder_process)
+
+	for processor_module in processor_modules:
+		processor_module.post_process()
+	if is_process_stopping():
+		return 4
+	if is_encoded:
+		logger.debug(wording.get('streaming_video_succeed'), __name__)
+		return 0
+	logger.error(wording.get('streaming_video_failed'), __name__)
+	process_manager.end()
+	return 1
+
+
 def is_process_stopping() -> bool:
 	if process_manager.is_stopping():
 		process_manager.end()
@@ -1,12 +1,15 @@
+import platform
 import shutil
 import subprocess
 import xml.etree.ElementTree as ElementTree
 from functools import lru_cache
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from onnxruntime import get_available_providers, set_default_logger_severity
 
 import facefusion.choices
+from facefusion.common_helper import is_macos
+from facefusion.filesystem import is_file
 from facefusion.typing import ExecutionDevice, ExecutionProvider, ValueAndUnit
 
 set_default_logger_severity(3)
@@ -79,6 +82,30 @@ def run_nvidia_smi() -> subprocess.Popen[bytes]:
 	return subprocess.Popen(commands, stdout = subprocess.PIPE)
 
 
+@lru_cache(maxsize = None)
+def detect_static_cpu_identity() -> str:
+	return detect_cpu_identity()
+
+
+def detect_cpu_identity() -> str:
+	cpu_identity_parts = [ platform.machine(), platform.processor() ]
+
+	if is_file('/proc/cpuinfo'):
+		cpu_info_set : Dict[str, str] = {}
+
+		with open('/proc/cpuinfo') as cpu_info_file:
+			for cpu_info_line in cpu_info_file:
+				cpu_info_key, _, cpu_info_value = cpu_info_line.partition(':')
+				cpu_info_set.setdefault(cpu_info_key.strip(), cpu_info_value.strip())
+		cpu_identity_parts.extend(cpu_info_set.get(cpu_info_key) for cpu_info_key in [ 'vendor_id', 'model name', 'CPU implementer', 'CPU part', 'flags', 'Features' ] if cpu_info_key in cpu_info_set)
+	if is_macos():
+		try:
+			cpu_identity_parts.append(subprocess.check_output([ 'sysctl', '-n', 'machdep.cpu.brand_string' ]).decode().strip())
+		except Exception:
+			pass
+	return '|'.join(map(str, cpu_identity_parts))
+
+
 @lru_cache(maxsize = None)
 def detect_static_execution_devices() -> List[ExecutionDevice]:
 	return detect_execution_devices()
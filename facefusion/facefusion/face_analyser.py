@@ -1,16 +1,19 @@
+from functools import partial
 from typing import List, Optional
 
 import numpy
 
 from facefusion import state_manager
 from facefusion.common_helper import get_first
-from facefusion.face_classifier import classify_face
+from facefusion.face_classifier import classify_crop, warp_classify_crop
 from facefusion.face_detector import detect_faces, detect_rotated_faces
 from facefusion.face_helper import apply_nms, convert_to_face_landmark_5, estimate_face_angle, get_nms_threshold
 from facefusion.face_landmarker import detect_face_landmarks, estimate_face_landmark_68_5
-from facefusion.face_recognizer import calc_embedding
+from facefusion.face_recognizer import calc_crop_embedding, warp_embedding_crop
 from facefusion.face_store import get_static_faces, set_static_faces
-from facefusion.typing import BoundingBox, Face, FaceLandmark5, FaceLandmarkSet, FaceScoreSet, Score, VisionFrame
+from facefusion.face_tracker import start_face_track, track_faces
+from facefusion.frame_context import get_frame_faces, set_frame_faces
+from facefusion.typing import BoundingBox, Face, FaceAnalysis, FaceLandmark5, FaceLandmarkSet, FaceScoreSet, Score, VisionFrame
 
 
 def create_faces(vision_frame : VisionFrame, bounding_boxes : List[BoundingBox], face_scores : List[Score], face_landmarks_5 : List[FaceLandmark5]) -> List[Face]:
@@ -45,18 +48,22 @@ def create_faces(vision_frame : VisionFrame, bounding_boxes : List[BoundingBox],
 			'detector': face_score,
 			'landmarker': face_landmark_score_68
 		}
-		embedding, normed_embedding = calc_embedding(vision_frame, face_landmark_set.get('5/68'))
-		gender, age, race = classify_face(vision_frame, face_landmark_set.get('5/68'))
+		face_analysis : FaceAnalysis =\
+		{
+			'embedding': None,
+			'normed_embedding': None,
+			'gender': None,
+			'age': None,
+			'race': None,
+			'calc_embedding': partial(calc_crop_embedding, warp_embedding_crop(vision_frame, face_landmark_set.get('5/68'))),
+			'classify_face': partial(classify_crop, warp_classify_crop(vision_frame, face_landmark_set.get('5/68')))
+		}
 		faces.append(Face(
 			bounding_box = bounding_box,
 			score_set = face_score_set,
 			landmark_set = face_landmark_set,
 			angle = face_angle,
-			embedding = embedding,
-			normed_embedding = normed_embedding,
-			gender = gender,
-			age = age,
-			race = race
+			face_analysis = face_analysis
 		))
 	return faces
 
@@ -93,32 +100,50 @@ def get_average_face(faces : List[Face]) -> Optional[Face]:
 	return None
 
 
+def analyse_faces(faces : List[Face]) -> List[Face]:
+	for face in faces:
+		face.analyse_embedding()
+		face.analyse_classification()
+	return faces
+
+
 def get_many_faces(vision_frames : List[VisionFrame]) -> List[Face]:
 	many_faces : List[Face] = []
 
 	for vision_frame in vision_frames:
-		if numpy.any(vision_frame):
+		frame_faces = get_frame_faces(vision_frame)
+		if frame_faces is not None:
+			many_faces.extend(frame_faces)
+		elif numpy.any(vision_frame):
 			static_faces = get_static_faces(vision_frame)
-			if static_faces:
+			if static_faces is not None:
 				many_faces.extend(static_faces)
+				set_frame_faces(vision_frame, static_faces)
 			else:
-				all_bounding_boxes = []
-				all_face_scores = []
-				all_face_landmarks_5 = []
-
-				for face_detector_angle in state_manager.get_item('face_detector_angles'):
-					if face_detector_angle == 0:
-						bounding_boxes, face_scores, face_landmarks_5 = detect_faces(vision_frame)
-					else:
-						bounding_boxes, face_scores, face_landmarks_5 = detect_rotated_faces(vision_frame, face_detector_angle)
-					all_bounding_boxes.extend(bounding_boxes)
-					all_face_scores.extend(face_scores)
-					all_face_landmarks_5.extend(face_landmarks_5)
-
-				if all_bounding_boxes and all_face_scores and all_face_landmarks_5 and state_manager.get_item('face_detector_score') > 0:
-					faces = create_faces(vision_frame, all_bounding_boxes, all_face_scores, all_face_landmarks_5)
-
-					if faces:
-						many_faces.extend(faces)
-						set_static_faces(vision_frame, faces)
+				faces = track_faces(vision_frame)
+
+				if faces is None:
+					faces = start_face_track(vision_frame, detect_many_faces(vision_frame))
+				if not set_frame_faces(vision_frame, faces) and faces:
+					set_static_faces(vision_frame, faces)
+				many_faces.extend(faces)
 	return many_faces
+
+
+def detect_many_faces(vision_frame : VisionFrame) -> List[Face]:
+	all_bounding_boxes = []
+	all_face_scores = []
+	all_face_landmarks_5 = []
+
+	for face_detector_angle in state_manager.get_item('face_detector_angles'):
+		if face_detector_angle == 0:
+			bounding_boxes, face_scores, face_landmarks_5 = detect_faces(vision_frame)
+		else:
+			bounding_boxes, face_scores, face_landmarks_5 = detect_rotated_faces(vision_frame, face_detector_angle)
+		all_bounding_boxes.extend(bounding_boxes)
+		all_face_scores.extend(face_scores)
+		all_face_landmarks_5.extend(face_landmarks_5)
+
+	if all_bounding_boxes and all_face_scores and all_face_landmarks_5 and state_manager.get_item('face_detector_score') > 0:
+		return create_faces(vision_frame, all_bounding_boxes, all_face_scores, all_face_landmarks_5)
+	return []
@@ -62,11 +62,20 @@ def pre_check() -> bool:
 
 
 def classify_face(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[Gender, Age, Race]:
+	crop_vision_frame = warp_classify_crop(temp_vision_frame, face_landmark_5)
+	return classify_crop(crop_vision_frame)
+
+
+def warp_classify_crop(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
+	crop_vision_frame, _ = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
+	return crop_vision_frame
+
+
+def classify_crop(crop_vision_frame : VisionFrame) -> Tuple[Gender, Age, Race]:
 	model_mean = get_model_options().get('mean')
 	model_standard_deviation = get_model_options().get('standard_deviation')
-	crop_vision_frame, _ = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
 	crop_vision_frame = crop_vision_frame.astype(numpy.float32)[:, :, ::-1] / 255
 	crop_vision_frame -= model_mean
 	crop_vision_frame /= model_standard_deviation
@@ -8,7 +8,7 @@ from facefusion import inference_manager, state_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.face_helper import create_rotated_matrix_and_size, create_static_anchors, distance_to_bounding_box, distance_to_face_landmark_5, normalize_bounding_box, transform_bounding_box, transform_points
 from facefusion.filesystem import resolve_relative_path
-from facefusion.thread_helper import thread_semaphore
+from facefusion.thread_helper import conditional_model_semaphore
 from facefusion.typing import Angle, BoundingBox, Detection, DownloadScope, DownloadSet, FaceLandmark5, InferencePool, ModelSet, Score, VisionFrame
 from facefusion.vision import resize_frame_resolution, unpack_resolution
 
@@ -272,8 +272,8 @@ def detect_with_yoloface(vision_frame : VisionFrame, face_detector_size : str) -
 def forward_with_retinaface(detect_vision_frame : VisionFrame) -> Detection:
 	face_detector = get_inference_pool().get('retinaface')
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
+	with conditional_model_semaphore(__name__):
+		detection = inference_manager.run_inference_session(face_detector,
 		{
 			'input': detect_vision_frame
 		})
@@ -284,8 +284,8 @@ def forward_with_retinaface(detect_vision_frame : VisionFrame) -> Detection:
 def forward_with_scrfd(detect_vision_frame : VisionFrame) -> Detection:
 	face_detector = get_inference_pool().get('scrfd')
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
+	with conditional_model_semaphore(__name__):
+		detection = inference_manager.run_inference_session(face_detector,
 		{
 			'input': detect_vision_frame
 		})
@@ -296,8 +296,8 @@ def forward_with_scrfd(detect_vision_frame : VisionFrame) -> Detection:
 def forward_with_yoloface(detect_vision_frame : VisionFrame) -> Detection:
 	face_detector = get_inference_pool().get('yoloface')
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
+	with conditional_model_semaphore(__name__):
+		detection = inference_manager.run_inference_session(face_detector,
 		{
 			'input': detect_vision_frame
 		})
@@ -1,10 +1,11 @@
 from functools import lru_cache
-from typing import List, Sequence, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 import cv2
 import numpy
 from cv2.typing import Size
 
+from facefusion.frame_context import create_matrix_key, get_frame_matrix, set_frame_matrix
 from facefusion.typing import Anchors, Angle, BoundingBox, Distance, FaceDetectorModel, FaceLandmark5, FaceLandmark68, Mask, Matrix, Points, Scale, Score, Translation, VisionFrame, WarpTemplate, WarpTemplateSet
 
 WARP_TEMPLATES : WarpTemplateSet =\
@@ -69,8 +70,14 @@ WARP_TEMPLATES : WarpTemplateSet =\
 
 
 def estimate_matrix_by_face_landmark_5(face_landmark_5 : FaceLandmark5, warp_template : WarpTemplate, crop_size : Size) -> Matrix:
-	normed_warp_template = WARP_TEMPLATES.get(warp_template) * crop_size
-	affine_matrix = cv2.estimateAffinePartial2D(face_landmark_5, normed_warp_template, method = cv2.RANSAC, ransacReprojThreshold = 100)[0]
+	matrix_key = create_matrix_key(face_landmark_5, warp_template, crop_size)
+	affine_matrix = get_frame_matrix(matrix_key) if matrix_key else None
+
+	if affine_matrix is None:
+		normed_warp_template = WARP_TEMPLATES.get(warp_template) * crop_size
+		affine_matrix = cv2.estimateAffinePartial2D(face_landmark_5, normed_warp_template, method = cv2.RANSAC, ransacReprojThreshold = 100)[0]
+		if matrix_key:
+			set_frame_matrix(matrix_key, affine_matrix)
 	return affine_matrix
 
 
@@ -99,15 +106,48 @@ def warp_face_by_translation(temp_vision_frame : VisionFrame, translation : Tran
 
 
 def paste_back(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_mask : Mask, affine_matrix : Matrix) -> VisionFrame:
-	inverse_matrix = cv2.invertAffineTransform(affine_matrix)
-	temp_size = temp_vision_frame.shape[:2][::-1]
-	inverse_mask = cv2.warpAffine(crop_mask, inverse_matrix, temp_size).clip(0, 1)
-	inverse_vision_frame = cv2.warpAffine(crop_vision_frame, inverse_matrix, temp_size, borderMode = cv2.BORDER_REPLICATE)
 	paste_vision_frame = temp_vision_frame.copy()
-	paste_vision_frame[:, :, 0] = inverse_mask * inverse_vision_frame[:, :, 0] + (1 - inverse_mask) * temp_vision_frame[:, :, 0]
-	paste_vision_frame[:, :, 1] = inverse_mask * inverse_vision_frame[:, :, 1] + (1 - inverse_mask) * temp_vision_frame[:, :, 1]
-	paste_vision_frame[:, :, 2] = inverse_mask * inverse_vision_frame[:, :, 2] + (1 - inverse_mask) * temp_vision_frame[:, :, 2]
-	return paste_vision_frame
+	return paste_back_in_place(paste_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+
+
+def paste_back_in_place(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_mask : Mask, affine_matrix : Matrix) -> VisionFrame:
+	inverse_matrix = cv2.invertAffineTransform(affine_matrix)
+	paste_bounding_box = calc_paste_bounding_box(temp_vision_frame, crop_vision_frame, inverse_matrix)
+
+	if paste_bounding_box:
+		x1, y1, x2, y2 = paste_bounding_box
+		paste_matrix = inverse_matrix - [ [ 0, 0, x1 ], [ 0, 0, y1 ] ]
+		paste_size = (x2 - x1, y2 - y1)
+		inverse_mask = cv2.warpAffine(crop_mask.astype(numpy.float32), paste_matrix, paste_size).clip(0, 1)
+		inverse_mask = numpy.expand_dims(inverse_mask, axis = -1)
+		inverse_vision_frame = cv2.warpAffine(crop_vision_frame.astype(numpy.float32), paste_matrix, paste_size, borderMode = cv2.BORDER_REPLICATE)
+		paste_vision_frame = temp_vision_frame[y1:y2, x1:x2]
+		temp_vision_frame[y1:y2, x1:x2] = inverse_mask * inverse_vision_frame + (1 - inverse_mask) * paste_vision_frame
+	return temp_vision_frame
+
+
+def calc_paste_bounding_box(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, inverse_matrix : Matrix) -> Optional[Tuple[int, int, int, int]]:
+	crop_height, crop_width = crop_vision_frame.shape[:2]
+	temp_height, temp_width = temp_vision_frame.shape[:2]
+	crop_points = numpy.array([ [ 0, 0 ], [ crop_width, 0 ], [ 0, crop_height ], [ crop_width, crop_height ] ], dtype = numpy.float32)
+	paste_points = transform_points(crop_points, inverse_matrix)
+	x1, y1 = numpy.floor(paste_points.min(axis = 0)).astype(int).tolist()
+	x2, y2 = numpy.ceil(paste_points.max(axis = 0)).astype(int).tolist()
+	x1, y1 = max(x1 - 1, 0), max(y1 - 1, 0)
+	x2, y2 = min(x2 + 1, temp_width), min(y2 + 1, temp_height)
+
+	if x2 > x1 and y2 > y1:
+		return x1, y1, x2, y2
+	return None
+
+
+def calc_crop_bounding_box(affine_matrix : Matrix, crop_size : Size) -> BoundingBox:
+	inverse_matrix = cv2.invertAffineTransform(affine_matrix)
+	return transform_bounding_box(numpy.array([ 0, 0, crop_size[0], crop_size[1] ]), inverse_matrix)
+
+
+def has_bounding_box_overlap(bounding_box : BoundingBox, other_bounding_box : BoundingBox) -> bool:
+	return bool(bounding_box[0] < other_bounding_box[2] and other_bounding_box[0] < bounding_box[2] and bounding_box[1] < other_bounding_box[3] and other_bounding_box[1] < bounding_box[3])
 
 
 @lru_cache(maxsize = None)
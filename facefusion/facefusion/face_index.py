@@ -0,0 +1,203 @@
+import hashlib
+import os
+import tempfile
+from typing import List, Optional
+
+import numpy
+
+import facefusion.choices
+from facefusion import logger, state_manager, wording
+from facefusion.face_analyser import analyse_faces, get_many_faces
+from facefusion.filesystem import create_directory, is_directory, remove_directory, resolve_relative_path
+from facefusion.frame_context import clear_frame_context, create_frame_context, set_frame_context
+from facefusion.hash_helper import create_file_hash
+from facefusion.processors.core import multi_process_frames
+from facefusion.typing import Face, FaceIndex, FaceIndexArrays, FaceIndexFrames, QueuePayload, UpdateProgress
+from facefusion.vision import read_image
+
+FACE_INDEX : FaceIndex =\
+{
+	'frame_total': 0,
+	'frames': {},
+	'arrays': {}
+}
+
+
+def get_face_index_path(target_path : str) -> str:
+	face_index_key = create_face_index_key(target_path)
+	return os.path.join(resolve_relative_path('../.caches'), 'face_index', face_index_key)
+
+
+def create_face_index_key(target_path : str) -> str:
+	face_index_parts =\
+	[
+		create_file_hash(target_path),
+		state_manager.get_item('output_video_resolution'),
+		state_manager.get_item('output_video_fps'),
+		state_manager.get_item('trim_frame_start'),
+		state_manager.get_item('trim_frame_end'),
+		state_manager.get_item('temp_frame_format'),
+		state_manager.get_item('face_detector_model'),
+		state_manager.get_item('face_detector_size'),
+		state_manager.get_item('face_detector_angles'),
+		state_manager.get_item('face_detector_score'),
+		state_manager.get_item('face_tracker_interval'),
+		state_manager.get_item('face_tracker_score'),
+		state_manager.get_item('face_landmarker_model'),
+		state_manager.get_item('face_landmarker_score')
+	]
+	return hashlib.sha1('|'.join(map(str, face_index_parts)).encode()).hexdigest()
+
+
+def analyse_face_index(target_path : str, temp_frame_paths : List[str]) -> bool:
+	face_index_path = get_face_index_path(target_path)
+	frame_total = len(temp_frame_paths)
+
+	if is_directory(face_index_path) and load_face_index(face_index_path) and FACE_INDEX.get('frame_total') == frame_total:
+		logger.debug(wording.get('loading_face_index_succeed'), __name__)
+		return True
+	clear_face_index()
+	logger.info(wording.get('analysing_target'), __name__)
+	multi_process_frames([], temp_frame_paths, analyse_frames)
+	FACE_INDEX['frame_total'] = frame_total
+	return save_face_index(face_index_path)
+
+
+def analyse_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+	for queue_payload in queue_payloads:
+		target_vision_frame = read_image(queue_payload.get('frame_path'))
+		set_frame_context(create_frame_context(target_vision_frame, queue_payload.get('frame_number')))
+
+		try:
+			FACE_INDEX['frames'][queue_payload.get('frame_number')] = analyse_faces(get_many_faces([ target_vision_frame ]))
+		finally:
+			clear_frame_context()
+		update_progress(1)
+
+
+def get_index_faces(frame_number : int) -> Optional[List[Face]]:
+	if 0 <= frame_number < FACE_INDEX.get('frame_total'):
+		index_faces = FACE_INDEX.get('frames').get(frame_number)
+
+		if index_faces is None and FACE_INDEX.get('arrays'):
+			index_faces = unpack_index_faces(FACE_INDEX.get('arrays'), frame_number)
+			FACE_INDEX['frames'][frame_number] = index_faces
+		return index_faces or []
+	return None
+
+
+def clear_face_index() -> None:
+	FACE_INDEX['frame_total'] = 0
+	FACE_INDEX['frames'] = {}
+	FACE_INDEX['arrays'] = {}
+
+
+def load_face_index(face_index_path : str) -> bool:
+	try:
+		face_index_arrays = {}
+
+		for array_name in list(pack_face_index({})) + [ 'frame_total' ]:
+			face_index_arrays[array_name] = numpy.load(os.path.join(face_index_path, array_name + '.npy'), mmap_mode = 'r')
+		frame_total = int(face_index_arrays.pop('frame_total'))
+		face_index_arrays['frame_offsets'] = numpy.searchsorted(face_index_arrays.get('frame_numbers'), numpy.arange(frame_total + 1))
+		FACE_INDEX['frame_total'] = frame_total
+		FACE_INDEX['frames'] = {}
+		FACE_INDEX['arrays'] = face_index_arrays
+		return True
+	except (OSError, ValueError, KeyError):
+		clear_face_index()
+		return False
+
+
+def save_face_index(face_index_path : str) -> bool:
+	face_index_arrays = pack_face_index(FACE_INDEX.get('frames'))
+	face_index_arrays['frame_total'] = numpy.array(FACE_INDEX.get('frame_total'))
+
+	if create_directory(os.path.dirname(face_index_path)):
+		temp_face_index_path = tempfile.mkdtemp(prefix = os.path.basename(face_index_path) + '.', dir = os.path.dirname(face_index_path))
+
+		for array_name, face_index_array in face_index_arrays.items():
+			numpy.save(os.path.join(temp_face_index_path, array_name + '.npy'), face_index_array)
+		if load_face_index_frame_total(face_index_path) != FACE_INDEX.get('frame_total'):
+			remove_directory(face_index_path)
+			try:
+				os.replace(temp_face_index_path, face_index_path)
+			except OSError:
+				pass
+		remove_directory(temp_face_index_path)
+		return load_face_index_frame_total(face_index_path) == FACE_INDEX.get('frame_total')
+	return False
+
+
+def load_face_index_frame_total(face_index_path : str) -> Optional[int]:
+	try:
+		return int(numpy.load(os.path.join(face_index_path, 'frame_total.npy')))
+	except (OSError, ValueError):
+		return None
+
+
+def pack_face_index(face_index_frames : FaceIndexFrames) -> FaceIndexArrays:
+	frame_numbers = []
+	faces = []
+
+	for frame_number in sorted(face_index_frames):
+		for face in face_index_frames.get(frame_number):
+			frame_numbers.append(frame_number)
+			faces.append(face)
+
+	return\
+	{
+		'frame_numbers': numpy.array(frame_numbers, dtype = numpy.int32),
+		'bounding_boxes': numpy.array([ face.bounding_box for face in faces ], dtype = numpy.float32).reshape(-1, 4),
+		'detector_scores': numpy.array([ face.score_set.get('detector') for face in faces ], dtype = numpy.float32),
+		'landmarker_scores': numpy.array([ face.score_set.get('landmarker') for face in faces ], dtype = numpy.float32),
+		'landmarks_5': numpy.array([ face.landmark_set.get('5') for face in faces ], dtype = numpy.float32).reshape(-1, 5, 2),
+		'landmarks_5_68': numpy.array([ face.landmark_set.get('5/68') for face in faces ], dtype = numpy.float32).reshape(-1, 5, 2),
+		'landmarks_68': numpy.array([ face.landmark_set.get('68') for face in faces ], dtype = numpy.float32).reshape(-1, 68, 2),
+		'landmarks_68_5': numpy.array([ face.landmark_set.get('68/5') for face in faces ], dtype = numpy.float32).reshape(-1, 68, 2),
+		'angles': numpy.array([ face.angle for face in faces ], dtype = numpy.int16),
+		'embeddings': numpy.array([ face.embedding for face in faces ], dtype = numpy.float32).reshape(-1, 512),
+		'normed_embeddings': numpy.array([ face.normed_embedding for face in faces ], dtype = numpy.float32).reshape(-1, 512),
+		'genders': numpy.array([ facefusion.choices.face_selector_genders.index(face.gender) for face in faces ], dtype = numpy.int8),
+		'ages': numpy.array([ (face.age.start, face.age.stop) for face in faces ], dtype = numpy.int16).reshape(-1, 2),
+		'races': numpy.array([ facefusion.choices.face_selector_races.index(face.race) for face in faces ], dtype = numpy.int8)
+	}
+
+
+def unpack_face_index(face_index_arrays : FaceIndexArrays) -> FaceIndexFrames:
+	face_index_frames : FaceIndexFrames = {}
+
+	for index, frame_number in enumerate(face_index_arrays.get('frame_numbers').tolist()):
+		face_index_frames.setdefault(frame_number, []).append(unpack_index_face(face_index_arrays, index))
+	return face_index_frames
+
+
+def unpack_index_faces(face_index_arrays : FaceIndexArrays, frame_number : int) -> List[Face]:
+	face_start = int(face_index_arrays.get('frame_offsets')[frame_number])
+	face_end = int(face_index_arrays.get('frame_offsets')[frame_number + 1])
+	return [ unpack_index_face(face_index_arrays, index) for index in range(face_start, face_end) ]
+
+
+def unpack_index_face(face_index_arrays : FaceIndexArrays, index : int) -> Face:
+	age_start, age_stop = face_index_arrays.get('ages')[index].tolist()
+	return Face(
+		bounding_box = face_index_arrays.get('bounding_boxes')[index],
+		score_set =
+		{
+			'detector': float(face_index_arrays.get('detector_scores')[index]),
+			'landmarker': float(face_index_arrays.get('landmarker_scores')[index])
+		},
+		landmark_set =
+		{
+			'5': face_index_arrays.get('landmarks_5')[index],
+			'5/68': face_index_arrays.get('landmarks_5_68')[index],
+			'68': face_index_arrays.get('landmarks_68')[index],
+			'68/5': face_index_arrays.get('landmarks_68_5')[index]
+		},
+		angle = int(face_index_arrays.get('angles')[index]),
+		embedding = face_index_arrays.get('embeddings')[index],
+		normed_embedding = face_index_arrays.get('normed_embeddings')[index],
+		gender = facefusion.choices.face_selector_genders[face_index_arrays.get('genders')[index]],
+		age = range(age_start, age_stop),
+		race = facefusion.choices.face_selector_races[face_index_arrays.get('races')[index]]
+	)
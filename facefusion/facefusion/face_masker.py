@@ -196,7 +196,7 @@ def forward_occlude_face(prepare_vision_frame : VisionFrame) -> Mask:
 	face_occluder = get_inference_pool().get(face_occluder_model)
 
 	with conditional_thread_semaphore():
-		occlusion_mask : Mask = face_occluder.run(None,
+		occlusion_mask : Mask = inference_manager.run_inference_session(face_occluder,
 		{
 			'input': prepare_vision_frame
 		})[0][0]
@@ -209,7 +209,7 @@ def forward_parse_face(prepare_vision_frame : VisionFrame) -> Mask:
 	face_parser = get_inference_pool().get(face_parser_model)
 
 	with conditional_thread_semaphore():
-		region_mask : Mask = face_parser.run(None,
+		region_mask : Mask = inference_manager.run_inference_session(face_parser,
 		{
 			'input': prepare_vision_frame
 		})[0][0]
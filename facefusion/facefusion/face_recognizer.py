@@ -60,14 +60,23 @@ def pre_check() -> bool:
 
 
 def calc_embedding(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[Embedding, Embedding]:
+	crop_vision_frame = warp_embedding_crop(temp_vision_frame, face_landmark_5)
+	return calc_crop_embedding(crop_vision_frame)
+
+
+def warp_embedding_crop(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
-	crop_vision_frame, matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
+	crop_vision_frame, _ = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
+	return crop_vision_frame
+
+
+def calc_crop_embedding(crop_vision_frame : VisionFrame) -> Tuple[Embedding, Embedding]:
 	crop_vision_frame = crop_vision_frame / 127.5 - 1
 	crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
 	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
 	embedding = forward(crop_vision_frame)
-	embedding = embedding.ravel()
+	embedding = embedding.flatten()
 	normed_embedding = embedding / numpy.linalg.norm(embedding)
 	return embedding, normed_embedding
 
@@ -76,7 +85,7 @@ def forward(crop_vision_frame : VisionFrame) -> Embedding:
 	face_recognizer = get_inference_pool().get('face_recognizer')
 
 	with conditional_thread_semaphore():
-		embedding = face_recognizer.run(None,
+		embedding = inference_manager.run_inference_session(face_recognizer,
 		{
 			'input': crop_vision_frame
 		})[0]
@@ -1,24 +1,94 @@
-from typing import List
+from typing import List, Tuple
 
 import numpy
 
 from facefusion import state_manager
-from facefusion.typing import Face, FaceSelectorOrder, FaceSet, Gender, Race
+from facefusion.face_tracker import create_reference_faces_key, create_track_distance_key, get_track_distances, set_track_distances
+from facefusion.frame_context import create_similar_faces_key, get_frame_similar_faces, set_frame_similar_faces
+from facefusion.typing import Distance, Face, FaceAssignment, FaceSelectorOrder, FaceSet, Gender, Race
 
 
 def find_similar_faces(faces : List[Face], reference_faces : FaceSet, face_distance : float) -> List[Face]:
 	similar_faces : List[Face] = []
 
 	if faces and reference_faces:
+		similar_faces_key = create_similar_faces_key(faces, reference_faces, face_distance)
+		frame_similar_faces = get_frame_similar_faces(similar_faces_key) if similar_faces_key else None
+
+		if frame_similar_faces is not None:
+			return frame_similar_faces
+		reference_sets, _ = flatten_reference_faces(reference_faces)
+		face_distances = calc_face_distances(faces, reference_faces)
+
 		for reference_set in reference_faces:
 			if not similar_faces:
-				for reference_face in reference_faces[reference_set]:
-					for face in faces:
-						if compare_faces(face, reference_face, face_distance):
-							similar_faces.append(face)
+				face_indices = numpy.flatnonzero((face_distances[:, numpy.equal(reference_sets, reference_set)] < face_distance).any(axis = 1))
+				similar_faces = [ faces[face_index] for face_index in face_indices ]
+		if similar_faces_key:
+			set_frame_similar_faces(similar_faces_key, similar_faces)
 	return similar_faces
 
 
+def find_face_assignments(faces : List[Face], reference_faces : FaceSet, face_distance : float) -> List[FaceAssignment]:
+	face_assignments : List[FaceAssignment] = []
+
+	if faces and reference_faces:
+		reference_sets, reference_face_list = flatten_reference_faces(reference_faces)
+		face_distances = calc_face_distances(faces, reference_faces)
+
+		if reference_face_list:
+			for face, reference_distances in zip(faces, face_distances):
+				reference_index = int(numpy.argmin(reference_distances))
+
+				if reference_distances[reference_index] < face_distance:
+					face_assignments.append(
+					{
+						'face': face,
+						'reference_set': reference_sets[reference_index],
+						'reference_face': reference_face_list[reference_index],
+						'face_distance': float(reference_distances[reference_index])
+					})
+	return face_assignments
+
+
+def flatten_reference_faces(reference_faces : FaceSet) -> Tuple[List[str], List[Face]]:
+	reference_sets = []
+	reference_face_list = []
+
+	for reference_set in reference_faces:
+		for reference_face in reference_faces[reference_set]:
+			reference_sets.append(reference_set)
+			reference_face_list.append(reference_face)
+	return reference_sets, reference_face_list
+
+
+def calc_face_distances(faces : List[Face], reference_faces : FaceSet) -> Distance:
+	_, reference_face_list = flatten_reference_faces(reference_faces)
+	face_distances = numpy.zeros((len(faces), len(reference_face_list)))
+	reference_faces_key = create_reference_faces_key(reference_faces)
+	calc_indices = []
+
+	for index, face in enumerate(faces):
+		track_distance_key = create_track_distance_key(face, reference_faces_key)
+		track_distances = get_track_distances(track_distance_key) if track_distance_key else None
+
+		if track_distances is None:
+			calc_indices.append(index)
+		else:
+			face_distances[index] = track_distances
+
+	if calc_indices and reference_face_list:
+		face_embeddings = numpy.stack([ faces[index].normed_embedding for index in calc_indices ])
+		reference_embeddings = numpy.stack([ reference_face.normed_embedding for reference_face in reference_face_list ])
+		face_distances[calc_indices] = 1 - numpy.matmul(face_embeddings, reference_embeddings.T)
+
+		for index in calc_indices:
+			track_distance_key = create_track_distance_key(faces[index], reference_faces_key)
+			if track_distance_key:
+				set_track_distances(track_distance_key, face_distances[index].copy())
+	return face_distances
+
+
 def compare_faces(face : Face, reference_face : Face, face_distance : float) -> bool:
 	current_face_distance = calc_face_distance(face, reference_face)
 	return current_face_distance < face_distance
@@ -1,40 +1,128 @@
 import hashlib
+import threading
+from functools import partial
 from typing import List, Optional
 
 import numpy
 
-from facefusion.typing import Face, FaceSet, FaceStore, VisionFrame
+from facefusion import state_manager
+from facefusion.frame_context import get_frame_number
+from facefusion.typing import Face, FaceSet, FaceStore, FaceStoreStatistics, VisionFrame
 
 FACE_STORE : FaceStore =\
 {
 	'static_faces': {},
+	'static_footprints': {},
 	'reference_faces': {}
 }
+FACE_STORE_STATISTICS : FaceStoreStatistics =\
+{
+	'hits': 0,
+	'misses': 0,
+	'evictions': 0
+}
+FACE_STORE_LOCK : threading.Lock = threading.Lock()
 
 
 def get_face_store() -> FaceStore:
 	return FACE_STORE
 
 
+def get_face_store_statistics() -> FaceStoreStatistics:
+	return FACE_STORE_STATISTICS
+
+
 def get_static_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
-	frame_hash = create_frame_hash(vision_frame)
-	if frame_hash in FACE_STORE['static_faces']:
-		return FACE_STORE['static_faces'][frame_hash]
+	frame_key = create_frame_key(vision_frame)
+
+	with FACE_STORE_LOCK:
+		if frame_key in FACE_STORE['static_faces']:
+			FACE_STORE['static_faces'][frame_key] = FACE_STORE['static_faces'].pop(frame_key)
+			FACE_STORE_STATISTICS['hits'] += 1
+			return FACE_STORE['static_faces'][frame_key]
+		FACE_STORE_STATISTICS['misses'] += 1
 	return None
 
 
 def set_static_faces(vision_frame : VisionFrame, faces : List[Face]) -> None:
-	frame_hash = create_frame_hash(vision_frame)
-	if frame_hash:
-		FACE_STORE['static_faces'][frame_hash] = faces
+	frame_key = create_frame_key(vision_frame)
+
+	if frame_key:
+		with FACE_STORE_LOCK:
+			FACE_STORE['static_faces'].pop(frame_key, None)
+			FACE_STORE['static_faces'][frame_key] = faces
+			FACE_STORE['static_footprints'][frame_key] = calc_faces_footprint(faces)
+			evict_static_faces()
+
+
+def evict_static_faces() -> None:
+	face_store_memory_limit = state_manager.get_item('face_store_memory_limit')
+
+	if face_store_memory_limit:
+		static_footprint = sum(FACE_STORE['static_footprints'].values())
+
+		while len(FACE_STORE['static_faces']) > 1 and static_footprint > face_store_memory_limit * 1024 ** 2:
+			frame_key = next(iter(FACE_STORE['static_faces']))
+			FACE_STORE['static_faces'].pop(frame_key)
+			static_footprint -= FACE_STORE['static_footprints'].pop(frame_key)
+			FACE_STORE_STATISTICS['evictions'] += 1
+
+
+def calc_faces_footprint(faces : List[Face]) -> int:
+	faces_footprint = 0
+
+	for face in faces:
+		face_arrays = [ face.bounding_box, *face.landmark_set.values(), face.face_analysis.get('embedding'), face.face_analysis.get('normed_embedding') ]
+
+		for face_callback in [ face.face_analysis.get('calc_embedding'), face.face_analysis.get('classify_face') ]:
+			if isinstance(face_callback, partial):
+				face_arrays.extend(face_callback.args)
+		faces_footprint += sum(numpy.asarray(face_array).nbytes for face_array in face_arrays if face_array is not None)
+	return faces_footprint
 
 
 def clear_static_faces() -> None:
-	FACE_STORE['static_faces'] = {}
+	with FACE_STORE_LOCK:
+		FACE_STORE['static_faces'] = {}
+		FACE_STORE['static_footprints'] = {}
+		FACE_STORE_STATISTICS['hits'] = 0
+		FACE_STORE_STATISTICS['misses'] = 0
+		FACE_STORE_STATISTICS['evictions'] = 0
+
+
+def create_frame_key(vision_frame : VisionFrame) -> Optional[str]:
+	frame_number = get_frame_number(vision_frame)
+
+	if frame_number is not None and state_manager.get_item('target_path'):
+		return create_frame_prefix() + '#' + str(frame_number)
+	return create_frame_hash(vision_frame)
+
+
+def create_frame_prefix() -> str:
+	frame_prefix_parts =\
+	[
+		state_manager.get_item('target_path'),
+		state_manager.get_item('output_video_resolution'),
+		state_manager.get_item('output_video_fps'),
+		state_manager.get_item('trim_frame_start'),
+		state_manager.get_item('face_detector_model'),
+		state_manager.get_item('face_detector_size'),
+		state_manager.get_item('face_detector_angles'),
+		state_manager.get_item('face_detector_score'),
+		state_manager.get_item('face_tracker_interval'),
+		state_manager.get_item('face_tracker_score'),
+		state_manager.get_item('face_landmarker_model'),
+		state_manager.get_item('face_landmarker_score')
+	]
+	return '|'.join(map(str, frame_prefix_parts))
 
 
 def create_frame_hash(vision_frame : VisionFrame) -> Optional[str]:
-	return hashlib.sha1(vision_frame.tobytes()).hexdigest() if numpy.any(vision_frame) else None
+	if numpy.any(vision_frame):
+		frame_hash = hashlib.blake2b(str(vision_frame.shape).encode(), digest_size = 16)
+		frame_hash.update(numpy.ascontiguousarray(vision_frame[::4, ::4]).tobytes())
+		return frame_hash.hexdigest()
+	return None
 
 
 def get_reference_faces() -> Optional[FaceSet]:
@@ -0,0 +1,189 @@
+import hashlib
+import itertools
+import threading
+from typing import Dict, List, Optional
+
+import cv2
+import numpy
+
+from facefusion import state_manager
+from facefusion.face_helper import convert_to_face_landmark_5, estimate_face_angle
+from facefusion.frame_context import get_frame_number
+from facefusion.typing import BoundingBox, Distance, Face, FaceLandmarkSet, FaceSet, FaceTrack, FaceTrackDistanceKey, FaceTrackHistogram, FaceTrackSet, Matrix, Points, VisionFrame
+
+FACE_TRACKS : FaceTrackSet = {}
+FACE_TRACK_DISTANCES : Dict[FaceTrackDistanceKey, Distance] = {}
+FACE_TRACK_IDS = itertools.count()
+FACE_TRACK_LOCK : threading.Lock = threading.Lock()
+FACE_TRACK_SCENE_SCORE : float = 0.7
+FACE_TRACK_DISTANCE_LIMIT : int = 1024
+
+
+def track_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
+	frame_number = get_frame_number(vision_frame)
+
+	if state_manager.get_item('face_tracker_interval') and frame_number is not None:
+		with FACE_TRACK_LOCK:
+			face_track = FACE_TRACKS.pop(frame_number - 1, None)
+
+		if face_track and frame_number - face_track.get('keyframe_number') < state_manager.get_item('face_tracker_interval'):
+			track_vision_frame = cv2.cvtColor(vision_frame, cv2.COLOR_BGR2GRAY)
+			track_histogram = create_track_histogram(track_vision_frame)
+			faces = []
+
+			if detect_scene_cut(face_track.get('histogram'), track_histogram):
+				return None
+			for face in face_track.get('faces'):
+				track_face = track_face_by_flow(face_track.get('vision_frame'), track_vision_frame, face)
+				if not track_face:
+					return None
+				faces.append(track_face)
+
+			set_face_track(frame_number,
+			{
+				'keyframe_number': face_track.get('keyframe_number'),
+				'vision_frame': track_vision_frame,
+				'histogram': track_histogram,
+				'faces': faces
+			})
+			return faces
+	return None
+
+
+def start_face_track(vision_frame : VisionFrame, faces : List[Face]) -> List[Face]:
+	frame_number = get_frame_number(vision_frame)
+
+	if state_manager.get_item('face_tracker_interval') and frame_number is not None:
+		track_vision_frame = cv2.cvtColor(vision_frame, cv2.COLOR_BGR2GRAY)
+		faces = [ Face(face.bounding_box, face.score_set, face.landmark_set, face.angle, track_id = next(FACE_TRACK_IDS), face_analysis = face.face_analysis) for face in faces ]
+
+		set_face_track(frame_number,
+		{
+			'keyframe_number': frame_number,
+			'vision_frame': track_vision_frame,
+			'histogram': create_track_histogram(track_vision_frame),
+			'faces': faces
+		})
+	return faces
+
+
+def track_face_by_flow(previous_vision_frame : VisionFrame, vision_frame : VisionFrame, face : Face) -> Optional[Face]:
+	crop_box = create_track_crop_box(face.bounding_box, vision_frame.shape[1], vision_frame.shape[0])
+
+	if crop_box is None:
+		return None
+	start_x, start_y, end_x, end_y = crop_box
+	crop_offset = numpy.array([ start_x, start_y ], dtype = numpy.float32)
+	previous_points = face.landmark_set.get('68').astype(numpy.float32) - crop_offset
+	track_points, track_status, _ = cv2.calcOpticalFlowPyrLK(previous_vision_frame[start_y:end_y, start_x:end_x], vision_frame[start_y:end_y, start_x:end_x], previous_points.reshape(-1, 1, 2), None, winSize = (21, 21), maxLevel = 3)
+
+	if track_points is None:
+		return None
+	track_points = track_points.reshape(-1, 2)
+	track_mask = track_status.ravel() == 1
+
+	if numpy.mean(track_mask) < state_manager.get_item('face_tracker_score') or numpy.sum(track_mask) < 3:
+		return None
+	affine_matrix, _ = cv2.estimateAffinePartial2D(previous_points[track_mask], track_points[track_mask], method = cv2.RANSAC)
+
+	if affine_matrix is None:
+		return None
+	affine_matrix[:, 2] += crop_offset - affine_matrix[:, :2] @ crop_offset
+	face_landmark_68 = transform_points(face.landmark_set.get('68'), affine_matrix)
+	face_landmark_68[track_mask] = track_points[track_mask] + crop_offset
+	face_landmark_68_5 = transform_points(face.landmark_set.get('68/5'), affine_matrix)
+	face_landmark_5_68 = transform_points(face.landmark_set.get('5/68'), affine_matrix)
+
+	if face.score_set.get('landmarker') > state_manager.get_item('face_landmarker_score'):
+		face_landmark_5_68 = convert_to_face_landmark_5(face_landmark_68)
+
+	face_landmark_set : FaceLandmarkSet =\
+	{
+		'5': transform_points(face.landmark_set.get('5'), affine_matrix),
+		'5/68': face_landmark_5_68,
+		'68': face_landmark_68,
+		'68/5': face_landmark_68_5
+	}
+	return Face(
+		bounding_box = transform_bounding_box(face.bounding_box, affine_matrix),
+		score_set = face.score_set,
+		landmark_set = face_landmark_set,
+		angle = estimate_face_angle(face_landmark_68_5),
+		track_id = face.track_id,
+		face_analysis = face.face_analysis
+	)
+
+
+def create_track_crop_box(bounding_box : BoundingBox, frame_width : int, frame_height : int) -> Optional[BoundingBox]:
+	x1, y1, x2, y2 = bounding_box
+	crop_padding = max(x2 - x1, y2 - y1) * 0.5
+	start_x = int(max(x1 - crop_padding, 0))
+	start_y = int(max(y1 - crop_padding, 0))
+	end_x = int(min(x2 + crop_padding, frame_width))
+	end_y = int(min(y2 + crop_padding, frame_height))
+
+	if end_x - start_x > 16 and end_y - start_y > 16:
+		return numpy.array([ start_x, start_y, end_x, end_y ])
+	return None
+
+
+def transform_points(points : Points, affine_matrix : Matrix) -> Points:
+	return points @ affine_matrix[:, :2].T + affine_matrix[:, 2]
+
+
+def transform_bounding_box(bounding_box : BoundingBox, affine_matrix : Matrix) -> BoundingBox:
+	x1, y1, x2, y2 = bounding_box
+	corner_points = transform_points(numpy.array([ [ x1, y1 ], [ x2, y1 ], [ x2, y2 ], [ x1, y2 ] ]), affine_matrix)
+	return numpy.concatenate([ corner_points.min(axis = 0), corner_points.max(axis = 0) ])
+
+
+def create_track_histogram(vision_frame : VisionFrame) -> FaceTrackHistogram:
+	track_histogram = cv2.calcHist([ cv2.resize(vision_frame, (64, 36)) ], [ 0 ], None, [ 32 ], [ 0, 256 ])
+	return cv2.normalize(track_histogram, track_histogram)
+
+
+def detect_scene_cut(previous_histogram : FaceTrackHistogram, histogram : FaceTrackHistogram) -> bool:
+	return cv2.compareHist(previous_histogram, histogram, cv2.HISTCMP_CORREL) < FACE_TRACK_SCENE_SCORE
+
+
+def set_face_track(frame_number : int, face_track : FaceTrack) -> None:
+	with FACE_TRACK_LOCK:
+		FACE_TRACKS[frame_number] = face_track
+
+		while len(FACE_TRACKS) > state_manager.get_item('execution_thread_count') * 2:
+			FACE_TRACKS.pop(min(FACE_TRACKS))
+
+
+def create_reference_faces_key(reference_faces : FaceSet) -> str:
+	reference_faces_hash = hashlib.sha1()
+
+	for reference_set in reference_faces:
+		reference_faces_hash.update(reference_set.encode())
+		for reference_face in reference_faces[reference_set]:
+			reference_faces_hash.update(numpy.ascontiguousarray(reference_face.normed_embedding).tobytes())
+	return reference_faces_hash.hexdigest()
+
+
+def create_track_distance_key(face : Face, reference_faces_key : str) -> Optional[FaceTrackDistanceKey]:
+	if face.track_id is not None:
+		return face.track_id, reference_faces_key
+	return None
+
+
+def get_track_distances(track_distance_key : FaceTrackDistanceKey) -> Optional[Distance]:
+	with FACE_TRACK_LOCK:
+		return FACE_TRACK_DISTANCES.get(track_distance_key)
+
+
+def set_track_distances(track_distance_key : FaceTrackDistanceKey, track_distances : Distance) -> None:
+	with FACE_TRACK_LOCK:
+		FACE_TRACK_DISTANCES[track_distance_key] = track_distances
+
+		while len(FACE_TRACK_DISTANCES) > FACE_TRACK_DISTANCE_LIMIT:
+			FACE_TRACK_DISTANCES.pop(next(iter(FACE_TRACK_DISTANCES)))
+
+
+def clear_face_tracks() -> None:
+	with FACE_TRACK_LOCK:
+		FACE_TRACKS.clear()
+		FACE_TRACK_DISTANCES.clear()
@@ -2,16 +2,17 @@ import os
 import shutil
 import subprocess
 import tempfile
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import filetype
+import numpy
 from tqdm import tqdm
 
 from facefusion import logger, process_manager, state_manager, wording
 from facefusion.filesystem import remove_file
 from facefusion.temp_helper import get_temp_file_path, get_temp_frame_paths, get_temp_frames_pattern
-from facefusion.typing import AudioBuffer, Fps, OutputVideoPreset, UpdateProgress
-from facefusion.vision import count_trim_frame_total, detect_video_duration, restrict_video_fps
+from facefusion.typing import AudioBuffer, Fps, OutputVideoPreset, UpdateProgress, VisionFrame
+from facefusion.vision import count_trim_frame_total, detect_video_duration, restrict_video_fps, unpack_resolution
 
 
 def run_ffmpeg_with_progress(args: List[str], update_progress : UpdateProgress) -> subprocess.Popen[bytes]:
@@ -79,15 +80,7 @@ def extract_frames(target_path : str, temp_video_resolution : str, temp_video_fp
 	extract_frame_total = count_trim_frame_total(target_path, trim_frame_start, trim_frame_end)
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%08d')
 	commands = [ '-i', target_path, '-s', str(temp_video_resolution), '-q:v', '0' ]
-
-	if isinstance(trim_frame_start, int) and isinstance(trim_frame_end, int):
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	elif isinstance(trim_frame_start, int):
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(temp_video_fps) ])
-	elif isinstance(trim_frame_end, int):
-		commands.extend([ '-vf', 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	else:
-		commands.extend([ '-vf', 'fps=' + str(temp_video_fps) ])
+	commands.extend(collect_extract_filter_commands(temp_video_fps, trim_frame_start, trim_frame_end))
 	commands.extend([ '-vsync', '0', temp_frames_pattern ])
 
 	with tqdm(total = extract_frame_total, desc = wording.get('extracting'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
@@ -95,19 +88,75 @@ def extract_frames(target_path : str, temp_video_resolution : str, temp_video_fp
 		return process.returncode == 0
 
 
+def collect_extract_filter_commands(temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> List[str]:
+	if isinstance(trim_frame_start, int) and isinstance(trim_frame_end, int):
+		return [ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ]
+	if isinstance(trim_frame_start, int):
+		return [ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(temp_video_fps) ]
+	if isinstance(trim_frame_end, int):
+		return [ '-vf', 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ]
+	return [ '-vf', 'fps=' + str(temp_video_fps) ]
+
+
 def merge_video(target_path : str, output_video_resolution : str, output_video_fps: Fps) -> bool:
+	merge_frame_total = len(get_temp_frame_paths(target_path))
+	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
+	temp_frames_pattern = get_temp_frames_pattern(target_path, '%08d')
+	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern ]
+	commands.extend(collect_merge_commands(target_path, output_video_resolution, output_video_fps))
+
+	with tqdm(total = merge_frame_total, desc = wording.get('merging'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+		process = run_ffmpeg_with_progress(commands, lambda frame_number: progress.update(frame_number - progress.n))
+		return process.returncode == 0
+
+
+def open_video_decoder(target_path : str, temp_video_resolution : str, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> subprocess.Popen[bytes]:
+	commands = [ '-nostdin', '-i', target_path, '-s', str(temp_video_resolution) ]
+	commands.extend(collect_extract_filter_commands(temp_video_fps, trim_frame_start, trim_frame_end))
+	commands.extend([ '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-' ])
+	return open_ffmpeg(commands)
+
+
+def open_video_encoder(target_path : str, temp_video_resolution : str, output_video_resolution : str, output_video_fps : Fps) -> subprocess.Popen[bytes]:
+	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
+	commands = [ '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', str(temp_video_resolution), '-r', str(temp_video_fps), '-i', '-' ]
+	commands.extend(collect_merge_commands(target_path, output_video_resolution, output_video_fps))
+	return open_ffmpeg(commands)
+
+
+def read_video_frames(process : subprocess.Popen[bytes], temp_video_resolution : str) -> Iterator[VisionFrame]:
+	temp_video_width, temp_video_height = unpack_resolution(temp_video_resolution)
+	frame_size = temp_video_width * temp_video_height * 3
+
+	while process_manager.is_processing():
+		frame_buffer = bytearray(frame_size)
+		if process.stdout.readinto(frame_buffer) < frame_size: #type:ignore[attr-defined]
+			break
+		yield numpy.frombuffer(frame_buffer, dtype = numpy.uint8).reshape(temp_video_height, temp_video_width, 3)
+
+
+def write_video_frame(process : subprocess.Popen[bytes], vision_frame : VisionFrame) -> None:
+	process.stdin.write(numpy.ascontiguousarray(vision_frame, dtype = numpy.uint8).tobytes())
+
+
+def close_video_encoder(process : subprocess.Popen[bytes]) -> bool:
+	try:
+		process.stdin.close()
+	except BrokenPipeError:
+		process.kill()
+	return process.wait() == 0
+
+
+def collect_merge_commands(target_path : str, output_video_resolution : str, output_video_fps : Fps) -> List[str]:
 	output_video_encoder = state_manager.get_item('output_video_encoder')
 	output_video_quality = state_manager.get_item('output_video_quality')
 	output_video_preset = state_manager.get_item('output_video_preset')
-	merge_frame_total = len(get_temp_frame_paths(target_path))
-	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
 	temp_file_path = get_temp_file_path(target_path)
-	temp_frames_pattern = get_temp_frames_pattern(target_path, '%08d')
 	is_webm = filetype.guess_mime(target_path) == 'video/webm'
 
 	if is_webm:
 		output_video_encoder = 'libvpx-vp9'
-	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern, '-s', str(output_video_resolution), '-c:v', output_video_encoder ]
+	commands = [ '-s', str(output_video_resolution), '-c:v', output_video_encoder ]
 	if output_video_encoder in [ 'libx264', 'libx265' ]:
 		output_video_compression = round(51 - (output_video_quality * 0.51))
 		commands.extend([ '-crf', str(output_video_compression), '-preset', output_video_preset ])
@@ -123,10 +172,7 @@ def merge_video(target_path : str, output_video_resolution : str, output_video_f
 	if output_video_encoder in [ 'h264_videotoolbox', 'hevc_videotoolbox' ]:
 		commands.extend([ '-q:v', str(output_video_quality) ])
 	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
-
-	with tqdm(total = merge_frame_total, desc = wording.get('merging'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
-		process = run_ffmpeg_with_progress(commands, lambda frame_number: progress.update(frame_number - progress.n))
-		return process.returncode == 0
+	return commands
 
 
 def concat_video(output_path : str, temp_output_paths : List[str]) -> bool:
@@ -0,0 +1,127 @@
+import threading
+from typing import List, Optional
+
+from cv2.typing import Size
+
+from facefusion.typing import Face, FaceLandmark5, FaceSet, FrameContext, FrameContextKey, FrameContextRule, Matrix, VisionFrame, WarpTemplate
+
+FRAME_CONTEXT = threading.local()
+
+
+def create_frame_context(vision_frame : VisionFrame, frame_number : Optional[int] = None) -> FrameContext:
+	return\
+	{
+		'vision_frame': vision_frame,
+		'frame_number': frame_number,
+		'faces': None,
+		'similar_faces': {},
+		'matrices': {}
+	}
+
+
+def get_frame_context() -> Optional[FrameContext]:
+	return getattr(FRAME_CONTEXT, 'frame_context', None)
+
+
+def set_frame_context(frame_context : Optional[FrameContext]) -> None:
+	FRAME_CONTEXT.frame_context = frame_context
+
+
+def clear_frame_context() -> None:
+	set_frame_context(None)
+
+
+def match_frame_context(vision_frame : VisionFrame) -> Optional[FrameContext]:
+	frame_context = get_frame_context()
+
+	if frame_context and frame_context.get('vision_frame') is vision_frame:
+		return frame_context
+	return None
+
+
+def update_frame_context(frame_context : FrameContext, vision_frame : VisionFrame, frame_context_rule : FrameContextRule) -> None:
+	if frame_context_rule == 'invalidate' or frame_context.get('vision_frame').shape != vision_frame.shape:
+		frame_context['frame_number'] = None
+		frame_context['faces'] = None
+		frame_context['similar_faces'] = {}
+		frame_context['matrices'] = {}
+	frame_context['vision_frame'] = vision_frame
+
+
+def get_frame_number(vision_frame : VisionFrame) -> Optional[int]:
+	frame_context = match_frame_context(vision_frame)
+
+	if frame_context:
+		return frame_context.get('frame_number')
+	return None
+
+
+def get_frame_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
+	frame_context = match_frame_context(vision_frame)
+
+	if frame_context:
+		return frame_context.get('faces')
+	return None
+
+
+def set_frame_faces(vision_frame : VisionFrame, faces : List[Face]) -> bool:
+	frame_context = match_frame_context(vision_frame)
+
+	if frame_context:
+		frame_context['faces'] = faces
+		frame_context['similar_faces'] = {}
+		frame_context['matrices'] = {}
+		return True
+	return False
+
+
+def create_similar_faces_key(faces : List[Face], reference_faces : FaceSet, face_distance : float) -> Optional[FrameContextKey]:
+	frame_context = get_frame_context()
+
+	if frame_context and frame_context.get('faces') is not None:
+		frame_face_ids = set(map(id, frame_context.get('faces')))
+		face_ids = tuple(map(id, faces))
+
+		if frame_face_ids.issuperset(face_ids):
+			return (id(reference_faces), face_distance) + face_ids
+	return None
+
+
+def get_frame_similar_faces(similar_faces_key : FrameContextKey) -> Optional[List[Face]]:
+	frame_context = get_frame_context()
+
+	if frame_context:
+		return frame_context.get('similar_faces').get(similar_faces_key)
+	return None
+
+
+def set_frame_similar_faces(similar_faces_key : FrameContextKey, similar_faces : List[Face]) -> None:
+	frame_context = get_frame_context()
+
+	if frame_context:
+		frame_context['similar_faces'][similar_faces_key] = similar_faces
+
+
+def create_matrix_key(face_landmark_5 : FaceLandmark5, warp_template : WarpTemplate, crop_size : Size) -> Optional[FrameContextKey]:
+	frame_context = get_frame_context()
+
+	if frame_context and frame_context.get('faces'):
+		for face in frame_context.get('faces'):
+			if any(face_landmark is face_landmark_5 for face_landmark in face.landmark_set.values()):
+				return id(face_landmark_5), warp_template, tuple(crop_size)
+	return None
+
+
+def get_frame_matrix(matrix_key : FrameContextKey) -> Optional[Matrix]:
+	frame_context = get_frame_context()
+
+	if frame_context:
+		return frame_context.get('matrices').get(matrix_key)
+	return None
+
+
+def set_frame_matrix(matrix_key : FrameContextKey, affine_matrix : Matrix) -> None:
+	frame_context = get_frame_context()
+
+	if frame_context:
+		frame_context['matrices'][matrix_key] = affine_matrix
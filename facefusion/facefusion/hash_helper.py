@@ -1,14 +1,33 @@
+import hashlib
 import os
 import zlib
+from functools import lru_cache, partial
 from typing import Optional
 
 from facefusion.filesystem import is_file
 
+FILE_HASH_CHUNK_SIZE : int = 1024 ** 2
+
 
 def create_hash(content : bytes) -> str:
 	return format(zlib.crc32(content), '08x')
 
 
+def create_file_hash(file_path : str) -> str:
+	file_stat = os.stat(file_path)
+	return create_static_file_hash(file_path, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+@lru_cache(maxsize = None)
+def create_static_file_hash(file_path : str, file_mtime : int, file_size : int) -> str:
+	file_hash = hashlib.sha1()
+
+	with open(file_path, 'rb') as file:
+		for file_chunk in iter(partial(file.read, FILE_HASH_CHUNK_SIZE), b''):
+			file_hash.update(file_chunk)
+	return file_hash.hexdigest()
+
+
 def validate_hash(validate_path : str) -> bool:
 	hash_path = get_hash_path(validate_path)
 
@@ -0,0 +1,121 @@
+import threading
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+import numpy
+from onnxruntime import InferenceSession
+
+from facefusion.typing import InferenceBatchKey, InferenceBatchRequest, InferenceInputs, InferenceOutputs
+
+
+class InferenceBatcher:
+	def __init__(self, inference_session : InferenceSession, batch_size : int, batch_window : float, thread_count : int) -> None:
+		self.inference_session = inference_session
+		self.batch_size = batch_size
+		self.batch_window = batch_window if thread_count > 1 else 0
+		self.batch_requests : List[InferenceBatchRequest] = []
+		self.condition = threading.Condition()
+		self.is_running = False
+		self.has_dynamic_batch = all(not isinstance(session_input.shape[0], int) for session_input in inference_session.get_inputs())
+		self.has_batch_outputs = True
+
+	def __getattr__(self, name : str) -> Any:
+		return getattr(self.inference_session, name)
+
+	def run(self, output_names : Optional[List[str]], input_feed : InferenceInputs, run_options : Any = None) -> InferenceOutputs:
+		batch_key = self.create_batch_key(output_names, input_feed)
+
+		if run_options or not batch_key:
+			return self.inference_session.run(output_names, input_feed, run_options)
+		batch_request : InferenceBatchRequest =\
+		{
+			'batch_key': batch_key,
+			'output_names': output_names,
+			'input_feed': input_feed,
+			'outputs': None,
+			'exception': None,
+			'is_done': False
+		}
+
+		with self.condition:
+			self.batch_requests.append(batch_request)
+			self.condition.notify_all()
+
+			while not batch_request.get('is_done'):
+				if self.is_running:
+					self.condition.wait()
+				else:
+					self.is_running = True
+					batch_requests = self.collect_requests()
+					self.condition.release()
+					try:
+						self.run_requests(batch_requests)
+					finally:
+						self.condition.acquire()
+						self.is_running = False
+						self.condition.notify_all()
+
+		if batch_request.get('exception'):
+			raise batch_request.get('exception')
+		return batch_request.get('outputs')
+
+	def create_batch_key(self, output_names : Optional[List[str]], input_feed : InferenceInputs) -> Optional[InferenceBatchKey]:
+		if self.batch_size > 1 and self.has_dynamic_batch and self.has_batch_outputs:
+			batch_key : List[Any] = [ tuple(output_names or []) ]
+
+			for input_name, input_value in sorted(input_feed.items()):
+				if not isinstance(input_value, numpy.ndarray) or input_value.ndim == 0 or input_value.shape[0] != 1:
+					return None
+				batch_key.append((input_name, input_value.shape[1:], input_value.dtype.str))
+			return tuple(batch_key)
+		return None
+
+	def collect_requests(self) -> List[InferenceBatchRequest]:
+		batch_deadline = monotonic() + self.batch_window
+
+		while self.batch_window and len(self.batch_requests) < self.batch_size:
+			batch_timeout = batch_deadline - monotonic()
+			if batch_timeout <= 0:
+				break
+			self.condition.wait(batch_timeout)
+
+		batch_key = self.batch_requests[0].get('batch_key')
+		batch_requests = [ batch_request for batch_request in self.batch_requests if batch_request.get('batch_key') == batch_key ][:self.batch_size]
+
+		for batch_request in batch_requests:
+			self.batch_requests.remove(batch_request)
+		return batch_requests
+
+	def run_requests(self, batch_requests : List[InferenceBatchRequest]) -> None:
+		if len(batch_requests) > 1 and self.has_batch_outputs:
+			try:
+				self.run_batch(batch_requests)
+			except Exception:
+				self.run_single(batch_requests)
+		else:
+			self.run_single(batch_requests)
+		for batch_request in batch_requests:
+			batch_request['is_done'] = True
+
+	def run_batch(self, batch_requests : List[InferenceBatchRequest]) -> None:
+		first_request = batch_requests[0]
+		batch_total = len(batch_requests)
+		input_feed : Dict[str, Any] = {}
+
+		for input_name in first_request.get('input_feed'):
+			input_feed[input_name] = numpy.concatenate([ batch_request.get('input_feed').get(input_name) for batch_request in batch_requests ])
+		outputs = self.inference_session.run(first_request.get('output_names'), input_feed)
+
+		if any(numpy.ndim(output) == 0 or len(output) != batch_total for output in outputs):
+			self.has_batch_outputs = False
+			self.run_single(batch_requests)
+			return
+		for index, batch_request in enumerate(batch_requests):
+			batch_request['outputs'] = [ output[index:index + 1] for output in outputs ]
+
+	def run_single(self, batch_requests : List[InferenceBatchRequest]) -> None:
+		for batch_request in batch_requests:
+			try:
+				batch_request['outputs'] = self.inference_session.run(batch_request.get('output_names'), batch_request.get('input_feed'))
+			except Exception as exception:
+				batch_request['exception'] = exception
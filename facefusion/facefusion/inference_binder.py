@@ -0,0 +1,94 @@
+import threading
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+import numpy
+from onnxruntime import InferenceSession, RunOptions
+
+import facefusion.choices
+from facefusion.inference_profiler import record_run_time
+from facefusion.typing import InferenceBinding, InferenceBindingKey, InferenceInputs, InferenceOutputs
+
+IO_BINDING_RUN_OPTIONS : RunOptions = RunOptions()
+
+
+class InferenceBinder:
+	def __init__(self, inference_session : InferenceSession) -> None:
+		self.inference_session = inference_session
+		self.input_types = { session_input.name: facefusion.choices.inference_input_type_set.get(session_input.type) for session_input in inference_session.get_inputs() }
+		self.thread_local = threading.local()
+
+	def __getattr__(self, name : str) -> Any:
+		return getattr(self.inference_session, name)
+
+	def run(self, output_names : Optional[List[str]], input_feed : InferenceInputs, run_options : Any = None) -> InferenceOutputs:
+		start_time = perf_counter()
+
+		try:
+			if run_options is IO_BINDING_RUN_OPTIONS and not output_names:
+				return self.run_bound(input_feed)
+			return self.inference_session.run(output_names, input_feed, run_options)
+		finally:
+			record_run_time(perf_counter() - start_time)
+
+	def run_bound(self, input_feed : InferenceInputs) -> InferenceOutputs:
+		binding_key = self.create_binding_key(input_feed)
+
+		if not binding_key:
+			return self.inference_session.run(None, input_feed)
+		inference_bindings = self.get_inference_bindings()
+		inference_binding = inference_bindings.get(binding_key)
+
+		if not inference_binding:
+			input_buffers = { input_name: numpy.empty(input_value.shape, dtype = self.input_types.get(input_name)) for input_name, input_value in input_feed.items() }
+			self.fill_buffers(input_buffers, input_feed)
+			outputs = self.inference_session.run(None, input_buffers)
+			inference_binding = self.create_binding(input_buffers, outputs)
+
+			if inference_binding:
+				inference_bindings[binding_key] = inference_binding
+			return outputs
+
+		self.fill_buffers(inference_binding.get('inputs'), input_feed)
+		try:
+			self.inference_session.run_with_iobinding(inference_binding.get('io_binding'))
+		except Exception:
+			inference_bindings.pop(binding_key)
+			return self.inference_session.run(None, inference_binding.get('inputs'))
+		return list(inference_binding.get('outputs'))
+
+	def create_binding_key(self, input_feed : InferenceInputs) -> Optional[InferenceBindingKey]:
+		binding_key : List[Any] = []
+
+		for input_name, input_value in sorted(input_feed.items()):
+			if not isinstance(input_value, numpy.ndarray) or not self.input_types.get(input_name):
+				return None
+			binding_key.append((input_name, input_value.shape))
+		return tuple(binding_key)
+
+	def create_binding(self, input_buffers : InferenceInputs, outputs : InferenceOutputs) -> Optional[InferenceBinding]:
+		if all(isinstance(output, numpy.ndarray) and output.flags.c_contiguous and output.flags.writeable for output in outputs):
+			io_binding = self.inference_session.io_binding()
+
+			for input_name, input_buffer in input_buffers.items():
+				io_binding.bind_input(input_name, 'cpu', 0, input_buffer.dtype.type, input_buffer.shape, input_buffer.ctypes.data)
+			for session_output, output in zip(self.inference_session.get_outputs(), outputs):
+				io_binding.bind_output(session_output.name, 'cpu', 0, output.dtype.type, output.shape, output.ctypes.data)
+
+			inference_binding : InferenceBinding =\
+			{
+				'io_binding': io_binding,
+				'inputs': input_buffers,
+				'outputs': outputs
+			}
+			return inference_binding
+		return None
+
+	def fill_buffers(self, input_buffers : InferenceInputs, input_feed : InferenceInputs) -> None:
+		for input_name, input_buffer in input_buffers.items():
+			numpy.copyto(input_buffer, input_feed.get(input_name), casting = 'unsafe')
+
+	def get_inference_bindings(self) -> Dict[InferenceBindingKey, InferenceBinding]:
+		if not hasattr(self.thread_local, 'inference_bindings'):
+			self.thread_local.inference_bindings = {}
+		return self.thread_local.inference_bindings
@@ -1,19 +1,34 @@
-from time import sleep
-from typing import List
+import hashlib
+import os
+import threading
+from time import monotonic, perf_counter, sleep
+from typing import Any, Dict, List, Optional
 
-from onnxruntime import InferenceSession
+import numpy
+from onnxruntime import ExecutionMode, GraphOptimizationLevel, InferenceSession, SessionOptions
+from onnxruntime import __version__ as onnxruntime_version
 
-from facefusion import process_manager, state_manager
+import facefusion.choices
+from facefusion import logger, process_manager, state_manager, wording
 from facefusion.app_context import detect_app_context
-from facefusion.execution import create_inference_execution_providers
+from facefusion.execution import create_inference_execution_providers, detect_static_cpu_identity
+from facefusion.filesystem import create_directory, is_file, remove_file, resolve_relative_path
+from facefusion.inference_batcher import InferenceBatcher
+from facefusion.inference_binder import IO_BINDING_RUN_OPTIONS, InferenceBinder
+from facefusion.inference_profiler import InferenceProfiler
+from facefusion.inference_replicas import InferenceReplicas
+from facefusion.inference_scheduler import InferenceScheduler
+from facefusion.model_helper import conditional_quantize_model, get_quantized_model_path
 from facefusion.thread_helper import thread_lock
-from facefusion.typing import DownloadSet, ExecutionProvider, InferencePool, InferencePoolSet
+from facefusion.typing import AppContext, DownloadSet, ExecutionProvider, InferenceInputs, InferencePool, InferencePoolSet, InferencePoolUsage
 
 INFERENCE_POOLS : InferencePoolSet =\
 {
 	'cli': {}, #type:ignore[typeddict-item]
 	'ui': {} #type:ignore[typeddict-item]
 }
+INFERENCE_POOL_USAGES : Dict[str, InferencePoolUsage] = {}
+INFERENCE_POOL_LOCKS : Dict[str, threading.Lock] = {}
 
 
 def get_inference_pool(model_context : str, model_sources : DownloadSet) -> InferencePool:
@@ -24,38 +39,335 @@ def get_inference_pool(model_context : str, model_sources : DownloadSet) -> Infe
 			sleep(0.5)
 		app_context = detect_app_context()
 		inference_context = get_inference_context(model_context)
+		inference_pool = find_inference_pool(app_context, inference_context)
+		inference_pool_lock = INFERENCE_POOL_LOCKS.setdefault(inference_context, threading.Lock())
 
-		if app_context == 'cli' and INFERENCE_POOLS.get('ui').get(inference_context):
-			INFERENCE_POOLS['cli'][inference_context] = INFERENCE_POOLS.get('ui').get(inference_context)
-		if app_context == 'ui' and INFERENCE_POOLS.get('cli').get(inference_context):
-			INFERENCE_POOLS['ui'][inference_context] = INFERENCE_POOLS.get('cli').get(inference_context)
-		if not INFERENCE_POOLS.get(app_context).get(inference_context):
-			INFERENCE_POOLS[app_context][inference_context] = create_inference_pool(model_sources, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
+	if not inference_pool:
+		with inference_pool_lock:
+			with thread_lock():
+				inference_pool = find_inference_pool(app_context, inference_context)
 
-		return INFERENCE_POOLS.get(app_context).get(inference_context)
+			if not inference_pool:
+				inference_pool = create_inference_pool(model_context, model_sources, get_execution_device_ids(), state_manager.get_item('execution_providers'))
 
+				with thread_lock():
+					INFERENCE_POOLS[app_context][inference_context] = inference_pool
+					INFERENCE_POOL_USAGES[inference_context] =\
+					{
+						'footprint': calc_inference_pool_footprint(model_sources, inference_pool),
+						'used_at': 0
+					}
+					evict_inference_pools(inference_context)
 
-def create_inference_pool(model_sources : DownloadSet, execution_device_id : str, execution_providers : List[ExecutionProvider]) -> InferencePool:
+	with thread_lock():
+		if inference_context in INFERENCE_POOL_USAGES:
+			INFERENCE_POOL_USAGES[inference_context]['used_at'] = monotonic()
+	return inference_pool
+
+
+def find_inference_pool(app_context : AppContext, inference_context : str) -> Optional[InferencePool]:
+	if app_context == 'cli' and INFERENCE_POOLS.get('ui').get(inference_context):
+		INFERENCE_POOLS['cli'][inference_context] = INFERENCE_POOLS.get('ui').get(inference_context)
+	if app_context == 'ui' and INFERENCE_POOLS.get('cli').get(inference_context):
+		INFERENCE_POOLS['ui'][inference_context] = INFERENCE_POOLS.get('cli').get(inference_context)
+	return INFERENCE_POOLS.get(app_context).get(inference_context)
+
+
+def create_inference_pool(model_context : str, model_sources : DownloadSet, execution_device_ids : List[str], execution_providers : List[ExecutionProvider]) -> InferencePool:
 	inference_pool : InferencePool = {}
 
 	for model_name in model_sources.keys():
-		inference_pool[model_name] = create_inference_session(model_sources.get(model_name).get('path'), execution_device_id, execution_providers)
+		model_path = resolve_model_path(model_sources.get(model_name).get('path'), execution_providers)
+		inference_session = create_inference_devices(model_path, execution_device_ids, execution_providers)
+		inference_pool[model_name] = InferenceProfiler(conditional_batch_inference_session(inference_session), model_context.split('.')[-1] + '.' + model_name) #type:ignore[assignment]
 	return inference_pool
 
 
+def resolve_model_path(model_path : str, execution_providers : List[ExecutionProvider]) -> str:
+	execution_quantized_models = state_manager.get_item('execution_quantized_models') or []
+	quantized_model_name, _ = os.path.splitext(os.path.basename(get_quantized_model_path(model_path)))
+
+	if execution_providers == [ 'cpu' ] and quantized_model_name in execution_quantized_models:
+		quantized_model_path = conditional_quantize_model(model_path)
+
+		if quantized_model_path:
+			logger.debug(wording.get('using_quantized_model').format(model_name = quantized_model_name), __name__)
+			return quantized_model_path
+	return model_path
+
+
+def create_inference_devices(model_path : str, execution_device_ids : List[str], execution_providers : List[ExecutionProvider]) -> InferenceSession:
+	inference_sessions = []
+	device_cpu_cores = split_cpu_cores(get_cpu_cores(), len(execution_device_ids))
+
+	for execution_device_id, cpu_cores in zip(execution_device_ids, device_cpu_cores):
+		inference_sessions.append(create_inference_replicas(model_path, execution_device_id, execution_providers, cpu_cores if execution_providers == [ 'cpu' ] and len(execution_device_ids) > 1 else None))
+	if len(inference_sessions) > 1:
+		return InferenceScheduler(inference_sessions, execution_device_ids) #type:ignore[return-value]
+	return inference_sessions[0]
+
+
+def get_execution_device_ids() -> List[str]:
+	execution_device_ids = state_manager.get_item('execution_device_ids')
+
+	if execution_device_ids:
+		return list(dict.fromkeys(map(str, execution_device_ids)))
+	return [ str(state_manager.get_item('execution_device_id')) ]
+
+
+def create_inference_replicas(model_path : str, execution_device_id : str, execution_providers : List[ExecutionProvider], cpu_cores : Optional[List[int]] = None) -> InferenceSession:
+	replica_cpu_cores = cpu_cores or get_cpu_cores()
+	replica_count = calc_replica_count(model_path, execution_providers, len(replica_cpu_cores), None)
+	inference_sessions = [ create_inference_session(model_path, execution_device_id, execution_providers, select_replica_cpu_cores(replica_cpu_cores, replica_count, cpu_cores)) ]
+
+	if has_auto_replica_count(execution_providers):
+		inference_latency = measure_inference_latency(inference_sessions[0])
+		measured_replica_count = calc_replica_count(model_path, execution_providers, len(replica_cpu_cores), inference_latency)
+
+		if measured_replica_count != replica_count:
+			inference_sessions = []
+			replica_count = measured_replica_count
+
+	for replica_index in range(len(inference_sessions), replica_count):
+		inference_sessions.append(create_inference_session(model_path, execution_device_id, execution_providers, split_cpu_cores(replica_cpu_cores, replica_count)[replica_index]))
+	if not inference_sessions:
+		inference_sessions.append(create_inference_session(model_path, execution_device_id, execution_providers, cpu_cores))
+	if replica_count > 1:
+		logger.info(wording.get('using_inference_replicas').format(replica_count = replica_count, model_name = os.path.basename(model_path)), __name__)
+	if len(inference_sessions) > 1:
+		return InferenceReplicas(inference_sessions) #type:ignore[return-value]
+	return inference_sessions[0]
+
+
+def select_replica_cpu_cores(replica_cpu_cores : List[int], replica_count : int, cpu_cores : Optional[List[int]]) -> Optional[List[int]]:
+	if replica_count > 1:
+		return split_cpu_cores(replica_cpu_cores, replica_count)[0]
+	return cpu_cores
+
+
+def has_auto_replica_count(execution_providers : List[ExecutionProvider]) -> bool:
+	return execution_providers == [ 'cpu' ] and not state_manager.get_item('execution_replica_count') and state_manager.get_item('video_memory_strategy') != 'strict'
+
+
+def calc_replica_count(model_path : str, execution_providers : List[ExecutionProvider], cpu_count : int, inference_latency : Optional[float]) -> int:
+	execution_replica_count = state_manager.get_item('execution_replica_count')
+	execution_thread_count = state_manager.get_item('execution_thread_count') or 1
+
+	if execution_providers != [ 'cpu' ]:
+		return 1
+	if execution_replica_count:
+		return min(execution_replica_count, cpu_count)
+	if state_manager.get_item('video_memory_strategy') == 'strict':
+		return 1
+	if inference_latency and inference_latency < 0.02:
+		return limit_replica_count(model_path, max(min(execution_thread_count, cpu_count), 1))
+	return limit_replica_count(model_path, max(min(execution_thread_count, cpu_count // 4), 1))
+
+
+def limit_replica_count(model_path : str, replica_count : int) -> int:
+	inference_memory_limit = state_manager.get_item('inference_memory_limit')
+
+	if inference_memory_limit and is_file(model_path):
+		return max(min(replica_count, inference_memory_limit * 1024 ** 3 // max(os.path.getsize(model_path), 1)), 1)
+	return replica_count
+
+
+def measure_inference_latency(inference_session : InferenceSession) -> Optional[float]:
+	input_feed = create_dummy_input_feed(inference_session)
+
+	if not input_feed:
+		return None
+	try:
+		inference_session.run(None, input_feed)
+		start_time = perf_counter()
+		inference_session.run(None, input_feed)
+		return perf_counter() - start_time
+	except Exception:
+		return None
+
+
+def warm_up_inference_session(inference_session : InferenceSession) -> bool:
+	if isinstance(inference_session, (InferenceBatcher, InferenceProfiler)):
+		return warm_up_inference_session(inference_session.inference_session)
+	if isinstance(inference_session, (InferenceReplicas, InferenceScheduler)):
+		return all([ warm_up_inference_session(session) for session in inference_session.inference_sessions ])
+	input_feed = create_dummy_input_feed(inference_session)
+
+	if input_feed:
+		try:
+			inference_session.run(None, input_feed)
+			return True
+		except Exception:
+			return False
+	return False
+
+
+def create_dummy_input_feed(inference_session : InferenceSession) -> Optional[InferenceInputs]:
+	input_feed = {}
+
+	for session_input in inference_session.get_inputs():
+		input_type = facefusion.choices.inference_input_type_set.get(session_input.type)
+		if not input_type:
+			return None
+		input_shape = [ input_dimension if isinstance(input_dimension, int) else 1 for input_dimension in session_input.shape ]
+		input_feed[session_input.name] = numpy.zeros(input_shape, dtype = input_type)
+	return input_feed
+
+
+def get_cpu_cores() -> List[int]:
+	if hasattr(os, 'sched_getaffinity'):
+		return sorted(os.sched_getaffinity(0))
+	return list(range(os.cpu_count() or 1))
+
+
+def split_cpu_cores(cpu_cores : List[int], split_count : int) -> List[List[int]]:
+	return [ cpu_cores[index * len(cpu_cores) // split_count:(index + 1) * len(cpu_cores) // split_count] or cpu_cores for index in range(split_count) ]
+
+
+def run_inference_session(inference_session : InferenceSession, input_feed : InferenceInputs) -> Any:
+	if has_inference_batcher(inference_session):
+		return inference_session.run(None, input_feed)
+	return inference_session.run(None, input_feed, IO_BINDING_RUN_OPTIONS)
+
+
+def has_inference_batcher(inference_session : InferenceSession) -> bool:
+	if isinstance(inference_session, InferenceProfiler):
+		return has_inference_batcher(inference_session.inference_session)
+	return isinstance(inference_session, InferenceBatcher)
+
+
+def conditional_batch_inference_session(inference_session : InferenceSession) -> InferenceSession:
+	execution_batch_size = state_manager.get_item('execution_batch_size')
+
+	if execution_batch_size and execution_batch_size > 1:
+		return InferenceBatcher(inference_session, execution_batch_size, state_manager.get_item('execution_batch_window') / 1000, state_manager.get_item('execution_thread_count') or 1) #type:ignore[return-value]
+	return inference_session
+
+
 def clear_inference_pool(model_context : str) -> None:
 	global INFERENCE_POOLS
 
+	if state_manager.get_item('inference_memory_limit'):
+		return
 	app_context = detect_app_context()
 	inference_context = get_inference_context(model_context)
 
 	if INFERENCE_POOLS.get(app_context).get(inference_context):
 		del INFERENCE_POOLS[app_context][inference_context]
+		INFERENCE_POOL_USAGES.pop(inference_context, None)
+
+
+def evict_inference_pools(keep_inference_context : str) -> None:
+	inference_memory_limit = state_manager.get_item('inference_memory_limit')
+
+	if inference_memory_limit:
+		inference_memory_budget = inference_memory_limit * 1024 ** 3
+
+		while sum(inference_pool_usage.get('footprint') for inference_pool_usage in INFERENCE_POOL_USAGES.values()) > inference_memory_budget:
+			evict_inference_contexts = [ inference_context for inference_context in INFERENCE_POOL_USAGES if inference_context != keep_inference_context ]
 
+			if not evict_inference_contexts:
+				break
+			evict_inference_context = min(evict_inference_contexts, key = lambda inference_context : INFERENCE_POOL_USAGES.get(inference_context).get('used_at'))
+			logger.debug(wording.get('evicting_inference_pool').format(inference_context = evict_inference_context), __name__)
+			INFERENCE_POOL_USAGES.pop(evict_inference_context)
+			INFERENCE_POOLS.get('cli').pop(evict_inference_context, None)
+			INFERENCE_POOLS.get('ui').pop(evict_inference_context, None)
 
-def create_inference_session(model_path : str, execution_device_id : str, execution_providers : List[ExecutionProvider]) -> InferenceSession:
+
+def calc_inference_pool_footprint(model_sources : DownloadSet, inference_pool : InferencePool) -> int:
+	inference_pool_footprint = 0
+
+	for model_name, inference_session in inference_pool.items():
+		model_path = resolve_model_path(model_sources.get(model_name).get('path'), state_manager.get_item('execution_providers'))
+
+		if is_file(model_path):
+			inference_pool_footprint += os.path.getsize(model_path) * count_inference_sessions(inference_session)
+	return inference_pool_footprint
+
+
+def count_inference_sessions(inference_session : Any) -> int:
+	if isinstance(inference_session, (InferenceBatcher, InferenceProfiler)):
+		return count_inference_sessions(inference_session.inference_session)
+	if isinstance(inference_session, (InferenceReplicas, InferenceScheduler)):
+		return sum(count_inference_sessions(session) for session in inference_session.inference_sessions)
+	return 1
+
+
+def create_inference_session(model_path : str, execution_device_id : str, execution_providers : List[ExecutionProvider], cpu_cores : Optional[List[int]] = None) -> InferenceSession:
 	inference_execution_providers = create_inference_execution_providers(execution_device_id, execution_providers)
-	return InferenceSession(model_path, providers = inference_execution_providers)
+	session_options = create_session_options(cpu_cores)
+	optimized_model_path = get_optimized_model_path(model_path, execution_providers)
+
+	if optimized_model_path and is_file(optimized_model_path):
+		try:
+			session_options.graph_optimization_level = GraphOptimizationLevel.ORT_DISABLE_ALL
+			return InferenceBinder(InferenceSession(optimized_model_path, sess_options = session_options, providers = inference_execution_providers)) #type:ignore[return-value]
+		except Exception:
+			remove_file(optimized_model_path)
+			session_options = create_session_options(cpu_cores)
+	if optimized_model_path and create_directory(os.path.dirname(optimized_model_path)):
+		temp_optimized_model_path = get_temp_optimized_model_path(optimized_model_path)
+		session_options.optimized_model_filepath = temp_optimized_model_path
+
+		try:
+			inference_session = InferenceSession(model_path, sess_options = session_options, providers = inference_execution_providers)
+		except Exception:
+			remove_file(temp_optimized_model_path)
+			raise
+		if is_file(temp_optimized_model_path):
+			os.replace(temp_optimized_model_path, optimized_model_path)
+		return InferenceBinder(inference_session) #type:ignore[return-value]
+	return InferenceBinder(InferenceSession(model_path, sess_options = session_options, providers = inference_execution_providers)) #type:ignore[return-value]
+
+
+def get_temp_optimized_model_path(optimized_model_path : str) -> str:
+	optimized_model_name, optimized_model_extension = os.path.splitext(optimized_model_path)
+	return optimized_model_name + '.' + str(os.getpid()) + '.' + str(threading.get_ident()) + optimized_model_extension
+
+
+def create_session_options(cpu_cores : Optional[List[int]] = None) -> SessionOptions:
+	session_options = SessionOptions()
+	execution_thread_count = state_manager.get_item('execution_thread_count') or 1
+	intra_op_thread_count = max((os.cpu_count() or 1) // execution_thread_count, 1)
+
+	if cpu_cores:
+		intra_op_thread_count = len(cpu_cores)
+		if intra_op_thread_count > 1:
+			session_options.add_session_config_entry('session.intra_op_thread_affinities', ';'.join(str(cpu_core + 1) for cpu_core in cpu_cores[1:]))
+	session_options.intra_op_num_threads = intra_op_thread_count
+	session_options.graph_optimization_level = facefusion.choices.execution_graph_optimization_set.get(state_manager.get_item('execution_graph_optimization') or 'all')
+
+	if state_manager.get_item('execution_mode') == 'parallel':
+		session_options.execution_mode = ExecutionMode.ORT_PARALLEL
+		session_options.inter_op_num_threads = intra_op_thread_count
+	else:
+		session_options.execution_mode = ExecutionMode.ORT_SEQUENTIAL
+		session_options.inter_op_num_threads = 1
+	if state_manager.get_item('video_memory_strategy') == 'strict':
+		session_options.enable_cpu_mem_arena = False
+	return session_options
+
+
+def get_optimized_model_path(model_path : str, execution_providers : List[ExecutionProvider]) -> Optional[str]:
+	execution_graph_optimization = state_manager.get_item('execution_graph_optimization') or 'all'
+
+	if execution_providers == [ 'cpu' ] and execution_graph_optimization != 'disabled' and is_file(model_path):
+		model_stat = os.stat(model_path)
+		optimized_model_parts =\
+		[
+			os.path.abspath(model_path),
+			model_stat.st_size,
+			model_stat.st_mtime_ns,
+			onnxruntime_version,
+			execution_graph_optimization,
+			'_'.join(execution_providers),
+			detect_static_cpu_identity()
+		]
+		optimized_model_key = hashlib.sha1('|'.join(map(str, optimized_model_parts)).encode()).hexdigest()
+		model_name, _ = os.path.splitext(os.path.basename(model_path))
+		return os.path.join(resolve_relative_path('../.caches'), 'optimized_models', model_name + '.' + optimized_model_key + '.onnx')
+	return None
 
 
 def get_inference_context(model_context : str) -> str:
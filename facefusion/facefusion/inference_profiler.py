@@ -0,0 +1,104 @@
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+import numpy
+from onnxruntime import InferenceSession
+
+from facefusion.typing import InferenceHistogram, InferenceInputs, InferenceOutputs, InferenceProfile
+
+INFERENCE_PROFILES : Dict[str, InferenceProfile] = {}
+INFERENCE_PROFILE_LOCK : threading.Lock = threading.Lock()
+INFERENCE_HISTOGRAM_BOUNDS : List[float] = [ 0.0001 * 2 ** index for index in range(16) ]
+INFERENCE_TIMING = threading.local()
+
+
+class InferenceProfiler:
+	def __init__(self, inference_session : InferenceSession, profile_name : str) -> None:
+		self.inference_session = inference_session
+		self.profile_name = profile_name
+
+	def __getattr__(self, name : str) -> Any:
+		return getattr(self.inference_session, name)
+
+	def run(self, output_names : Optional[List[str]], input_feed : InferenceInputs, run_options : Any = None) -> InferenceOutputs:
+		INFERENCE_TIMING.run_time = 0.0
+		start_time = perf_counter()
+
+		try:
+			return self.inference_session.run(output_names, input_feed, run_options)
+		finally:
+			call_time = perf_counter() - start_time
+			run_time = min(INFERENCE_TIMING.run_time, call_time)
+			record_inference(self.profile_name, count_batch_total(input_feed), call_time - run_time, run_time)
+
+
+def record_run_time(run_time : float) -> None:
+	INFERENCE_TIMING.run_time = getattr(INFERENCE_TIMING, 'run_time', 0.0) + run_time
+
+
+def record_inference(profile_name : str, batch_total : int, queue_wait : float, run_time : float) -> None:
+	with INFERENCE_PROFILE_LOCK:
+		if profile_name not in INFERENCE_PROFILES:
+			INFERENCE_PROFILES[profile_name] =\
+			{
+				'call_total': 0,
+				'batch_total': 0,
+				'queue_wait': create_histogram(),
+				'run_time': create_histogram()
+			}
+		inference_profile = INFERENCE_PROFILES.get(profile_name)
+		inference_profile['call_total'] += 1
+		inference_profile['batch_total'] += batch_total
+		update_histogram(inference_profile.get('queue_wait'), queue_wait)
+
+		if run_time > 0:
+			update_histogram(inference_profile.get('run_time'), run_time)
+
+
+def count_batch_total(input_feed : InferenceInputs) -> int:
+	for input_value in input_feed.values():
+		if isinstance(input_value, numpy.ndarray) and input_value.ndim > 0:
+			return input_value.shape[0]
+	return 1
+
+
+def create_histogram() -> InferenceHistogram:
+	return\
+	{
+		'total': 0,
+		'sum': 0.0,
+		'maximum': 0.0,
+		'buckets': [ 0 ] * (len(INFERENCE_HISTOGRAM_BOUNDS) + 1)
+	}
+
+
+def update_histogram(inference_histogram : InferenceHistogram, value : float) -> None:
+	inference_histogram['total'] += 1
+	inference_histogram['sum'] += value
+	inference_histogram['maximum'] = max(inference_histogram.get('maximum'), value)
+	inference_histogram['buckets'][bisect_left(INFERENCE_HISTOGRAM_BOUNDS, value)] += 1
+
+
+def calc_histogram_percentile(inference_histogram : InferenceHistogram, percentile : float) -> float:
+	histogram_total = inference_histogram.get('total')
+	bucket_total = 0
+
+	if histogram_total:
+		for index, bucket in enumerate(inference_histogram.get('buckets')):
+			bucket_total += bucket
+			if bucket_total >= histogram_total * percentile:
+				if index < len(INFERENCE_HISTOGRAM_BOUNDS):
+					return min(INFERENCE_HISTOGRAM_BOUNDS[index], inference_histogram.get('maximum'))
+				return inference_histogram.get('maximum')
+	return 0.0
+
+
+def get_inference_profiles() -> Dict[str, InferenceProfile]:
+	return INFERENCE_PROFILES
+
+
+def clear_inference_profiles() -> None:
+	with INFERENCE_PROFILE_LOCK:
+		INFERENCE_PROFILES.clear()
@@ -0,0 +1,26 @@
+from queue import Queue
+from typing import Any, List, Optional
+
+from onnxruntime import InferenceSession
+
+from facefusion.typing import InferenceInputs, InferenceOutputs
+
+
+class InferenceReplicas:
+	def __init__(self, inference_sessions : List[InferenceSession]) -> None:
+		self.inference_sessions = inference_sessions
+		self.replica_queue : Queue[InferenceSession] = Queue()
+
+		for inference_session in inference_sessions:
+			self.replica_queue.put(inference_session)
+
+	def __getattr__(self, name : str) -> Any:
+		return getattr(self.inference_sessions[0], name)
+
+	def run(self, output_names : Optional[List[str]], input_feed : InferenceInputs, run_options : Any = None) -> InferenceOutputs:
+		inference_session = self.replica_queue.get()
+
+		try:
+			return inference_session.run(output_names, input_feed, run_options)
+		finally:
+			self.replica_queue.put(inference_session)
@@ -0,0 +1,35 @@
+import threading
+from typing import Any, List, Optional
+
+from onnxruntime import InferenceSession
+
+from facefusion.typing import InferenceInputs, InferenceOutputs
+
+
+class InferenceScheduler:
+	def __init__(self, inference_sessions : List[InferenceSession], execution_device_ids : List[str]) -> None:
+		self.inference_sessions = inference_sessions
+		self.execution_device_ids = execution_device_ids
+		self.inference_loads = [ 0 ] * len(inference_sessions)
+		self.lock = threading.Lock()
+
+	def __getattr__(self, name : str) -> Any:
+		return getattr(self.inference_sessions[0], name)
+
+	def run(self, output_names : Optional[List[str]], input_feed : InferenceInputs, run_options : Any = None) -> InferenceOutputs:
+		session_index = self.acquire_session()
+
+		try:
+			return self.inference_sessions[session_index].run(output_names, input_feed, run_options)
+		finally:
+			self.release_session(session_index)
+
+	def acquire_session(self) -> int:
+		with self.lock:
+			session_index = self.inference_loads.index(min(self.inference_loads))
+			self.inference_loads[session_index] += 1
+		return session_index
+
+	def release_session(self, session_index : int) -> None:
+		with self.lock:
+			self.inference_loads[session_index] -= 1
@@ -1,3 +1,4 @@
+from facefusion.app_context import use_app_context
 from facefusion.ffmpeg import concat_video
 from facefusion.filesystem import is_image, is_video, move_file, remove_file
 from facefusion.jobs import job_helper, job_manager
@@ -49,12 +50,13 @@ def retry_jobs(process_step : ProcessStep) -> bool:
 def run_step(job_id : str, step_index : int, step : JobStep, process_step : ProcessStep) -> bool:
 	step_args = step.get('args')
 
-	if job_manager.set_step_status(job_id, step_index, 'started') and process_step(job_id, step_index, step_args):
-		output_path = step_args.get('output_path')
-		step_output_path = job_helper.get_step_output_path(job_id, step_index, output_path)
+	with use_app_context('cli'):
+		if job_manager.set_step_status(job_id, step_index, 'started') and process_step(job_id, step_index, step_args):
+			output_path = step_args.get('output_path')
+			step_output_path = job_helper.get_step_output_path(job_id, step_index, output_path)
 
-		return move_file(output_path, step_output_path) and job_manager.set_step_status(job_id, step_index, 'completed')
-	job_manager.set_step_status(job_id, step_index, 'failed')
+			return move_file(output_path, step_output_path) and job_manager.set_step_status(job_id, step_index, 'completed')
+		job_manager.set_step_status(job_id, step_index, 'failed')
 	return False
 
 
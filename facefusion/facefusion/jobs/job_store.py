@@ -19,9 +19,11 @@ def get_step_keys() -> List[str]:
 
 def register_job_keys(step_keys : List[str]) -> None:
 	for step_key in step_keys:
-		JOB_STORE['job_keys'].append(step_key)
+		if step_key not in JOB_STORE['job_keys']:
+			JOB_STORE['job_keys'].append(step_key)
 
 
 def register_step_keys(job_keys : List[str]) -> None:
 	for job_key in job_keys:
-		JOB_STORE['step_keys'].append(job_key)
+		if job_key not in JOB_STORE['step_keys']:
+			JOB_STORE['step_keys'].append(job_key)
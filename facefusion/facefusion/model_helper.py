@@ -1,11 +1,136 @@
+import os
+import threading
 from functools import lru_cache
+from typing import Optional
 
+import numpy
 import onnx
+from onnxruntime import InferenceSession
+from onnxruntime.quantization import QuantType, quantize_dynamic
 
-from facefusion.typing import ModelInitializer
+import facefusion.choices
+from facefusion.filesystem import remove_file
+from facefusion.hash_helper import create_hash, get_hash_path, validate_hash
+from facefusion.typing import InferenceInputs, ModelInitializer
+
+MODEL_CONVERT_LOCK : threading.Lock = threading.Lock()
 
 
 @lru_cache(maxsize = None)
 def get_static_model_initializer(model_path : str) -> ModelInitializer:
 	model = onnx.load(model_path)
 	return onnx.numpy_helper.to_array(model.graph.initializer[-1])
+
+
+def get_quantized_model_path(model_path : str) -> str:
+	model_directory_path, model_file_name = os.path.split(model_path)
+	model_name, model_extension = os.path.splitext(model_file_name)
+	return os.path.join(model_directory_path, model_name + '_int8' + model_extension)
+
+
+@lru_cache(maxsize = None)
+def conditional_quantize_model(model_path : str) -> Optional[str]:
+	quantized_model_path = get_quantized_model_path(model_path)
+
+	if validate_hash(quantized_model_path) or quantize_model(model_path, quantized_model_path):
+		return quantized_model_path
+	return None
+
+
+def quantize_model(model_path : str, quantized_model_path : str) -> bool:
+	try:
+		quantize_dynamic(model_path, quantized_model_path, weight_type = QuantType.QUInt8)
+	except Exception:
+		remove_file(quantized_model_path)
+		return False
+
+	return write_model_hash(quantized_model_path)
+
+
+def get_dynamic_batch_model_path(model_path : str) -> str:
+	model_directory_path, model_file_name = os.path.split(model_path)
+	model_name, model_extension = os.path.splitext(model_file_name)
+	return os.path.join(model_directory_path, model_name + '_batch' + model_extension)
+
+
+@lru_cache(maxsize = None)
+def has_dynamic_batch(model_path : str) -> bool:
+	model = onnx.load(model_path, load_external_data = False)
+	initializer_names = [ initializer.name for initializer in model.graph.initializer ]
+
+	for model_input in model.graph.input:
+		model_input_dims = model_input.type.tensor_type.shape.dim
+		if model_input.name not in initializer_names and model_input_dims and model_input_dims[0].HasField('dim_value'):
+			return False
+	return True
+
+
+@lru_cache(maxsize = None)
+def conditional_dynamic_batch_model(model_path : str) -> Optional[str]:
+	if has_dynamic_batch(model_path):
+		return model_path
+	dynamic_batch_model_path = get_dynamic_batch_model_path(model_path)
+
+	with MODEL_CONVERT_LOCK:
+		if validate_hash(dynamic_batch_model_path) or convert_dynamic_batch_model(model_path, dynamic_batch_model_path):
+			return dynamic_batch_model_path
+	return None
+
+
+def convert_dynamic_batch_model(model_path : str, dynamic_batch_model_path : str) -> bool:
+	try:
+		model = onnx.load(model_path)
+		initializer_names = [ initializer.name for initializer in model.graph.initializer ]
+
+		for model_value in list(model.graph.input) + list(model.graph.output):
+			model_value_dims = model_value.type.tensor_type.shape.dim
+			if model_value.name not in initializer_names and model_value_dims:
+				model_value_dims[0].dim_param = 'batch'
+		del model.graph.value_info[:]
+		onnx.save(model, dynamic_batch_model_path)
+	except Exception:
+		remove_file(dynamic_batch_model_path)
+		return False
+
+	if validate_dynamic_batch_model(model_path, dynamic_batch_model_path):
+		return write_model_hash(dynamic_batch_model_path)
+	remove_file(dynamic_batch_model_path)
+	return False
+
+
+def validate_dynamic_batch_model(model_path : str, dynamic_batch_model_path : str) -> bool:
+	try:
+		inference_session = InferenceSession(model_path, providers = [ 'CPUExecutionProvider' ])
+		dynamic_batch_session = InferenceSession(dynamic_batch_model_path, providers = [ 'CPUExecutionProvider' ])
+		input_feeds = [ create_random_input_feed(inference_session, seed) for seed in range(2) ]
+		outputs_set = [ inference_session.run(None, input_feed) for input_feed in input_feeds ]
+		batch_input_feed = { input_name: numpy.concatenate([ input_feed.get(input_name) for input_feed in input_feeds ]) for input_name in input_feeds[0] }
+		batch_outputs = dynamic_batch_session.run(None, batch_input_feed)
+	except Exception:
+		return False
+
+	for index, batch_output in enumerate(batch_outputs):
+		output = numpy.concatenate([ outputs[index] for outputs in outputs_set ])
+		if batch_output.shape != output.shape or not numpy.allclose(batch_output, output, rtol = 1e-2, atol = 1e-3):
+			return False
+	return True
+
+
+def create_random_input_feed(inference_session : InferenceSession, seed : int) -> InferenceInputs:
+	random_state = numpy.random.RandomState(seed)
+	input_feed = {}
+
+	for session_input in inference_session.get_inputs():
+		input_type = facefusion.choices.inference_input_type_set.get(session_input.type, numpy.float32)
+		input_shape = [ input_dimension if isinstance(input_dimension, int) else 1 for input_dimension in session_input.shape ]
+		input_feed[session_input.name] = random_state.rand(*input_shape).astype(input_type)
+	return input_feed
+
+
+def write_model_hash(model_path : str) -> bool:
+	with open(model_path, 'rb') as model_file:
+		model_content = model_file.read()
+
+	with open(get_hash_path(model_path), 'w') as hash_file:
+		hash_file.write(create_hash(model_content))
+	return validate_hash(model_path)
@@ -1,6 +1,7 @@
 from typing import List, Optional
 
-from facefusion.typing import Fps, Padding
+import facefusion.choices
+from facefusion.typing import ExecutionModelConcurrency, Fps, Padding, ReferenceFacePair
 
 
 def normalize_padding(padding : Optional[List[int]]) -> Optional[Padding]:
@@ -19,3 +20,25 @@ def normalize_fps(fps : Optional[float]) -> Optional[Fps]:
 	if isinstance(fps, (int, float)):
 		return max(1.0, min(fps, 60.0))
 	return None
+
+
+def normalize_reference_face_pairs(reference_face_pairs : Optional[List[str]]) -> Optional[List[ReferenceFacePair]]:
+	normalized_reference_face_pairs = []
+
+	if reference_face_pairs:
+		for reference_face_pair in reference_face_pairs:
+			reference_frame_number, _, reference_face_position = str(reference_face_pair).partition(':')
+			if reference_frame_number.isdigit() and (reference_face_position.isdigit() or not reference_face_position):
+				normalized_reference_face_pairs.append((int(reference_frame_number), int(reference_face_position or 0)))
+	return normalized_reference_face_pairs or None
+
+
+def normalize_model_concurrency(model_concurrency : Optional[List[str]]) -> Optional[ExecutionModelConcurrency]:
+	normalized_model_concurrency : ExecutionModelConcurrency = {}
+
+	if model_concurrency:
+		for model_concurrency_pair in model_concurrency:
+			model_name, _, model_limit = str(model_concurrency_pair).partition(':')
+			if model_name in facefusion.choices.execution_concurrency_models and model_limit.isdigit():
+				normalized_model_concurrency[model_name] = int(model_limit) #type:ignore[index]
+	return normalized_model_concurrency or None
@@ -1,15 +1,22 @@
 import importlib
 import os
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import Queue
+from functools import partial
+from itertools import islice
+from queue import Empty, Queue
+from time import perf_counter
 from types import ModuleType
-from typing import Any, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from tqdm import tqdm
 
-from facefusion import logger, state_manager, wording
+from facefusion import logger, process_manager, state_manager, wording
+from facefusion.app_context import detect_app_context, set_app_context
 from facefusion.exit_helper import hard_exit
-from facefusion.typing import ProcessFrames, QueuePayload
+from facefusion.frame_context import clear_frame_context, create_frame_context, set_frame_context, update_frame_context
+from facefusion.typing import CompleteFrames, FrameContextRule, FrameSchedule, ProcessFrames, QueuePayload, UpdateProgress, VisionFrame
+from facefusion.vision import read_image, write_image
 
 PROCESSORS_METHODS =\
 [
@@ -23,9 +30,26 @@ PROCESSORS_METHODS =\
 	'get_reference_frame',
 	'process_frame',
 	'process_frames',
+	'process_vision_frame',
 	'process_image',
 	'process_video'
 ]
+FRAME_CONTEXT_RULES : Dict[str, FrameContextRule] =\
+{
+	'age_modifier': 'invalidate',
+	'deep_swapper': 'keep',
+	'expression_restorer': 'invalidate',
+	'face_debugger': 'keep',
+	'face_editor': 'invalidate',
+	'face_enhancer': 'keep',
+	'face_swapper': 'keep',
+	'frame_colorizer': 'keep',
+	'frame_enhancer': 'invalidate',
+	'lip_syncer': 'invalidate'
+}
+FRAME_SCHEDULE_LOCK : threading.Lock = threading.Lock()
+FRAME_SCHEDULE_DURATION : float = 0.5
+FRAME_STREAM_LOCK : threading.Lock = threading.Lock()
 
 
 def load_processor_module(processor : str) -> Any:
@@ -53,23 +77,154 @@ def get_processors_modules(processors : List[str]) -> List[ModuleType]:
 	return processor_modules
 
 
-def multi_process_frames(source_paths : List[str], temp_frame_paths : List[str], process_frames : ProcessFrames) -> None:
+def multi_process_frames(source_paths : List[str], temp_frame_paths : List[str], process_frames : ProcessFrames, complete_frames : Optional[CompleteFrames] = None) -> None:
 	queue_payloads = create_queue_payloads(temp_frame_paths)
 	with tqdm(total = len(queue_payloads), desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
 		progress.set_postfix(execution_providers = state_manager.get_item('execution_providers'))
-		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
-			futures = []
+		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), initializer = set_app_context, initargs = (detect_app_context(),)) as executor:
 			queue : Queue[QueuePayload] = create_queue(queue_payloads)
-			queue_per_future = max(len(queue_payloads) // state_manager.get_item('execution_thread_count') * state_manager.get_item('execution_queue_count'), 1)
-
-			while not queue.empty():
-				future = executor.submit(process_frames, source_paths, pick_queue(queue, queue_per_future), progress.update)
-				futures.append(future)
+			frame_schedule = create_frame_schedule(state_manager.get_item('execution_thread_count'))
+			futures = [ executor.submit(pull_process_frames, source_paths, queue, process_frames, progress.update, frame_schedule, complete_frames) for _ in range(frame_schedule.get('thread_count')) ]
 
 			for future_done in as_completed(futures):
 				future_done.result()
 
 
+def pull_process_frames(source_paths : List[str], queue : Queue[QueuePayload], process_frames : ProcessFrames, update_progress : UpdateProgress, frame_schedule : FrameSchedule, complete_frames : Optional[CompleteFrames]) -> None:
+	while not process_manager.is_stopping():
+		queue_payloads = pick_queue(queue, calc_pick_total(frame_schedule, queue.qsize()))
+
+		if not queue_payloads:
+			break
+		start_time = perf_counter()
+		process_frames(source_paths, queue_payloads, update_progress)
+		update_frame_latency(frame_schedule, (perf_counter() - start_time) / len(queue_payloads))
+
+		if process_manager.is_stopping():
+			break
+		if complete_frames:
+			complete_queue_payloads(frame_schedule, queue_payloads, complete_frames)
+
+
+def create_frame_schedule(thread_count : int) -> FrameSchedule:
+	frame_schedule : FrameSchedule =\
+	{
+		'thread_count': max(thread_count, 1),
+		'frame_latency': None,
+		'frame_numbers': set(),
+		'next_frame_number': 0
+	}
+	return frame_schedule
+
+
+def calc_pick_total(frame_schedule : FrameSchedule, queue_total : int) -> int:
+	frame_latency = frame_schedule.get('frame_latency')
+	pick_limit = max(queue_total // (frame_schedule.get('thread_count') * 2), 1)
+
+	if frame_latency:
+		return min(max(round(FRAME_SCHEDULE_DURATION / frame_latency), 1), pick_limit)
+	return min(state_manager.get_item('execution_queue_count'), pick_limit)
+
+
+def update_frame_latency(frame_schedule : FrameSchedule, frame_latency : float) -> None:
+	with FRAME_SCHEDULE_LOCK:
+		previous_frame_latency = frame_schedule.get('frame_latency')
+
+		if previous_frame_latency:
+			frame_latency = previous_frame_latency * 0.5 + frame_latency * 0.5
+		frame_schedule['frame_latency'] = frame_latency
+
+
+def complete_queue_payloads(frame_schedule : FrameSchedule, queue_payloads : List[QueuePayload], complete_frames : CompleteFrames) -> None:
+	complete_frame_numbers(frame_schedule, [ queue_payload.get('frame_number') for queue_payload in queue_payloads ], complete_frames)
+
+
+def complete_frame_numbers(frame_schedule : FrameSchedule, frame_numbers : List[int], complete_frames : CompleteFrames) -> None:
+	with FRAME_SCHEDULE_LOCK:
+		schedule_frame_numbers = frame_schedule.get('frame_numbers')
+		schedule_frame_numbers.update(frame_numbers)
+		next_frame_numbers = []
+
+		while frame_schedule.get('next_frame_number') in schedule_frame_numbers:
+			schedule_frame_numbers.remove(frame_schedule.get('next_frame_number'))
+			next_frame_numbers.append(frame_schedule.get('next_frame_number'))
+			frame_schedule['next_frame_number'] += 1
+
+		if next_frame_numbers:
+			complete_frames(next_frame_numbers)
+
+
+def multi_process_stream(source_paths : List[str], processor_modules : List[ModuleType], vision_frames : Iterator[VisionFrame], write_vision_frame : Callable[[VisionFrame], None], frame_total : int) -> None:
+	with tqdm(total = frame_total, desc = wording.get('streaming'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+		progress.set_postfix(execution_providers = state_manager.get_item('execution_providers'))
+		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), initializer = set_app_context, initargs = (detect_app_context(),)) as executor:
+			stream_frames : Dict[int, VisionFrame] = {}
+			stream_event = threading.Event()
+			stream_vision_frames = enumerate(vision_frames)
+			frame_schedule = create_frame_schedule(state_manager.get_item('execution_thread_count'))
+
+			def complete_frames(frame_numbers : List[int]) -> None:
+				for frame_number in frame_numbers:
+					write_vision_frame(stream_frames.pop(frame_number))
+					progress.update(1)
+
+			futures = [ executor.submit(pull_process_stream, source_paths, processor_modules, stream_vision_frames, frame_total, stream_frames, stream_event, frame_schedule, complete_frames) for _ in range(frame_schedule.get('thread_count')) ]
+
+			try:
+				for future_done in as_completed(futures):
+					future_done.result()
+			finally:
+				stream_event.set()
+
+
+def pull_process_stream(source_paths : List[str], processor_modules : List[ModuleType], vision_frames : Iterator[Tuple[int, VisionFrame]], frame_total : int, stream_frames : Dict[int, VisionFrame], stream_event : threading.Event, frame_schedule : FrameSchedule, complete_frames : CompleteFrames) -> None:
+	while not process_manager.is_stopping() and not stream_event.is_set():
+		with FRAME_STREAM_LOCK:
+			pick_total = calc_pick_total(frame_schedule, frame_total - frame_schedule.get('next_frame_number'))
+			stream_payloads = list(islice(vision_frames, pick_total))
+
+		if not stream_payloads:
+			break
+		start_time = perf_counter()
+
+		for frame_number, vision_frame in stream_payloads:
+			stream_frames[frame_number] = process_vision_frame(source_paths, processor_modules, frame_number, vision_frame)
+		update_frame_latency(frame_schedule, (perf_counter() - start_time) / len(stream_payloads))
+		complete_frame_numbers(frame_schedule, [ frame_number for frame_number, _ in stream_payloads ], complete_frames)
+
+
+def multi_process_chain(source_paths : List[str], temp_frame_paths : List[str], processor_modules : List[ModuleType]) -> None:
+	multi_process_frames(source_paths, temp_frame_paths, partial(process_chain_frames, processor_modules))
+
+
+def process_chain_frames(processor_modules : List[ModuleType], source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+	for queue_payload in process_manager.manage(queue_payloads):
+		target_vision_path = queue_payload.get('frame_path')
+		target_vision_frame = read_image(target_vision_path)
+		output_vision_frame = process_vision_frame(source_paths, processor_modules, queue_payload.get('frame_number'), target_vision_frame)
+		write_image(target_vision_path, output_vision_frame)
+		update_progress(1)
+
+
+def process_vision_frame(source_paths : List[str], processor_modules : List[ModuleType], frame_number : int, vision_frame : VisionFrame) -> VisionFrame:
+	frame_context = create_frame_context(vision_frame, frame_number)
+	set_frame_context(frame_context)
+
+	try:
+		for processor_module in processor_modules:
+			temp_vision_frame = processor_module.process_vision_frame(source_paths, frame_number, vision_frame)
+			frame_context_rule = FRAME_CONTEXT_RULES.get(get_processor_name(processor_module), 'invalidate')
+			update_frame_context(frame_context, temp_vision_frame, frame_context_rule)
+			vision_frame = temp_vision_frame
+	finally:
+		clear_frame_context()
+	return vision_frame
+
+
+def get_processor_name(processor_module : ModuleType) -> str:
+	return processor_module.__name__.split('.')[-1]
+
+
 def create_queue(queue_payloads : List[QueuePayload]) -> Queue[QueuePayload]:
 	queue : Queue[QueuePayload] = Queue()
 	for queue_payload in queue_payloads:
@@ -80,8 +235,10 @@ def create_queue(queue_payloads : List[QueuePayload]) -> Queue[QueuePayload]:
 def pick_queue(queue : Queue[QueuePayload], queue_per_future : int) -> List[QueuePayload]:
 	queues = []
 	for _ in range(queue_per_future):
-		if not queue.empty():
-			queues.append(queue.get())
+		try:
+			queues.append(queue.get_nowait())
+		except Empty:
+			break
 	return queues
 
 
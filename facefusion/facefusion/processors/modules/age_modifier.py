@@ -22,7 +22,7 @@ from facefusion.filesystem import in_directory, is_image, is_video, resolve_rela
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.typing import AgeModifierDirection, AgeModifierInputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import thread_semaphore
+from facefusion.thread_helper import conditional_model_semaphore
 from facefusion.typing import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import match_frame_color, read_image, read_static_image, write_image
 
@@ -171,7 +171,7 @@ def forward(crop_vision_frame : VisionFrame, extend_vision_frame : VisionFrame,
 		if age_modifier_input.name == 'direction':
 			age_modifier_inputs[age_modifier_input.name] = age_modifier_direction
 
-	with thread_semaphore():
+	with conditional_model_semaphore(__name__):
 		crop_vision_frame = age_modifier.run(None, age_modifier_inputs)[0][0]
 
 	return crop_vision_frame
@@ -221,20 +221,24 @@ def process_frame(inputs : AgeModifierInputs) -> VisionFrame:
 
 
 def process_frames(source_path : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-
 	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
+		target_vision_path = queue_payload.get('frame_path')
 		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'target_vision_frame': target_vision_frame
-		})
+		output_vision_frame = process_vision_frame(source_path, queue_payload.get('frame_number'), target_vision_frame)
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
 
 
+def process_vision_frame(source_path : List[str], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+
+	return process_frame(
+	{
+		'reference_faces': reference_faces,
+		'target_vision_frame': target_vision_frame
+	})
+
+
 def process_image(source_path : str, target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	target_vision_frame = read_static_image(target_path)
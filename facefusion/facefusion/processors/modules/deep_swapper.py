@@ -21,7 +21,7 @@ from facefusion.filesystem import in_directory, is_image, is_video, list_directo
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.typing import DeepSwapperInputs, DeepSwapperMorph
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import thread_semaphore
+from facefusion.thread_helper import conditional_model_semaphore
 from facefusion.typing import ApplyStateItem, Args, DownloadScope, Face, InferencePool, Mask, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import conditional_match_frame_color, read_image, read_static_image, write_image
 
@@ -350,7 +350,7 @@ def forward(crop_vision_frame : VisionFrame, deep_swapper_morph : DeepSwapperMor
 		if deep_swapper_input.name == 'morph_value:0':
 			deep_swapper_inputs[deep_swapper_input.name] = deep_swapper_morph
 
-	with thread_semaphore():
+	with conditional_model_semaphore(__name__):
 		crop_target_mask, crop_vision_frame, crop_source_mask = deep_swapper.run(None, deep_swapper_inputs)
 
 	return crop_vision_frame[0], crop_source_mask[0], crop_target_mask[0]
@@ -415,20 +415,24 @@ def process_frame(inputs : DeepSwapperInputs) -> VisionFrame:
 
 
 def process_frames(source_path : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-
 	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
+		target_vision_path = queue_payload.get('frame_path')
 		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'target_vision_frame': target_vision_frame
-		})
+		output_vision_frame = process_vision_frame(source_path, queue_payload.get('frame_number'), target_vision_frame)
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
 
 
+def process_vision_frame(source_path : List[str], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+
+	return process_frame(
+	{
+		'reference_faces': reference_faces,
+		'target_vision_frame': target_vision_frame
+	})
+
+
 def process_image(source_path : str, target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	target_vision_frame = read_static_image(target_path)
@@ -22,7 +22,7 @@ from facefusion.processors.live_portrait import create_rotation, limit_expressio
 from facefusion.processors.typing import ExpressionRestorerInputs
 from facefusion.processors.typing import LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitYaw
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore, thread_semaphore
+from facefusion.thread_helper import conditional_model_semaphore, conditional_thread_semaphore
 from facefusion.typing import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import get_video_frame, read_image, read_static_image, write_image
 
@@ -205,7 +205,7 @@ def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortrai
 def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, source_motion_points : LivePortraitMotionPoints, target_motion_points : LivePortraitMotionPoints) -> VisionFrame:
 	generator = get_inference_pool().get('generator')
 
-	with thread_semaphore():
+	with conditional_model_semaphore(__name__):
 		crop_vision_frame = generator.run(None,
 		{
 			'feature_volume': feature_volume,
@@ -259,25 +259,28 @@ def process_frame(inputs : ExpressionRestorerInputs) -> VisionFrame:
 
 
 def process_frames(source_path : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-
 	for queue_payload in process_manager.manage(queue_payloads):
-		frame_number = queue_payload.get('frame_number')
-		if state_manager.get_item('trim_frame_start'):
-			frame_number += state_manager.get_item('trim_frame_start')
-		source_vision_frame = get_video_frame(state_manager.get_item('target_path'), frame_number)
 		target_vision_path = queue_payload.get('frame_path')
 		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'source_vision_frame': source_vision_frame,
-			'target_vision_frame': target_vision_frame
-		})
+		output_vision_frame = process_vision_frame(source_path, queue_payload.get('frame_number'), target_vision_frame)
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
 
 
+def process_vision_frame(source_path : List[str], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+
+	if state_manager.get_item('trim_frame_start'):
+		frame_number += state_manager.get_item('trim_frame_start')
+	source_vision_frame = get_video_frame(state_manager.get_item('target_path'), frame_number)
+	return process_frame(
+	{
+		'reference_faces': reference_faces,
+		'source_vision_frame': source_vision_frame,
+		'target_vision_frame': target_vision_frame
+	})
+
+
 def process_image(source_path : str, target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	source_vision_frame = read_static_image(state_manager.get_item('target_path'))
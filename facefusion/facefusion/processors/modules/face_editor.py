@@ -21,7 +21,7 @@ from facefusion.processors import choices as processors_choices
 from facefusion.processors.live_portrait import create_rotation, limit_euler_angles, limit_expression
 from facefusion.processors.typing import FaceEditorInputs, LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitRotation, LivePortraitScale, LivePortraitTranslation, LivePortraitYaw
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore, thread_semaphore
+from facefusion.thread_helper import conditional_model_semaphore, conditional_thread_semaphore
 from facefusion.typing import ApplyStateItem, Args, DownloadScope, Face, FaceLandmark68, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, write_image
 
@@ -279,7 +279,7 @@ def forward_retarget_lip(lip_motion_points : LivePortraitMotionPoints) -> LivePo
 def forward_stitch_motion_points(source_motion_points : LivePortraitMotionPoints, target_motion_points : LivePortraitMotionPoints) -> LivePortraitMotionPoints:
 	stitcher = get_inference_pool().get('stitcher')
 
-	with thread_semaphore():
+	with conditional_model_semaphore(__name__):
 		motion_points = stitcher.run(None,
 		{
 			'source': source_motion_points,
@@ -292,7 +292,7 @@ def forward_stitch_motion_points(source_motion_points : LivePortraitMotionPoints
 def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, source_motion_points : LivePortraitMotionPoints, target_motion_points : LivePortraitMotionPoints) -> VisionFrame:
 	generator = get_inference_pool().get('generator')
 
-	with thread_semaphore():
+	with conditional_model_semaphore(__name__):
 		crop_vision_frame = generator.run(None,
 		{
 			'feature_volume': feature_volume,
@@ -500,20 +500,24 @@ def process_frame(inputs : FaceEditorInputs) -> VisionFrame:
 
 
 def process_frames(source_path : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-
 	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
+		target_vision_path = queue_payload.get('frame_path')
 		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'target_vision_frame': target_vision_frame
-		})
+		output_vision_frame = process_vision_frame(source_path, queue_payload.get('frame_number'), target_vision_frame)
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
 
 
+def process_vision_frame(source_path : List[str], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+
+	return process_frame(
+	{
+		'reference_faces': reference_faces,
+		'target_vision_frame': target_vision_frame
+	})
+
+
 def process_image(source_path : str, target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	target_vision_frame = read_static_image(target_path)
@@ -1,6 +1,6 @@
 from argparse import ArgumentParser
 from functools import lru_cache
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import numpy
 
@@ -9,22 +9,24 @@ import facefusion.jobs.job_manager
 import facefusion.jobs.job_store
 import facefusion.processors.core as processors
 from facefusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, wording
-from facefusion.common_helper import get_first
+from facefusion.common_helper import create_int_metavar, get_first
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.execution import has_execution_provider
 from facefusion.face_analyser import get_average_face, get_many_faces, get_one_face
-from facefusion.face_helper import paste_back, warp_face_by_face_landmark_5
+from facefusion.face_helper import calc_crop_bounding_box, estimate_matrix_by_face_landmark_5, has_bounding_box_overlap, paste_back_in_place, warp_face_by_face_landmark_5
+from facefusion.face_index import get_index_faces
 from facefusion.face_masker import create_occlusion_mask, create_region_mask, create_static_box_mask
-from facefusion.face_selector import find_similar_faces, sort_and_filter_faces, sort_faces_by_order
-from facefusion.face_store import get_reference_faces
-from facefusion.filesystem import filter_image_paths, has_image, in_directory, is_image, is_video, resolve_relative_path, same_file_extension
-from facefusion.model_helper import get_static_model_initializer
+from facefusion.face_selector import find_face_assignments, find_similar_faces, sort_and_filter_faces, sort_faces_by_order
+from facefusion.face_store import get_reference_faces, set_static_faces
+from facefusion.filesystem import filter_image_paths, has_image, in_directory, is_file, is_image, is_video, resolve_relative_path, same_file_extension
+from facefusion.frame_context import set_frame_faces
+from facefusion.model_helper import conditional_dynamic_batch_model, get_static_model_initializer, has_dynamic_batch
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.pixel_boost import explode_pixel_boost, implode_pixel_boost
 from facefusion.processors.typing import FaceSwapperInputs
 from facefusion.program_helper import find_argument_group
 from facefusion.thread_helper import conditional_thread_semaphore
-from facefusion.typing import ApplyStateItem, Args, DownloadScope, Embedding, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
+from facefusion.typing import ApplyStateItem, Args, BoundingBox, DownloadScope, DownloadSet, Embedding, ExecutionProvider, ExecutionQuantizedModel, Face, FaceSet, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, read_static_images, unpack_resolution, write_image
 
 
@@ -336,12 +338,50 @@ def create_static_model_set(download_scope : DownloadScope) -> ModelSet:
 
 
 def get_inference_pool() -> InferencePool:
+	model_sources = get_model_sources()
+	return inference_manager.get_inference_pool(get_model_context(), model_sources)
+
+
+def get_model_context() -> str:
+	if state_manager.get_item('face_swapper_batch_size') > 1:
+		return __name__ + '_batch'
+	return __name__
+
+
+def get_model_sources() -> DownloadSet:
+	return create_static_model_sources(get_model_context(), state_manager.get_item('face_swapper_model'), tuple(state_manager.get_item('execution_providers')), tuple(state_manager.get_item('execution_quantized_models') or []))
+
+
+@lru_cache(maxsize = None)
+def create_static_model_sources(model_context : str, face_swapper_model : str, execution_providers : Tuple[ExecutionProvider, ...], execution_quantized_models : Tuple[ExecutionQuantizedModel, ...]) -> DownloadSet:
 	model_sources = get_model_options().get('sources')
-	return inference_manager.get_inference_pool(__name__, model_sources)
+	face_swapper_path = model_sources.get('face_swapper').get('path')
+
+	if model_context.endswith('_batch'):
+		face_swapper_path = resolve_dynamic_batch_model_path(face_swapper_path) or face_swapper_path
+	return\
+	{
+		**model_sources,
+		'face_swapper':
+		{
+			'url': model_sources.get('face_swapper').get('url'),
+			'path': face_swapper_path
+		}
+	}
+
+
+def resolve_dynamic_batch_model_path(model_path : str) -> Optional[str]:
+	model_path = inference_manager.resolve_model_path(model_path, state_manager.get_item('execution_providers'))
+
+	if is_file(model_path):
+		return conditional_dynamic_batch_model(model_path)
+	return None
 
 
 def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
+	inference_manager.clear_inference_pool(__name__ + '_batch')
+	create_static_model_sources.cache_clear()
 
 
 def get_model_options() -> ModelOptions:
@@ -359,19 +399,25 @@ def register_args(program : ArgumentParser) -> None:
 		known_args, _ = program.parse_known_args()
 		face_swapper_pixel_boost_choices = processors_choices.face_swapper_set.get(known_args.face_swapper_model)
 		group_processors.add_argument('--face-swapper-pixel-boost', help = wording.get('help.face_swapper_pixel_boost'), default = config.get_str_value('processors.face_swapper_pixel_boost', get_first(face_swapper_pixel_boost_choices)), choices = face_swapper_pixel_boost_choices)
-		facefusion.jobs.job_store.register_step_keys([ 'face_swapper_model', 'face_swapper_pixel_boost' ])
+		group_processors.add_argument('--face-swapper-batch-size', help = wording.get('help.face_swapper_batch_size'), type = int, default = config.get_int_value('processors.face_swapper_batch_size', '4'), choices = processors_choices.face_swapper_batch_size_range, metavar = create_int_metavar(processors_choices.face_swapper_batch_size_range))
+		facefusion.jobs.job_store.register_step_keys([ 'face_swapper_model', 'face_swapper_pixel_boost', 'face_swapper_batch_size' ])
 
 
 def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('face_swapper_model', args.get('face_swapper_model'))
 	apply_state_item('face_swapper_pixel_boost', args.get('face_swapper_pixel_boost'))
+	apply_state_item('face_swapper_batch_size', args.get('face_swapper_batch_size'))
 
 
 def pre_check() -> bool:
 	model_hashes = get_model_options().get('hashes')
 	model_sources = get_model_options().get('sources')
 
-	return conditional_download_hashes(model_hashes) and conditional_download_sources(model_sources)
+	if conditional_download_hashes(model_hashes) and conditional_download_sources(model_sources):
+		if state_manager.get_item('face_swapper_batch_size') > 1:
+			resolve_dynamic_batch_model_path(model_sources.get('face_swapper').get('path'))
+		return True
+	return False
 
 
 def pre_process(mode : ProcessMode) -> bool:
@@ -398,6 +444,7 @@ def pre_process(mode : ProcessMode) -> bool:
 
 def post_process() -> None:
 	read_static_image.cache_clear()
+	get_static_source_face.cache_clear()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
 		get_static_model_initializer.cache_clear()
@@ -411,42 +458,102 @@ def post_process() -> None:
 
 
 def swap_face(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
+	return swap_faces(source_face, [ target_face ], temp_vision_frame)
+
+
+def swap_faces(source_face : Face, target_faces : List[Face], temp_vision_frame : VisionFrame) -> VisionFrame:
+	temp_vision_frame = temp_vision_frame.copy()
+
+	for target_face_pass in split_face_passes(target_faces):
+		temp_vision_frame = swap_face_pass(source_face, target_face_pass, temp_vision_frame)
+	return temp_vision_frame
+
+
+def split_face_passes(target_faces : List[Face]) -> List[List[Face]]:
+	model_template = get_model_options().get('template')
+	pixel_boost_size = unpack_resolution(state_manager.get_item('face_swapper_pixel_boost'))
+	face_passes : List[List[Face]] = []
+	crop_bounding_boxes : List[BoundingBox] = []
+
+	for target_face in target_faces:
+		affine_matrix = estimate_matrix_by_face_landmark_5(target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
+		crop_bounding_box = calc_crop_bounding_box(affine_matrix, pixel_boost_size)
+
+		if not face_passes or any(has_bounding_box_overlap(crop_bounding_box, pass_bounding_box) for pass_bounding_box in crop_bounding_boxes):
+			face_passes.append([])
+			crop_bounding_boxes = []
+		face_passes[-1].append(target_face)
+		crop_bounding_boxes.append(crop_bounding_box)
+	return face_passes
+
+
+def swap_face_pass(source_face : Face, target_faces : List[Face], temp_vision_frame : VisionFrame) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
 	pixel_boost_size = unpack_resolution(state_manager.get_item('face_swapper_pixel_boost'))
 	pixel_boost_total = pixel_boost_size[0] // model_size[0]
-	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
-	temp_vision_frames = []
-	crop_masks = []
-
-	if 'box' in state_manager.get_item('face_mask_types'):
-		box_mask = create_static_box_mask(crop_vision_frame.shape[:2][::-1], state_manager.get_item('face_mask_blur'), state_manager.get_item('face_mask_padding'))
-		crop_masks.append(box_mask)
-
-	if 'occlusion' in state_manager.get_item('face_mask_types'):
-		occlusion_mask = create_occlusion_mask(crop_vision_frame)
-		crop_masks.append(occlusion_mask)
-
-	pixel_boost_vision_frames = implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size)
-	for pixel_boost_vision_frame in pixel_boost_vision_frames:
-		pixel_boost_vision_frame = prepare_crop_frame(pixel_boost_vision_frame)
-		pixel_boost_vision_frame = forward_swap_face(source_face, pixel_boost_vision_frame)
-		pixel_boost_vision_frame = normalize_crop_frame(pixel_boost_vision_frame)
-		temp_vision_frames.append(pixel_boost_vision_frame)
-	crop_vision_frame = explode_pixel_boost(temp_vision_frames, pixel_boost_total, model_size, pixel_boost_size)
-
-	if 'region' in state_manager.get_item('face_mask_types'):
-		region_mask = create_region_mask(crop_vision_frame, state_manager.get_item('face_mask_regions'))
-		crop_masks.append(region_mask)
-
-	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	temp_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+	affine_matrices = []
+	crop_masks_set = []
+	pixel_boost_vision_frames = []
+
+	for target_face in target_faces:
+		crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
+		crop_masks = []
+
+		if 'box' in state_manager.get_item('face_mask_types'):
+			box_mask = create_static_box_mask(crop_vision_frame.shape[:2][::-1], state_manager.get_item('face_mask_blur'), state_manager.get_item('face_mask_padding'))
+			crop_masks.append(box_mask)
+
+		if 'occlusion' in state_manager.get_item('face_mask_types'):
+			occlusion_mask = create_occlusion_mask(crop_vision_frame)
+			crop_masks.append(occlusion_mask)
+
+		for pixel_boost_vision_frame in implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size):
+			pixel_boost_vision_frames.append(prepare_crop_frame(pixel_boost_vision_frame))
+		affine_matrices.append(affine_matrix)
+		crop_masks_set.append(crop_masks)
+
+	temp_vision_frames = forward_swap_faces(source_face, pixel_boost_vision_frames)
+
+	for index, (affine_matrix, crop_masks) in enumerate(zip(affine_matrices, crop_masks_set)):
+		pixel_boost_start = index * pixel_boost_total ** 2
+		pixel_boost_end = pixel_boost_start + pixel_boost_total ** 2
+		crop_vision_frame = explode_pixel_boost(temp_vision_frames[pixel_boost_start:pixel_boost_end], pixel_boost_total, model_size, pixel_boost_size)
+
+		if 'region' in state_manager.get_item('face_mask_types'):
+			region_mask = create_region_mask(crop_vision_frame, state_manager.get_item('face_mask_regions'))
+			crop_masks.append(region_mask)
+
+		crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
+		temp_vision_frame = paste_back_in_place(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
 	return temp_vision_frame
 
 
+def forward_swap_faces(source_face : Face, crop_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
+	batch_size = get_batch_size()
+	temp_vision_frames = []
+
+	for batch_start in range(0, len(crop_vision_frames), batch_size):
+		batch_vision_frame = numpy.concatenate(crop_vision_frames[batch_start:batch_start + batch_size], axis = 0)
+		batch_vision_frame = forward_swap_face(source_face, batch_vision_frame)
+
+		for crop_vision_frame in batch_vision_frame:
+			temp_vision_frames.append(normalize_crop_frame(crop_vision_frame))
+	return temp_vision_frames
+
+
+def get_batch_size() -> int:
+	face_swapper_path = get_model_sources().get('face_swapper').get('path')
+
+	if get_model_context().endswith('_batch') and has_dynamic_batch(face_swapper_path):
+		return state_manager.get_item('face_swapper_batch_size')
+	return 1
+
+
 def forward_swap_face(source_face : Face, crop_vision_frame : VisionFrame) -> VisionFrame:
 	face_swapper = get_inference_pool().get('face_swapper')
 	model_type = get_model_options().get('type')
+	batch_total = crop_vision_frame.shape[0]
 	face_swapper_inputs = {}
 
 	if has_execution_provider('coreml') and model_type in [ 'ghost', 'uniface' ]:
@@ -455,14 +562,14 @@ def forward_swap_face(source_face : Face, crop_vision_frame : VisionFrame) -> Vi
 	for face_swapper_input in face_swapper.get_inputs():
 		if face_swapper_input.name == 'source':
 			if model_type in [ 'blendswap', 'uniface' ]:
-				face_swapper_inputs[face_swapper_input.name] = prepare_source_frame(source_face)
+				face_swapper_inputs[face_swapper_input.name] = numpy.repeat(prepare_source_frame(source_face), batch_total, axis = 0)
 			else:
-				face_swapper_inputs[face_swapper_input.name] = prepare_source_embedding(source_face)
+				face_swapper_inputs[face_swapper_input.name] = numpy.repeat(prepare_source_embedding(source_face), batch_total, axis = 0)
 		if face_swapper_input.name == 'target':
 			face_swapper_inputs[face_swapper_input.name] = crop_vision_frame
 
 	with conditional_thread_semaphore():
-		crop_vision_frame = face_swapper.run(None, face_swapper_inputs)[0][0]
+		crop_vision_frame = inference_manager.run_inference_session(face_swapper, face_swapper_inputs)[0]
 
 	return crop_vision_frame
 
@@ -511,7 +618,7 @@ def prepare_source_embedding(source_face : Face) -> Embedding:
 
 
 def convert_embedding(source_face : Face) -> Tuple[Embedding, Embedding]:
-	embedding = source_face.embedding.reshape(-1, 512)
+	embedding : Embedding = source_face.embedding.reshape(-1, 512)
 	embedding = forward_convert_embedding(embedding)
 	embedding = embedding.ravel()
 	normed_embedding = embedding / numpy.linalg.norm(embedding)
@@ -554,23 +661,54 @@ def process_frame(inputs : FaceSwapperInputs) -> VisionFrame:
 
 	if state_manager.get_item('face_selector_mode') == 'many':
 		if many_faces:
-			for target_face in many_faces:
-				target_vision_frame = swap_face(source_face, target_face, target_vision_frame)
+			target_vision_frame = swap_faces(source_face, many_faces, target_vision_frame)
 	if state_manager.get_item('face_selector_mode') == 'one':
 		target_face = get_one_face(many_faces)
 		if target_face:
 			target_vision_frame = swap_face(source_face, target_face, target_vision_frame)
 	if state_manager.get_item('face_selector_mode') == 'reference':
-		similar_faces = find_similar_faces(many_faces, reference_faces, state_manager.get_item('reference_face_distance'))
+		similar_faces = find_reference_faces(many_faces, reference_faces)
 		if similar_faces:
-			for similar_face in similar_faces:
-				target_vision_frame = swap_face(source_face, similar_face, target_vision_frame)
+			target_vision_frame = swap_faces(source_face, similar_faces, target_vision_frame)
 	return target_vision_frame
 
 
+def find_reference_faces(faces : List[Face], reference_faces : FaceSet) -> List[Face]:
+	reference_face_pairs = state_manager.get_item('reference_face_pairs') or []
+
+	if len(reference_face_pairs) > 1:
+		face_assignments = find_face_assignments(faces, reference_faces, state_manager.get_item('reference_face_distance'))
+		return [ face_assignment.get('face') for face_assignment in face_assignments ]
+	return find_similar_faces(faces, reference_faces, state_manager.get_item('reference_face_distance'))
+
+
 def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+	for queue_payload in process_manager.manage(queue_payloads):
+		target_vision_path = queue_payload.get('frame_path')
+		target_vision_frame = read_image(target_vision_path)
+		output_vision_frame = process_vision_frame(source_paths, queue_payload.get('frame_number'), target_vision_frame)
+		write_image(target_vision_path, output_vision_frame)
+		update_progress(1)
+
+
+def process_vision_frame(source_paths : List[str], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-	source_frames = read_static_images(source_paths)
+	source_face = get_static_source_face(tuple(source_paths))
+	index_faces = get_index_faces(frame_number)
+
+	if index_faces is not None and not set_frame_faces(target_vision_frame, index_faces):
+		set_static_faces(target_vision_frame, index_faces)
+	return process_frame(
+	{
+		'reference_faces': reference_faces,
+		'source_face': source_face,
+		'target_vision_frame': target_vision_frame
+	})
+
+
+@lru_cache(maxsize = None)
+def get_static_source_face(source_paths : Tuple[str, ...]) -> Optional[Face]:
+	source_frames = read_static_images(list(source_paths))
 	source_faces = []
 
 	for source_frame in source_frames:
@@ -578,19 +716,7 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 		temp_faces = sort_faces_by_order(temp_faces, 'large-small')
 		if temp_faces:
 			source_faces.append(get_first(temp_faces))
-	source_face = get_average_face(source_faces)
-
-	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'source_face': source_face,
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
+	return get_average_face(source_faces)
 
 
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
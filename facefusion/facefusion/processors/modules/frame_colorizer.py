@@ -15,7 +15,7 @@ from facefusion.filesystem import in_directory, is_image, is_video, resolve_rela
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.typing import FrameColorizerInputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import thread_semaphore
+from facefusion.thread_helper import conditional_model_semaphore
 from facefusion.typing import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, unpack_resolution, write_image
 
@@ -195,7 +195,7 @@ def colorize_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 def forward(color_vision_frame : VisionFrame) -> VisionFrame:
 	frame_colorizer = get_inference_pool().get('frame_colorizer')
 
-	with thread_semaphore():
+	with conditional_model_semaphore(__name__):
 		color_vision_frame = frame_colorizer.run(None,
 		{
 			'input': color_vision_frame
@@ -261,16 +261,20 @@ def process_frame(inputs : FrameColorizerInputs) -> VisionFrame:
 
 def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
 	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
+		target_vision_path = queue_payload.get('frame_path')
 		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'target_vision_frame': target_vision_frame
-		})
+		output_vision_frame = process_vision_frame(source_paths, queue_payload.get('frame_number'), target_vision_frame)
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
 
 
+def process_vision_frame(source_paths : List[str], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
+	return process_frame(
+	{
+		'target_vision_frame': target_vision_frame
+	})
+
+
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	target_vision_frame = read_static_image(target_path)
 	output_vision_frame = process_frame(
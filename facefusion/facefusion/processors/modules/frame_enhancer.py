@@ -507,16 +507,20 @@ def process_frame(inputs : FrameEnhancerInputs) -> VisionFrame:
 
 def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
 	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
+		target_vision_path = queue_payload.get('frame_path')
 		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'target_vision_frame': target_vision_frame
-		})
+		output_vision_frame = process_vision_frame(source_paths, queue_payload.get('frame_number'), target_vision_frame)
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
 
 
+def process_vision_frame(source_paths : List[str], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
+	return process_frame(
+	{
+		'target_vision_frame': target_vision_frame
+	})
+
+
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	target_vision_frame = read_static_image(target_path)
 	output_vision_frame = process_frame(
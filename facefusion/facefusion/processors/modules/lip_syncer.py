@@ -22,7 +22,7 @@ from facefusion.processors import choices as processors_choices
 from facefusion.processors.typing import LipSyncerInputs
 from facefusion.program_helper import find_argument_group
 from facefusion.thread_helper import conditional_thread_semaphore
-from facefusion.typing import ApplyStateItem, Args, AudioFrame, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
+from facefusion.typing import ApplyStateItem, Args, AudioFrame, DownloadScope, Face, Fps, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, restrict_video_fps, write_image
 
 
@@ -124,6 +124,7 @@ def pre_process(mode : ProcessMode) -> bool:
 def post_process() -> None:
 	read_static_image.cache_clear()
 	read_static_voice.cache_clear()
+	get_static_video_fps.cache_clear()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
 	if state_manager.get_item('video_memory_strategy') == 'strict':
@@ -229,27 +230,30 @@ def process_frame(inputs : LipSyncerInputs) -> VisionFrame:
 
 
 def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-	source_audio_path = get_first(filter_audio_paths(source_paths))
-	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
-
 	for queue_payload in process_manager.manage(queue_payloads):
-		frame_number = queue_payload.get('frame_number')
 		target_vision_path = queue_payload.get('frame_path')
-		source_audio_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
-		if not numpy.any(source_audio_frame):
-			source_audio_frame = create_empty_audio_frame()
 		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'source_audio_frame': source_audio_frame,
-			'target_vision_frame': target_vision_frame
-		})
+		output_vision_frame = process_vision_frame(source_paths, queue_payload.get('frame_number'), target_vision_frame)
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
 
 
+def process_vision_frame(source_paths : List[str], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+	source_audio_path = get_first(filter_audio_paths(source_paths))
+	temp_video_fps = get_static_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+	source_audio_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
+
+	if not numpy.any(source_audio_frame):
+		source_audio_frame = create_empty_audio_frame()
+	return process_frame(
+	{
+		'reference_faces': reference_faces,
+		'source_audio_frame': source_audio_frame,
+		'target_vision_frame': target_vision_frame
+	})
+
+
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	source_audio_frame = create_empty_audio_frame()
@@ -269,3 +273,8 @@ def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> Non
 	for source_audio_path in source_audio_paths:
 		read_static_voice(source_audio_path, temp_video_fps)
 	processors.multi_process_frames(source_paths, temp_frame_paths, process_frames)
+
+
+@lru_cache(maxsize = None)
+def get_static_video_fps(target_path : str, output_video_fps : Fps) -> Fps:
+	return restrict_video_fps(target_path, output_video_fps)
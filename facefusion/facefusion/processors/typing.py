@@ -98,6 +98,7 @@ ProcessorStateKey = Literal\
 	'face_enhancer_weight',
 	'face_swapper_model',
 	'face_swapper_pixel_boost',
+	'face_swapper_batch_size',
 	'frame_colorizer_model',
 	'frame_colorizer_size',
 	'frame_colorizer_blend',
@@ -134,6 +135,7 @@ ProcessorState = TypedDict('ProcessorState',
 	'face_enhancer_weight' : float,
 	'face_swapper_model' : FaceSwapperModel,
 	'face_swapper_pixel_boost' : str,
+	'face_swapper_batch_size' : int,
 	'frame_colorizer_model' : FrameColorizerModel,
 	'frame_colorizer_size' : str,
 	'frame_colorizer_blend' : int,
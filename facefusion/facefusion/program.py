@@ -8,6 +8,7 @@ from facefusion.execution import get_available_execution_providers
 from facefusion.filesystem import list_directory
 from facefusion.jobs import job_store
 from facefusion.processors.core import get_processors_modules
+from facefusion.program_helper import validate_model_concurrency, validate_reference_face_pair
 
 
 def create_help_formatter_small(prog : str) -> HelpFormatter:
@@ -100,7 +101,9 @@ def create_face_detector_program() -> ArgumentParser:
 	group_face_detector.add_argument('--face-detector-size', help = wording.get('help.face_detector_size'), default = config.get_str_value('face_detector.face_detector_size', get_last(face_detector_size_choices)), choices = face_detector_size_choices)
 	group_face_detector.add_argument('--face-detector-angles', help = wording.get('help.face_detector_angles'), type = int, default = config.get_int_list('face_detector.face_detector_angles', '0'), choices = facefusion.choices.face_detector_angles, nargs = '+', metavar = 'FACE_DETECTOR_ANGLES')
 	group_face_detector.add_argument('--face-detector-score', help = wording.get('help.face_detector_score'), type = float, default = config.get_float_value('face_detector.face_detector_score', '0.5'), choices = facefusion.choices.face_detector_score_range, metavar = create_float_metavar(facefusion.choices.face_detector_score_range))
-	job_store.register_step_keys([ 'face_detector_model', 'face_detector_angles', 'face_detector_size', 'face_detector_score' ])
+	group_face_detector.add_argument('--face-tracker-interval', help = wording.get('help.face_tracker_interval'), type = int, default = config.get_int_value('face_detector.face_tracker_interval', '0'), choices = facefusion.choices.face_tracker_interval_range, metavar = create_int_metavar(facefusion.choices.face_tracker_interval_range))
+	group_face_detector.add_argument('--face-tracker-score', help = wording.get('help.face_tracker_score'), type = float, default = config.get_float_value('face_detector.face_tracker_score', '0.5'), choices = facefusion.choices.face_tracker_score_range, metavar = create_float_metavar(facefusion.choices.face_tracker_score_range))
+	job_store.register_step_keys([ 'face_detector_model', 'face_detector_angles', 'face_detector_size', 'face_detector_score', 'face_tracker_interval', 'face_tracker_score' ])
 	return program
 
 
@@ -125,7 +128,8 @@ def create_face_selector_program() -> ArgumentParser:
 	group_face_selector.add_argument('--reference-face-position', help = wording.get('help.reference_face_position'), type = int, default = config.get_int_value('face_selector.reference_face_position', '0'))
 	group_face_selector.add_argument('--reference-face-distance', help = wording.get('help.reference_face_distance'), type = float, default = config.get_float_value('face_selector.reference_face_distance', '0.6'), choices = facefusion.choices.reference_face_distance_range, metavar = create_float_metavar(facefusion.choices.reference_face_distance_range))
 	group_face_selector.add_argument('--reference-frame-number', help = wording.get('help.reference_frame_number'), type = int, default = config.get_int_value('face_selector.reference_frame_number', '0'))
-	job_store.register_step_keys([ 'face_selector_mode', 'face_selector_order', 'face_selector_gender', 'face_selector_race', 'face_selector_age_start', 'face_selector_age_end', 'reference_face_position', 'reference_face_distance', 'reference_frame_number' ])
+	group_face_selector.add_argument('--reference-face-pairs', help = wording.get('help.reference_face_pairs'), type = validate_reference_face_pair, default = config.get_str_list('face_selector.reference_face_pairs'), nargs = '+', metavar = 'REFERENCE_FACE_PAIRS')
+	job_store.register_step_keys([ 'face_selector_mode', 'face_selector_order', 'face_selector_gender', 'face_selector_race', 'face_selector_age_start', 'face_selector_age_end', 'reference_face_position', 'reference_face_distance', 'reference_frame_number', 'reference_face_pairs' ])
 	return program
 
 
@@ -148,8 +152,10 @@ def create_frame_extraction_program() -> ArgumentParser:
 	group_frame_extraction.add_argument('--trim-frame-start', help = wording.get('help.trim_frame_start'), type = int, default = facefusion.config.get_int_value('frame_extraction.trim_frame_start'))
 	group_frame_extraction.add_argument('--trim-frame-end',	help = wording.get('help.trim_frame_end'), type = int, default = facefusion.config.get_int_value('frame_extraction.trim_frame_end'))
 	group_frame_extraction.add_argument('--temp-frame-format', help = wording.get('help.temp_frame_format'), default = config.get_str_value('frame_extraction.temp_frame_format', 'png'), choices = facefusion.choices.temp_frame_formats)
+	group_frame_extraction.add_argument('--temp-frame-mode', help = wording.get('help.temp_frame_mode'), default = config.get_str_value('frame_extraction.temp_frame_mode', 'disk'), choices = facefusion.choices.temp_frame_modes)
 	group_frame_extraction.add_argument('--keep-temp', help = wording.get('help.keep_temp'), action = 'store_true',	default = config.get_bool_value('frame_extraction.keep_temp'))
-	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'keep_temp' ])
+	group_frame_extraction.add_argument('--target-analysis', help = wording.get('help.target_analysis'), action = 'store_true', default = config.get_bool_value('frame_extraction.target_analysis'))
+	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'temp_frame_mode', 'keep_temp', 'target_analysis' ])
 	return program
 
 
@@ -174,7 +180,8 @@ def create_processors_program() -> ArgumentParser:
 	available_processors = [ file.get('name') for file in list_directory('facefusion/processors/modules') ]
 	group_processors = program.add_argument_group('processors')
 	group_processors.add_argument('--processors', help = wording.get('help.processors').format(choices = ', '.join(available_processors)), default = config.get_str_list('processors.processors', 'face_swapper'), nargs = '+')
-	job_store.register_step_keys([ 'processors' ])
+	group_processors.add_argument('--processor-chain-mode', help = wording.get('help.processor_chain_mode'), default = config.get_str_value('processors.processor_chain_mode', 'fused'), choices = facefusion.choices.processor_chain_modes)
+	job_store.register_step_keys([ 'processors', 'processor_chain_mode' ])
 	for processor_module in get_processors_modules(available_processors):
 		processor_module.register_args(program)
 	return program
@@ -195,10 +202,20 @@ def create_execution_program() -> ArgumentParser:
 	available_execution_providers = get_available_execution_providers()
 	group_execution = program.add_argument_group('execution')
 	group_execution.add_argument('--execution-device-id', help = wording.get('help.execution_device_id'), default = config.get_str_value('execution.execution_device_id', '0'))
+	group_execution.add_argument('--execution-device-ids', help = wording.get('help.execution_device_ids'), default = config.get_str_list('execution.execution_device_ids'), nargs = '+', metavar = 'EXECUTION_DEVICE_IDS')
 	group_execution.add_argument('--execution-providers', help = wording.get('help.execution_providers').format(choices = ', '.join(available_execution_providers)), default = config.get_str_list('execution.execution_providers', 'cpu'), choices = available_execution_providers, nargs = '+', metavar = 'EXECUTION_PROVIDERS')
 	group_execution.add_argument('--execution-thread-count', help = wording.get('help.execution_thread_count'), type = int, default = config.get_int_value('execution.execution_thread_count', '4'), choices = facefusion.choices.execution_thread_count_range, metavar = create_int_metavar(facefusion.choices.execution_thread_count_range))
 	group_execution.add_argument('--execution-queue-count', help = wording.get('help.execution_queue_count'), type = int, default = config.get_int_value('execution.execution_queue_count', '1'), choices = facefusion.choices.execution_queue_count_range, metavar = create_int_metavar(facefusion.choices.execution_queue_count_range))
-	job_store.register_job_keys([ 'execution_device_id', 'execution_providers', 'execution_thread_count', 'execution_queue_count' ])
+	group_execution.add_argument('--execution-batch-size', help = wording.get('help.execution_batch_size'), type = int, default = config.get_int_value('execution.execution_batch_size', '1'), choices = facefusion.choices.execution_batch_size_range, metavar = create_int_metavar(facefusion.choices.execution_batch_size_range))
+	group_execution.add_argument('--execution-batch-window', help = wording.get('help.execution_batch_window'), type = int, default = config.get_int_value('execution.execution_batch_window', '5'), choices = facefusion.choices.execution_batch_window_range, metavar = create_int_metavar(facefusion.choices.execution_batch_window_range))
+	group_execution.add_argument('--execution-mode', help = wording.get('help.execution_mode'), default = config.get_str_value('execution.execution_mode', 'sequential'), choices = facefusion.choices.execution_modes)
+	group_execution.add_argument('--execution-graph-optimization', help = wording.get('help.execution_graph_optimization'), default = config.get_str_value('execution.execution_graph_optimization', 'all'), choices = facefusion.choices.execution_graph_optimizations)
+	group_execution.add_argument('--execution-quantized-models', help = wording.get('help.execution_quantized_models').format(choices = ', '.join(facefusion.choices.execution_quantized_models)), default = config.get_str_list('execution.execution_quantized_models'), choices = facefusion.choices.execution_quantized_models, nargs = '+', metavar = 'EXECUTION_QUANTIZED_MODELS')
+	group_execution.add_argument('--execution-replica-count', help = wording.get('help.execution_replica_count'), type = int, default = config.get_int_value('execution.execution_replica_count', '0'), choices = facefusion.choices.execution_replica_count_range, metavar = create_int_metavar(facefusion.choices.execution_replica_count_range))
+	group_execution.add_argument('--execution-concurrency', help = wording.get('help.execution_concurrency'), type = int, default = config.get_int_value('execution.execution_concurrency', '0'), choices = facefusion.choices.execution_concurrency_range, metavar = create_int_metavar(facefusion.choices.execution_concurrency_range))
+	group_execution.add_argument('--execution-model-concurrency', help = wording.get('help.execution_model_concurrency').format(choices = ', '.join(facefusion.choices.execution_concurrency_models)), type = validate_model_concurrency, default = config.get_str_list('execution.execution_model_concurrency'), nargs = '+', metavar = 'EXECUTION_MODEL_CONCURRENCY')
+	group_execution.add_argument('--warmup', help = wording.get('help.warmup'), action = 'store_true', default = config.get_bool_value('execution.warmup'))
+	job_store.register_job_keys([ 'execution_device_id', 'execution_device_ids', 'execution_providers', 'execution_thread_count', 'execution_queue_count', 'execution_batch_size', 'execution_batch_window', 'execution_mode', 'execution_graph_optimization', 'execution_quantized_models', 'execution_replica_count', 'execution_concurrency', 'execution_model_concurrency' ])
 	return program
 
 
@@ -224,7 +241,9 @@ def create_memory_program() -> ArgumentParser:
 	group_memory = program.add_argument_group('memory')
 	group_memory.add_argument('--video-memory-strategy', help = wording.get('help.video_memory_strategy'), default = config.get_str_value('memory.video_memory_strategy', 'strict'), choices = facefusion.choices.video_memory_strategies)
 	group_memory.add_argument('--system-memory-limit', help = wording.get('help.system_memory_limit'), type = int, default = config.get_int_value('memory.system_memory_limit', '0'), choices = facefusion.choices.system_memory_limit_range, metavar = create_int_metavar(facefusion.choices.system_memory_limit_range))
-	job_store.register_job_keys([ 'video_memory_strategy', 'system_memory_limit' ])
+	group_memory.add_argument('--inference-memory-limit', help = wording.get('help.inference_memory_limit'), type = int, default = config.get_int_value('memory.inference_memory_limit', '0'), choices = facefusion.choices.inference_memory_limit_range, metavar = create_int_metavar(facefusion.choices.inference_memory_limit_range))
+	group_memory.add_argument('--face-store-memory-limit', help = wording.get('help.face_store_memory_limit'), type = int, default = config.get_int_value('memory.face_store_memory_limit', '512'), choices = facefusion.choices.face_store_memory_limit_range, metavar = create_int_metavar(facefusion.choices.face_store_memory_limit_range))
+	job_store.register_job_keys([ 'video_memory_strategy', 'system_memory_limit', 'inference_memory_limit', 'face_store_memory_limit' ])
 	return program
 
 
@@ -233,7 +252,8 @@ def create_misc_program() -> ArgumentParser:
 	log_level_keys = list(facefusion.choices.log_level_set.keys())
 	group_misc = program.add_argument_group('misc')
 	group_misc.add_argument('--log-level', help = wording.get('help.log_level'), default = config.get_str_value('misc.log_level', 'info'), choices = log_level_keys)
-	job_store.register_job_keys([ 'log_level' ])
+	group_misc.add_argument('--inference-statistics-path', help = wording.get('help.inference_statistics_path'), default = config.get_str_value('misc.inference_statistics_path'))
+	job_store.register_job_keys([ 'log_level', 'inference_statistics_path' ])
 	return program
 
 
@@ -1,6 +1,10 @@
-from argparse import ArgumentParser, _ArgumentGroup, _SubParsersAction
+import re
+from argparse import ArgumentParser, ArgumentTypeError, _ArgumentGroup, _SubParsersAction
 from typing import Optional
 
+import facefusion.choices
+from facefusion import wording
+
 
 def find_argument_group(program : ArgumentParser, group_name : str) -> Optional[_ArgumentGroup]:
 	for group in program._action_groups:
@@ -28,4 +32,24 @@ def validate_actions(program : ArgumentParser) -> bool:
 					return False
 			elif action.default not in action.choices:
 				return False
+		if action.default and action.type == validate_reference_face_pair:
+			try:
+				for default in action.default:
+					validate_reference_face_pair(default)
+			except ArgumentTypeError:
+				return False
 	return True
+
+
+def validate_reference_face_pair(reference_face_pair : str) -> str:
+	if re.fullmatch(r'\d+(:\d+)?', reference_face_pair):
+		return reference_face_pair
+	raise ArgumentTypeError(wording.get('invalid_reference_face_pair').format(reference_face_pair = reference_face_pair))
+
+
+def validate_model_concurrency(model_concurrency : str) -> str:
+	model_name, _, model_limit = model_concurrency.partition(':')
+
+	if model_name in facefusion.choices.execution_concurrency_models and model_limit.isdigit():
+		return model_concurrency
+	raise ArgumentTypeError(wording.get('invalid_model_concurrency').format(model_concurrency = model_concurrency))
@@ -3,14 +3,16 @@ from typing import Any, Dict
 import numpy
 
 from facefusion import logger, state_manager
-from facefusion.face_store import get_face_store
-from facefusion.typing import FaceSet
+from facefusion.face_store import get_face_store, get_face_store_statistics
+from facefusion.inference_profiler import calc_histogram_percentile, get_inference_profiles
+from facefusion.json import write_json
+from facefusion.typing import FaceSet, FaceStore, FaceStoreStatistics, InferenceHistogram, InferenceProfile
 
 
 def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
 	face_detector_scores = []
 	face_landmarker_scores = []
-	statistics =\
+	statistics : Dict[str, Any] =\
 	{
 		'min_face_detector_score': 0,
 		'min_face_landmarker_score': 0,
@@ -43,9 +45,68 @@ def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
 	return statistics
 
 
+def create_face_store_statistics(face_store : FaceStore, face_store_statistics : FaceStoreStatistics) -> Dict[str, Any]:
+	lookup_total = face_store_statistics.get('hits') + face_store_statistics.get('misses')
+	return\
+	{
+		'face_store_hits': face_store_statistics.get('hits'),
+		'face_store_misses': face_store_statistics.get('misses'),
+		'face_store_evictions': face_store_statistics.get('evictions'),
+		'face_store_hit_rate': round(face_store_statistics.get('hits') / lookup_total, 2) if lookup_total else 0.0,
+		'face_store_frames': len(face_store.get('static_faces')),
+		'face_store_footprint_mb': round(sum(face_store.get('static_footprints').values()) / 1024 ** 2, 2)
+	}
+
+
+def create_inference_statistics(inference_profiles : Dict[str, InferenceProfile]) -> Dict[str, Any]:
+	inference_statistics = {}
+
+	for profile_name, inference_profile in sorted(inference_profiles.items()):
+		inference_statistics[profile_name] =\
+		{
+			'total_calls': inference_profile.get('call_total'),
+			'average_batch_size': round(inference_profile.get('batch_total') / max(inference_profile.get('call_total'), 1), 2),
+			'queue_wait': create_histogram_statistics(inference_profile.get('queue_wait')),
+			'run_time': create_histogram_statistics(inference_profile.get('run_time'))
+		}
+	return inference_statistics
+
+
+def create_histogram_statistics(inference_histogram : InferenceHistogram) -> Dict[str, Any]:
+	histogram_statistics =\
+	{
+		'total': inference_histogram.get('total'),
+		'average_ms': 0.0,
+		'p50_ms': 0.0,
+		'p95_ms': 0.0,
+		'p99_ms': 0.0,
+		'max_ms': 0.0
+	}
+
+	if inference_histogram.get('total'):
+		histogram_statistics['average_ms'] = round(inference_histogram.get('sum') / inference_histogram.get('total') * 1000, 2)
+		histogram_statistics['p50_ms'] = round(calc_histogram_percentile(inference_histogram, 0.5) * 1000, 2)
+		histogram_statistics['p95_ms'] = round(calc_histogram_percentile(inference_histogram, 0.95) * 1000, 2)
+		histogram_statistics['p99_ms'] = round(calc_histogram_percentile(inference_histogram, 0.99) * 1000, 2)
+		histogram_statistics['max_ms'] = round(inference_histogram.get('maximum') * 1000, 2)
+	return histogram_statistics
+
+
 def conditional_log_statistics() -> None:
 	if state_manager.get_item('log_level') == 'debug':
 		statistics = create_statistics(get_face_store().get('static_faces'))
+		statistics.update(create_face_store_statistics(get_face_store(), get_face_store_statistics()))
 
 		for name, value in statistics.items():
 			logger.debug(str(name) + ': ' + str(value), __name__)
+
+		for profile_name, inference_statistics in create_inference_statistics(get_inference_profiles()).items():
+			logger.debug(profile_name + ': ' + str(inference_statistics), __name__)
+
+
+def conditional_write_inference_statistics() -> bool:
+	inference_statistics_path = state_manager.get_item('inference_statistics_path')
+
+	if inference_statistics_path:
+		return write_json(inference_statistics_path, create_inference_statistics(get_inference_profiles()))
+	return False
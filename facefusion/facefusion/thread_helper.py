@@ -1,11 +1,14 @@
 import threading
 from contextlib import nullcontext
-from typing import ContextManager, Union
+from typing import ContextManager, Dict, Union
 
+from facefusion import state_manager
 from facefusion.execution import has_execution_provider
 
 THREAD_LOCK : threading.Lock = threading.Lock()
 THREAD_SEMAPHORE : threading.Semaphore = threading.Semaphore()
+MODEL_SEMAPHORES : Dict[str, threading.Semaphore] = {}
+MODEL_SEMAPHORE_LOCK : threading.Lock = threading.Lock()
 NULL_CONTEXT : ContextManager[None] = nullcontext()
 
 
@@ -21,3 +24,37 @@ def conditional_thread_semaphore() -> Union[threading.Semaphore, ContextManager[
 	if has_execution_provider('directml') or has_execution_provider('rocm'):
 		return THREAD_SEMAPHORE
 	return NULL_CONTEXT
+
+
+def conditional_model_semaphore(model_context : str) -> Union[threading.Semaphore, ContextManager[None]]:
+	execution_concurrency = get_execution_concurrency(model_context)
+
+	if execution_concurrency:
+		model_semaphore_key = model_context + '.' + str(execution_concurrency)
+
+		with MODEL_SEMAPHORE_LOCK:
+			if model_semaphore_key not in MODEL_SEMAPHORES:
+				MODEL_SEMAPHORES[model_semaphore_key] = threading.Semaphore(execution_concurrency)
+			return MODEL_SEMAPHORES.get(model_semaphore_key)
+	if resolve_model_concurrency(model_context):
+		return THREAD_SEMAPHORE
+	return NULL_CONTEXT
+
+
+def resolve_model_concurrency(model_context : str) -> int:
+	execution_concurrency = get_execution_concurrency(model_context)
+
+	if execution_concurrency:
+		return execution_concurrency
+	if any(execution_provider in [ 'directml', 'rocm' ] for execution_provider in state_manager.get_item('execution_providers') or []):
+		return 1
+	return 0
+
+
+def get_execution_concurrency(model_context : str) -> int:
+	execution_model_concurrency = state_manager.get_item('execution_model_concurrency') or {}
+	model_name = model_context.split('.')[-1]
+
+	if model_name in execution_model_concurrency:
+		return execution_model_concurrency.get(model_name)
+	return state_manager.get_item('execution_concurrency')
@@ -1,9 +1,8 @@
-from collections import namedtuple
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypedDict
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Tuple, TypedDict
 
 import numpy
 from numpy.typing import NDArray
-from onnxruntime import InferenceSession
+from onnxruntime import GraphOptimizationLevel, IOBinding, InferenceSession
 
 Scale = float
 Score = float
@@ -31,24 +30,104 @@ Embedding = NDArray[numpy.float64]
 Gender = Literal['female', 'male']
 Age = range
 Race = Literal['white', 'black', 'latino', 'asian', 'indian', 'arabic']
-Face = namedtuple('Face',
-[
-	'bounding_box',
-	'score_set',
-	'landmark_set',
-	'angle',
-	'embedding',
-	'normed_embedding',
-	'gender',
-	'age',
-	'race'
-])
+FaceAnalysis = TypedDict('FaceAnalysis',
+{
+	'embedding' : Optional[Embedding],
+	'normed_embedding' : Optional[Embedding],
+	'gender' : Optional[Gender],
+	'age' : Optional[Age],
+	'race' : Optional[Race],
+	'calc_embedding' : Optional[Callable[[], Tuple[Embedding, Embedding]]],
+	'classify_face' : Optional[Callable[[], Tuple[Gender, Age, Race]]]
+})
+
+
+class Face:
+	__slots__ = ('bounding_box', 'score_set', 'landmark_set', 'angle', 'track_id', 'face_analysis')
+
+	def __init__(self, bounding_box : BoundingBox, score_set : FaceScoreSet, landmark_set : FaceLandmarkSet, angle : Angle, embedding : Optional[Embedding] = None, normed_embedding : Optional[Embedding] = None, gender : Optional[Gender] = None, age : Optional[Age] = None, race : Optional[Race] = None, track_id : Optional[int] = None, face_analysis : Optional[FaceAnalysis] = None) -> None:
+		self.bounding_box = bounding_box
+		self.score_set = score_set
+		self.landmark_set = landmark_set
+		self.angle = angle
+		self.track_id = track_id
+		self.face_analysis : FaceAnalysis = face_analysis or\
+		{
+			'embedding': embedding,
+			'normed_embedding': normed_embedding,
+			'gender': gender,
+			'age': age,
+			'race': race,
+			'calc_embedding': None,
+			'classify_face': None
+		}
+
+	@property
+	def embedding(self) -> Embedding:
+		return self.analyse_embedding()[0]
+
+	@property
+	def normed_embedding(self) -> Embedding:
+		return self.analyse_embedding()[1]
+
+	@property
+	def gender(self) -> Gender:
+		return self.analyse_classification()[0]
+
+	@property
+	def age(self) -> Age:
+		return self.analyse_classification()[1]
+
+	@property
+	def race(self) -> Race:
+		return self.analyse_classification()[2]
+
+	def analyse_embedding(self) -> Tuple[Embedding, Embedding]:
+		calc_embedding = self.face_analysis.get('calc_embedding')
+
+		if calc_embedding:
+			self.face_analysis['embedding'], self.face_analysis['normed_embedding'] = calc_embedding()
+			self.face_analysis['calc_embedding'] = None
+		return self.face_analysis.get('embedding'), self.face_analysis.get('normed_embedding') #type:ignore[return-value]
+
+	def analyse_classification(self) -> Tuple[Gender, Age, Race]:
+		classify_face = self.face_analysis.get('classify_face')
+
+		if classify_face:
+			self.face_analysis['gender'], self.face_analysis['age'], self.face_analysis['race'] = classify_face()
+			self.face_analysis['classify_face'] = None
+		return self.face_analysis.get('gender'), self.face_analysis.get('age'), self.face_analysis.get('race') #type:ignore[return-value]
+
+
 FaceSet = Dict[str, List[Face]]
+FaceAssignment = TypedDict('FaceAssignment',
+{
+	'face' : Face,
+	'reference_set' : str,
+	'reference_face' : Face,
+	'face_distance' : float
+})
+ReferenceFacePair = Tuple[int, int]
 FaceStore = TypedDict('FaceStore',
 {
 	'static_faces' : FaceSet,
+	'static_footprints' : Dict[str, int],
 	'reference_faces' : FaceSet
 })
+FaceStoreStatistics = TypedDict('FaceStoreStatistics',
+{
+	'hits' : int,
+	'misses' : int,
+	'evictions' : int
+})
+FaceIndexFrames = Dict[int, List[Face]]
+FaceIndexArrays = Dict[str, NDArray[Any]]
+FaceIndex = TypedDict('FaceIndex',
+{
+	'frame_total' : int,
+	'frames' : FaceIndexFrames,
+	'arrays' : FaceIndexArrays
+})
 
 VisionFrame = NDArray[Any]
 Mask = NDArray[Any]
@@ -58,6 +137,28 @@ Matrix = NDArray[Any]
 Anchors = NDArray[Any]
 Translation = NDArray[Any]
 
+FrameContextKey = Tuple[Any, ...]
+FrameContextRule = Literal['keep', 'invalidate']
+FrameContext = TypedDict('FrameContext',
+{
+	'vision_frame' : VisionFrame,
+	'frame_number' : Optional[int],
+	'faces' : Optional[List[Face]],
+	'similar_faces' : Dict[FrameContextKey, List[Face]],
+	'matrices' : Dict[FrameContextKey, Matrix]
+})
+
+FaceTrackHistogram = NDArray[Any]
+FaceTrack = TypedDict('FaceTrack',
+{
+	'keyframe_number' : int,
+	'vision_frame' : VisionFrame,
+	'histogram' : FaceTrackHistogram,
+	'faces' : List[Face]
+})
+FaceTrackSet = Dict[int, FaceTrack]
+FaceTrackDistanceKey = Tuple[int, str]
+
 AudioBuffer = bytes
 Audio = NDArray[Any]
 AudioChunk = NDArray[Any]
@@ -81,6 +182,14 @@ QueuePayload = TypedDict('QueuePayload',
 Args = Dict[str, Any]
 UpdateProgress = Callable[[int], None]
 ProcessFrames = Callable[[List[str], List[QueuePayload], UpdateProgress], None]
+CompleteFrames = Callable[[List[int]], None]
+FrameSchedule = TypedDict('FrameSchedule',
+{
+	'thread_count' : int,
+	'frame_latency' : Optional[float],
+	'frame_numbers' : Set[int],
+	'next_frame_number' : int
+})
 ProcessStep = Callable[[str, int, Args], bool]
 
 Content = Dict[str, Any]
@@ -107,6 +216,8 @@ FaceMaskType = Literal['box', 'occlusion', 'region']
 FaceMaskRegion = Literal['skin', 'left-eyebrow', 'right-eyebrow', 'left-eye', 'right-eye', 'glasses', 'nose', 'mouth', 'upper-lip', 'lower-lip']
 FaceMaskRegionSet = Dict[FaceMaskRegion, int]
 TempFrameFormat = Literal['bmp', 'jpg', 'png']
+TempFrameMode = Literal['disk', 'pipe']
+ProcessorChainMode = Literal['fused', 'sequential']
 OutputAudioEncoder = Literal['aac', 'libmp3lame', 'libopus', 'libvorbis']
 OutputVideoEncoder = Literal['libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc', 'h264_amf', 'hevc_amf','h264_qsv', 'hevc_qsv', 'h264_videotoolbox', 'hevc_videotoolbox']
 OutputVideoPreset = Literal['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow']
@@ -118,6 +229,12 @@ ModelInitializer = NDArray[Any]
 ExecutionProvider = Literal['cpu', 'coreml', 'cuda', 'directml', 'openvino', 'rocm', 'tensorrt']
 ExecutionProviderValue = Literal['CPUExecutionProvider', 'CoreMLExecutionProvider', 'CUDAExecutionProvider', 'DmlExecutionProvider', 'OpenVINOExecutionProvider', 'ROCMExecutionProvider', 'TensorrtExecutionProvider']
 ExecutionProviderSet = Dict[ExecutionProvider, ExecutionProviderValue]
+ExecutionGraphOptimization = Literal['disabled', 'basic', 'extended', 'all']
+ExecutionGraphOptimizationSet = Dict[ExecutionGraphOptimization, GraphOptimizationLevel]
+ExecutionMode = Literal['sequential', 'parallel']
+ExecutionConcurrencyModel = Literal['age_modifier', 'deep_swapper', 'expression_restorer', 'face_detector', 'face_editor', 'face_enhancer', 'frame_colorizer']
+ExecutionModelConcurrency = Dict[ExecutionConcurrencyModel, int]
+ExecutionQuantizedModel = Literal['arcface_w600k_r50_int8', 'inswapper_128_int8', 'retinaface_10g_int8', 'scrfd_2.5g_int8', 'xseg_1_int8', 'xseg_2_int8', 'yoloface_8n_int8']
 ValueAndUnit = TypedDict('ValueAndUnit',
 {
 	'value' : int,
@@ -186,6 +303,45 @@ AppContext = Literal['cli', 'ui']
 
 InferencePool = Dict[str, InferenceSession]
 InferencePoolSet = Dict[AppContext, Dict[str, InferencePool]]
+InferencePoolUsage = TypedDict('InferencePoolUsage',
+{
+	'footprint' : int,
+	'used_at' : float
+})
+InferenceInputs = Dict[str, Any]
+InferenceInputTypeSet = Dict[str, Any]
+InferenceOutputs = List[Any]
+InferenceBatchKey = Tuple[Any, ...]
+InferenceBindingKey = Tuple[Any, ...]
+InferenceHistogram = TypedDict('InferenceHistogram',
+{
+	'total' : int,
+	'sum' : float,
+	'maximum' : float,
+	'buckets' : List[int]
+})
+InferenceProfile = TypedDict('InferenceProfile',
+{
+	'call_total' : int,
+	'batch_total' : int,
+	'queue_wait' : InferenceHistogram,
+	'run_time' : InferenceHistogram
+})
+InferenceBinding = TypedDict('InferenceBinding',
+{
+	'io_binding' : IOBinding,
+	'inputs' : Dict[str, NDArray[Any]],
+	'outputs' : InferenceOutputs
+})
+InferenceBatchRequest = TypedDict('InferenceBatchRequest',
+{
+	'batch_key' : InferenceBatchKey,
+	'output_names' : Optional[List[str]],
+	'input_feed' : InferenceInputs,
+	'outputs' : Optional[InferenceOutputs],
+	'exception' : Optional[Exception],
+	'is_done' : bool
+})
 
 UiWorkflow = Literal['instant_runner', 'job_runner', 'job_manager']
 
@@ -228,6 +384,8 @@ StateKey = Literal\
 	'face_detector_size',
 	'face_detector_angles',
 	'face_detector_score',
+	'face_tracker_interval',
+	'face_tracker_score',
 	'face_landmarker_model',
 	'face_landmarker_score',
 	'face_selector_mode',
@@ -239,6 +397,7 @@ StateKey = Literal\
 	'reference_face_position',
 	'reference_face_distance',
 	'reference_frame_number',
+	'reference_face_pairs',
 	'face_occluder_model',
 	'face_parser_model',
 	'face_mask_types',
@@ -248,7 +407,9 @@ StateKey = Literal\
 	'trim_frame_start',
 	'trim_frame_end',
 	'temp_frame_format',
+	'temp_frame_mode',
 	'keep_temp',
+	'target_analysis',
 	'output_image_quality',
 	'output_image_resolution',
 	'output_audio_encoder',
@@ -259,18 +420,32 @@ StateKey = Literal\
 	'output_video_fps',
 	'skip_audio',
 	'processors',
+	'processor_chain_mode',
 	'open_browser',
 	'ui_layouts',
 	'ui_workflow',
 	'execution_device_id',
+	'execution_device_ids',
 	'execution_providers',
 	'execution_thread_count',
 	'execution_queue_count',
+	'execution_batch_size',
+	'execution_batch_window',
+	'execution_mode',
+	'execution_graph_optimization',
+	'execution_quantized_models',
+	'execution_replica_count',
+	'execution_concurrency',
+	'execution_model_concurrency',
+	'warmup',
 	'download_providers',
 	'download_scope',
 	'video_memory_strategy',
 	'system_memory_limit',
+	'inference_memory_limit',
+	'face_store_memory_limit',
 	'log_level',
+	'inference_statistics_path',
 	'job_id',
 	'job_status',
 	'step_index'
@@ -291,6 +466,8 @@ State = TypedDict('State',
 	'face_detector_size' : str,
 	'face_detector_angles' : List[Angle],
 	'face_detector_score' : Score,
+	'face_tracker_interval' : int,
+	'face_tracker_score' : Score,
 	'face_landmarker_model' : FaceLandmarkerModel,
 	'face_landmarker_score' : Score,
 	'face_selector_mode' : FaceSelectorMode,
@@ -302,6 +479,7 @@ State = TypedDict('State',
 	'reference_face_position' : int,
 	'reference_face_distance' : float,
 	'reference_frame_number' : int,
+	'reference_face_pairs' : List[ReferenceFacePair],
 	'face_occluder_model' : FaceOccluderModel,
 	'face_parser_model' : FaceParserModel,
 	'face_mask_types' : List[FaceMaskType],
@@ -311,7 +489,9 @@ State = TypedDict('State',
 	'trim_frame_start' : int,
 	'trim_frame_end' : int,
 	'temp_frame_format' : TempFrameFormat,
+	'temp_frame_mode' : TempFrameMode,
 	'keep_temp' : bool,
+	'target_analysis' : bool,
 	'output_image_quality' : int,
 	'output_image_resolution' : str,
 	'output_audio_encoder' : OutputAudioEncoder,
@@ -322,18 +502,32 @@ State = TypedDict('State',
 	'output_video_fps' : float,
 	'skip_audio' : bool,
 	'processors' : List[str],
+	'processor_chain_mode' : ProcessorChainMode,
 	'open_browser' : bool,
 	'ui_layouts' : List[str],
 	'ui_workflow' : UiWorkflow,
 	'execution_device_id' : str,
+	'execution_device_ids' : List[str],
 	'execution_providers' : List[ExecutionProvider],
 	'execution_thread_count' : int,
 	'execution_queue_count' : int,
+	'execution_batch_size' : int,
+	'execution_batch_window' : int,
+	'execution_mode' : ExecutionMode,
+	'execution_graph_optimization' : ExecutionGraphOptimization,
+	'execution_quantized_models' : List[ExecutionQuantizedModel],
+	'execution_replica_count' : int,
+	'execution_concurrency' : int,
+	'execution_model_concurrency' : ExecutionModelConcurrency,
+	'warmup' : bool,
 	'download_providers' : List[DownloadProvider],
 	'download_scope' : DownloadScope,
 	'video_memory_strategy' : VideoMemoryStrategy,
 	'system_memory_limit' : int,
+	'inference_memory_limit' : int,
+	'face_store_memory_limit' : int,
 	'log_level' : LogLevel,
+	'inference_statistics_path' : str,
 	'job_id' : str,
 	'job_status' : JobStatus,
 	'step_index' : int
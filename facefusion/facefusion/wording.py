@@ -10,6 +10,11 @@ WORDING : Dict[str, Any] =\
 	'extracting_frames': 'Extracting frames with a resolution of {resolution} and {fps} frames per second',
 	'extracting_frames_succeed': 'Extracting frames succeed',
 	'extracting_frames_failed': 'Extracting frames failed',
+	'streaming_video': 'Streaming video with a resolution of {resolution} and {fps} frames per second',
+	'streaming_video_succeed': 'Streaming video succeed',
+	'streaming_video_failed': 'Streaming video failed',
+	'analysing_target': 'Analysing target faces',
+	'loading_face_index_succeed': 'Loading face index succeed',
 	'analysing': 'Analysing',
 	'extracting': 'Extracting',
 	'streaming': 'Streaming',
@@ -43,6 +48,8 @@ WORDING : Dict[str, Any] =\
 	'choose_image_or_video_target': 'Choose a image or video for the target',
 	'specify_image_or_video_output': 'Specify the output image or video within a directory',
 	'match_target_and_output_extension': 'Match the target and output extension',
+	'invalid_reference_face_pair': 'Invalid reference face pair {reference_face_pair}, use FRAME_NUMBER:FACE_POSITION',
+	'invalid_model_concurrency': 'Invalid model concurrency {model_concurrency}, use MODEL:LIMIT',
 	'no_source_face_detected': 'No source face detected',
 	'processor_not_loaded': 'Processor {processor} could not be loaded',
 	'processor_not_implemented': 'Processor {processor} not implemented correctly',
@@ -77,6 +84,12 @@ WORDING : Dict[str, Any] =\
 	'processing_job_failed': 'Processing of job {job_id} failed',
 	'processing_jobs_failed': 'Processing of all jobs failed',
 	'processing_step': 'Processing step {step_current} of {step_total}',
+	'evicting_inference_pool': 'Evicting inference pool {inference_context}',
+	'loading_inference_pool_succeed': 'Loading inference pool for {module_name} succeed in {seconds} seconds',
+	'warming_up_model_succeed': 'Warming up {model_name} succeed in {seconds} seconds',
+	'warming_up_model_failed': 'Warming up {model_name} failed',
+	'using_quantized_model': 'Using quantized model {model_name}',
+	'using_inference_replicas': 'Using {replica_count} inference replicas for {model_name}',
 	'validating_hash_succeed': 'Validating hash for {hash_file_name} succeed',
 	'validating_hash_failed': 'Validating hash for {hash_file_name} failed',
 	'validating_source_succeed': 'Validating source for {source_file_name} succeed',
@@ -112,6 +125,8 @@ WORDING : Dict[str, Any] =\
 		'face_detector_size': 'specify the frame size provided to the face detector',
 		'face_detector_angles': 'specify the angles to rotate the frame before detecting faces',
 		'face_detector_score': 'filter the detected faces base on the confidence score',
+		'face_tracker_interval': 'track the faces between keyframes and detect them every amount of frames (0 = disabled)',
+		'face_tracker_score': 'detect the faces again once the tracking confidence drops below the score',
 		# face landmarker
 		'face_landmarker_model': 'choose the model responsible for detecting the face landmarks',
 		'face_landmarker_score': 'filter the detected face landmarks base on the confidence score',
@@ -125,6 +140,7 @@ WORDING : Dict[str, Any] =\
 		'reference_face_position': 'specify the position used to create the reference face',
 		'reference_face_distance': 'specify the similarity between the reference face and target face',
 		'reference_frame_number': 'specify the frame used to create the reference face',
+		'reference_face_pairs': 'specify several references as FRAME_NUMBER:FACE_POSITION pairs to match multiple faces in a single pass (overrides reference frame number and position)',
 		# face masker
 		'face_occluder_model': 'choose the model responsible for the occlusion mask',
 		'face_parser_model': 'choose the model responsible for the region mask',
@@ -136,7 +152,9 @@ WORDING : Dict[str, Any] =\
 		'trim_frame_start': 'specify the starting frame of the target video',
 		'trim_frame_end': 'specify the ending frame of the target video',
 		'temp_frame_format': 'specify the temporary resources format',
+		'temp_frame_mode': 'choose between extracting the frames to disk or streaming them through a pipe',
 		'keep_temp': 'keep the temporary resources after processing',
+		'target_analysis': 'store the target faces in an index under .caches and reuse it on later runs',
 		# output creation
 		'output_image_quality': 'specify the image quality which translates to the compression factor',
 		'output_image_resolution': 'specify the image output resolution based on the target image',
@@ -149,6 +167,7 @@ WORDING : Dict[str, Any] =\
 		'skip_audio': 'omit the audio from the target video',
 		# processors
 		'processors': 'load a single or multiple processors (choices: {choices}, ...)',
+		'processor_chain_mode': 'choose between running every processor on a frame in one pass or one processor after another over all frames',
 		'age_modifier_model': 'choose the model responsible for aging the face',
 		'age_modifier_direction': 'specify the direction in which the age should be modified',
 		'deep_swapper_model': 'choose the model responsible for swapping the face',
@@ -176,6 +195,7 @@ WORDING : Dict[str, Any] =\
 		'face_enhancer_weight': 'specify the degree of weight applied to the face',
 		'face_swapper_model': 'choose the model responsible for swapping the face',
 		'face_swapper_pixel_boost': 'choose the pixel boost resolution for the face swapper',
+		'face_swapper_batch_size': 'specify the amount of face crops the face swapper infers in a single run',
 		'frame_colorizer_model': 'choose the model responsible for colorizing the frame',
 		'frame_colorizer_size': 'specify the frame size provided to the frame colorizer',
 		'frame_colorizer_blend': 'blend the colorized into the previous frame',
@@ -188,17 +208,30 @@ WORDING : Dict[str, Any] =\
 		'ui_workflow': 'choose the ui workflow',
 		# execution
 		'execution_device_id': 'specify the device used for processing',
+		'execution_device_ids': 'spread the models over multiple devices and route each inference to the least loaded one',
 		'execution_providers': 'inference using different providers (choices: {choices}, ...)',
 		'execution_thread_count': 'specify the amount of parallel threads while processing',
 		'execution_queue_count': 'specify the amount of frames each thread is processing',
+		'execution_batch_size': 'specify the amount of concurrent inference requests that are combined into a single run',
+		'execution_batch_window': 'specify the milliseconds to wait for concurrent inference requests to join a batch',
+		'execution_mode': 'choose whether the operators of a model run sequential or parallel',
+		'execution_graph_optimization': 'choose the graph optimization level of the models',
+		'execution_quantized_models': 'choose the models to replace with a dynamically quantized int8 copy on the cpu (choices: {choices}, ...)',
+		'execution_replica_count': 'specify the amount of session replicas per model on the cpu (0 = automatic)',
+		'execution_concurrency': 'limit the concurrent runs per detector and generator model (0 = exclusive for directml and rocm, unlimited otherwise)',
+		'execution_model_concurrency': 'override the concurrent runs of single models with MODEL:LIMIT pairs (choices: {choices}, ...)',
+		'warmup': 'load the models of the selected processors and run a dummy inference before processing',
 		# download
 		'download_providers': 'download using different providers (choices: {choices}, ...)',
 		'download_scope': 'specify the download scope',
 		# memory
 		'video_memory_strategy': 'balance fast processing and low VRAM usage',
 		'system_memory_limit': 'limit the available RAM that can be used while processing',
+		'inference_memory_limit': 'keep the loaded models resident within this amount of GB and evict the least recently used ones (0 = clear by strategy)',
+		'face_store_memory_limit': 'keep the cached faces within this amount of MB and evict the least recently used frames (0 = unlimited)',
 		# misc
 		'log_level': 'adjust the message severity displayed in the terminal',
+		'inference_statistics_path': 'specify the json file to write the per model inference statistics to',
 		# run
 		'run': 'run the program',
 		'headless_run': 'run the program in headless mode',
@@ -1,5 +1,9 @@
 import os
 import tempfile
+from typing import List, Optional, Sequence, Union
+
+import onnx
+from onnx import NodeProto, TensorProto, helper
 
 from facefusion.filesystem import create_directory, is_directory, is_file, remove_directory
 from facefusion.typing import JobStatus
@@ -42,3 +46,14 @@ def prepare_test_output_directory() -> bool:
 	remove_directory(test_outputs_directory)
 	create_directory(test_outputs_directory)
 	return is_directory(test_outputs_directory)
+
+
+def create_test_model(model_path : str, model_nodes : List[NodeProto], input_shape : Sequence[Union[int, str]], output_shape : Optional[Sequence[Union[int, str]]], model_initializers : Optional[List[TensorProto]] = None) -> bool:
+	input_info = helper.make_tensor_value_info('input', TensorProto.FLOAT, input_shape)
+	output_info = helper.make_tensor_value_info('output', TensorProto.FLOAT, output_shape)
+	model_name, _ = os.path.splitext(os.path.basename(model_path))
+	graph = helper.make_graph(model_nodes, model_name, [ input_info ], [ output_info ], model_initializers or [])
+	model = helper.make_model(graph, opset_imports = [ helper.make_opsetid('', 13) ])
+	model.ir_version = 8
+	onnx.save(model, model_path)
+	return is_file(model_path)
@@ -0,0 +1,43 @@
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from facefusion import state_manager
+from facefusion.app_context import detect_app_context, set_app_context, use_app_context
+
+
+def call_nested(depth : int, callback : Callable[[], Any]) -> Any:
+	if depth:
+		return call_nested(depth - 1, callback)
+	return callback()
+
+
+def test_use_app_context() -> None:
+	assert detect_app_context() == 'cli'
+
+	with use_app_context('ui'):
+		assert detect_app_context() == 'ui'
+
+		with use_app_context('cli'):
+			assert detect_app_context() == 'cli'
+		assert detect_app_context() == 'ui'
+	assert detect_app_context() == 'cli'
+
+
+def test_app_context_in_thread_pool() -> None:
+	with use_app_context('ui'):
+		with ThreadPoolExecutor(max_workers = 2, initializer = set_app_context, initargs = (detect_app_context(),)) as executor:
+			assert executor.submit(detect_app_context).result() == 'ui'
+
+
+def test_benchmark_get_item() -> None:
+	state_manager.init_item('execution_thread_count', 4)
+
+	def benchmark_get_item() -> float:
+		return timeit.timeit(lambda : state_manager.get_item('execution_thread_count'), number = 10000)
+
+	stack_walk_time = call_nested(40, benchmark_get_item)
+	with use_app_context('cli'):
+		context_time = call_nested(40, benchmark_get_item)
+
+	assert context_time * 5 < stack_walk_time
@@ -1,10 +1,12 @@
 import subprocess
 import sys
 
+import numpy
 import pytest
 
 from facefusion.download import conditional_download
 from facefusion.jobs.job_manager import clear_jobs, init_jobs
+from facefusion.vision import read_image
 from .helper import get_test_example_file, get_test_examples_directory, get_test_jobs_directory, get_test_output_file, is_test_output_file, prepare_test_output_directory
 
 
@@ -37,3 +39,23 @@ def test_swap_face_to_video() -> None:
 
 	assert subprocess.run(commands).returncode == 0
 	assert is_test_output_file('test-swap-face-to-video.mp4') is True
+
+
+def test_swap_and_enhance_face_to_video() -> None:
+	commands = [ sys.executable, 'facefusion.py', 'headless-run', '--jobs-path', get_test_jobs_directory(), '--processors', 'face_swapper', 'face_enhancer', '-s', get_test_example_file('source.jpg'), '-t', get_test_example_file('target-240p.mp4'), '-o', get_test_output_file('test-swap-and-enhance-face-to-video.mp4'), '--trim-frame-end', '1' ]
+
+	assert subprocess.run(commands).returncode == 0
+	assert is_test_output_file('test-swap-and-enhance-face-to-video.mp4') is True
+
+
+def test_swap_face_to_image_quantized() -> None:
+	commands = [ sys.executable, 'facefusion.py', 'headless-run', '--jobs-path', get_test_jobs_directory(), '--processors', 'face_swapper', '--face-swapper-model', 'inswapper_128', '--execution-providers', 'cpu', '-s', get_test_example_file('source.jpg'), '-t', get_test_example_file('target-240p.jpg') ]
+	quantized_commands = commands + [ '--execution-quantized-models', 'arcface_w600k_r50_int8', 'inswapper_128_int8', 'yoloface_8n_int8' ]
+
+	assert subprocess.run(commands + [ '-o', get_test_output_file('test-swap-face-to-image-fp32.jpg') ]).returncode == 0
+	assert subprocess.run(quantized_commands + [ '-o', get_test_output_file('test-swap-face-to-image-quantized.jpg') ]).returncode == 0
+
+	fp32_vision_frame = read_image(get_test_output_file('test-swap-face-to-image-fp32.jpg')).astype(numpy.float32)
+	quantized_vision_frame = read_image(get_test_output_file('test-swap-face-to-image-quantized.jpg')).astype(numpy.float32)
+
+	assert numpy.abs(fp32_vision_frame - quantized_vision_frame).mean() < 2.0
@@ -1,4 +1,6 @@
-from facefusion.execution import create_inference_execution_providers, get_available_execution_providers, has_execution_provider
+import platform
+
+from facefusion.execution import create_inference_execution_providers, detect_cpu_identity, get_available_execution_providers, has_execution_provider
 
 
 def test_has_execution_provider() -> None:
@@ -22,3 +24,7 @@ def test_create_inference_execution_providers() -> None:
 	]
 
 	assert create_inference_execution_providers('1', [ 'cpu', 'cuda' ]) == execution_providers
+
+
+def test_detect_cpu_identity() -> None:
+	assert detect_cpu_identity().startswith(platform.machine() + '|')
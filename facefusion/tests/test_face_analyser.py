@@ -108,3 +108,21 @@ def test_get_many_faces() -> None:
 	assert isinstance(many_faces[0], Face)
 	assert isinstance(many_faces[1], Face)
 	assert isinstance(many_faces[2], Face)
+
+
+def test_analyse_faces_lazily() -> None:
+	state_manager.init_item('face_detector_model', 'yoloface')
+	state_manager.init_item('face_detector_size', '640x640')
+	face_detector.pre_check()
+
+	source_path = get_test_example_file('source.jpg')
+	source_frame = read_static_image(source_path).copy()
+	face = get_one_face(get_many_faces([ source_frame ]))
+
+	assert face.face_analysis.get('calc_embedding')
+	assert face.face_analysis.get('classify_face')
+	assert face.normed_embedding.shape == (512,)
+	assert face.face_analysis.get('calc_embedding') is None
+	assert face.face_analysis.get('classify_face')
+	assert face.gender in [ 'female', 'male' ]
+	assert face.face_analysis.get('classify_face') is None
@@ -0,0 +1,49 @@
+import cv2
+import numpy
+
+from facefusion.face_helper import calc_crop_bounding_box, estimate_matrix_by_face_landmark_5, has_bounding_box_overlap, paste_back
+from facefusion.typing import Mask, Matrix, VisionFrame
+
+
+def paste_back_full_frame(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_mask : Mask, affine_matrix : Matrix) -> VisionFrame:
+	inverse_matrix = cv2.invertAffineTransform(affine_matrix)
+	temp_size = temp_vision_frame.shape[:2][::-1]
+	inverse_mask = cv2.warpAffine(crop_mask, inverse_matrix, temp_size).clip(0, 1)
+	inverse_vision_frame = cv2.warpAffine(crop_vision_frame, inverse_matrix, temp_size, borderMode = cv2.BORDER_REPLICATE)
+	paste_vision_frame = temp_vision_frame.copy()
+	for channel in range(3):
+		paste_vision_frame[:, :, channel] = inverse_mask * inverse_vision_frame[:, :, channel] + (1 - inverse_mask) * temp_vision_frame[:, :, channel]
+	return paste_vision_frame
+
+
+def test_paste_back() -> None:
+	temp_vision_frame = numpy.random.randint(0, 255, (720, 1280, 3), dtype = numpy.uint8)
+	crop_vision_frame = cv2.GaussianBlur(numpy.random.rand(256, 256, 3) * 255, (0, 0), 8)
+	crop_mask = cv2.GaussianBlur(numpy.random.rand(256, 256).astype(numpy.float32), (0, 0), 8)
+
+	for face_landmark_5 in [ numpy.array([ [ 600, 300 ], [ 680, 300 ], [ 640, 350 ], [ 610, 390 ], [ 670, 390 ] ]), numpy.array([ [ 10, 0 ], [ 90, 10 ], [ 50, 50 ], [ 20, 90 ], [ 80, 90 ] ]) ]:
+		affine_matrix = estimate_matrix_by_face_landmark_5(face_landmark_5.astype(numpy.float32), 'ffhq_512', (256, 256))
+		paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+		full_frame_vision_frame = paste_back_full_frame(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+
+		assert paste_vision_frame is not temp_vision_frame
+		assert numpy.abs(paste_vision_frame.astype(int) - full_frame_vision_frame.astype(int)).max() <= 3
+		assert numpy.mean(paste_vision_frame != full_frame_vision_frame) < 0.001
+
+
+def test_paste_back_outside_frame() -> None:
+	temp_vision_frame = numpy.zeros((64, 64, 3), dtype = numpy.uint8)
+	crop_vision_frame = numpy.full((32, 32, 3), 255.0)
+	crop_mask = numpy.ones((32, 32), dtype = numpy.float32)
+	affine_matrix = numpy.array([ [ 1.0, 0.0, 200.0 ], [ 0.0, 1.0, 200.0 ] ])
+
+	assert numpy.array_equal(paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix), temp_vision_frame)
+
+
+def test_calc_crop_bounding_box() -> None:
+	affine_matrix = numpy.array([ [ 0.5, 0, -50 ], [ 0, 0.5, -20 ] ])
+
+	assert numpy.allclose(calc_crop_bounding_box(affine_matrix, (128, 128)), [ 100, 40, 356, 296 ])
+	assert has_bounding_box_overlap(numpy.array([ 0, 0, 100, 100 ]), numpy.array([ 50, 50, 150, 150 ])) is True
+	assert has_bounding_box_overlap(numpy.array([ 0, 0, 100, 100 ]), numpy.array([ 100, 0, 200, 100 ])) is False
+	assert has_bounding_box_overlap(numpy.array([ 0, 0, 100, 100 ]), numpy.array([ 0, 120, 100, 200 ])) is False
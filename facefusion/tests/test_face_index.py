@@ -0,0 +1,143 @@
+import os
+
+import numpy
+
+from facefusion import face_index
+from facefusion.face_index import clear_face_index, get_index_faces, load_face_index, pack_face_index, save_face_index, unpack_face_index
+from facefusion.filesystem import remove_directory
+from facefusion.hash_helper import create_file_hash, create_static_file_hash
+from facefusion.typing import Face
+from .helper import get_test_output_file, prepare_test_output_directory
+
+
+def create_face(offset : float) -> Face:
+	return Face(
+		bounding_box = numpy.array([ 10, 20, 110, 140 ]) + offset,
+		score_set =
+		{
+			'detector': 0.75,
+			'landmarker': 0.5
+		},
+		landmark_set =
+		{
+			'5': numpy.full((5, 2), offset),
+			'5/68': numpy.full((5, 2), offset + 1),
+			'68': numpy.full((68, 2), offset + 2),
+			'68/5': numpy.full((68, 2), offset + 3)
+		},
+		angle = 90,
+		embedding = numpy.full(512, offset),
+		normed_embedding = numpy.full(512, offset / 10),
+		gender = 'male',
+		age = range(20, 30),
+		race = 'asian'
+	)
+
+
+def test_pack_and_unpack_face_index() -> None:
+	face_index_frames =\
+	{
+		0: [ create_face(1), create_face(2) ],
+		2: [ create_face(3) ]
+	}
+	face_index_arrays = pack_face_index(face_index_frames)
+
+	assert face_index_arrays.get('frame_numbers').tolist() == [ 0, 0, 2 ]
+	assert face_index_arrays.get('landmarks_68').shape == (3, 68, 2)
+
+	unpacked_frames = unpack_face_index(face_index_arrays)
+
+	assert list(unpacked_frames.keys()) == [ 0, 2 ]
+	assert len(unpacked_frames.get(0)) == 2
+
+	for frame_number in face_index_frames:
+		for face, unpacked_face in zip(face_index_frames.get(frame_number), unpacked_frames.get(frame_number)):
+			assert numpy.allclose(face.bounding_box, unpacked_face.bounding_box)
+			assert numpy.allclose(face.landmark_set.get('5/68'), unpacked_face.landmark_set.get('5/68'))
+			assert numpy.allclose(face.normed_embedding, unpacked_face.normed_embedding)
+			assert unpacked_face.score_set == face.score_set
+			assert unpacked_face.angle == face.angle
+			assert unpacked_face.gender == face.gender
+			assert unpacked_face.age == face.age
+			assert unpacked_face.race == face.race
+
+
+def test_pack_empty_face_index() -> None:
+	face_index_arrays = pack_face_index({})
+
+	assert face_index_arrays.get('frame_numbers').size == 0
+	assert unpack_face_index(face_index_arrays) == {}
+
+
+def test_save_and_load_face_index() -> None:
+	prepare_test_output_directory()
+	face_index_path = get_test_output_file('face_index')
+	remove_directory(face_index_path)
+
+	assert load_face_index(face_index_path) is False
+
+	face_index.FACE_INDEX['frame_total'] = 4
+	face_index.FACE_INDEX['frames'] =\
+	{
+		0: [ create_face(1), create_face(2) ],
+		2: [ create_face(3) ]
+	}
+
+	assert save_face_index(face_index_path) is True
+
+	clear_face_index()
+
+	assert load_face_index(face_index_path) is True
+	assert isinstance(face_index.FACE_INDEX.get('arrays').get('embeddings'), numpy.memmap)
+	assert face_index.FACE_INDEX.get('frames') == {}
+	assert len(get_index_faces(0)) == 2
+	assert get_index_faces(1) == []
+	assert numpy.allclose(get_index_faces(2)[0].bounding_box, create_face(3).bounding_box)
+	assert get_index_faces(0) is get_index_faces(0)
+	assert get_index_faces(4) is None
+
+	face_index_arrays = face_index.FACE_INDEX.get('arrays')
+	face_index.FACE_INDEX['frames'] = {}
+
+	assert save_face_index(face_index_path) is True
+	assert numpy.allclose(face_index_arrays.get('bounding_boxes')[2], create_face(3).bounding_box)
+	assert os.listdir(os.path.dirname(face_index_path)).count('face_index') == 1
+	assert not any(file_name.startswith('face_index.') for file_name in os.listdir(os.path.dirname(face_index_path)))
+
+	face_index.FACE_INDEX['frame_total'] = 6
+	face_index.FACE_INDEX['frames'] =\
+	{
+		5: [ create_face(4) ]
+	}
+
+	assert save_face_index(face_index_path) is True
+
+	clear_face_index()
+
+	assert load_face_index(face_index_path) is True
+	assert face_index.FACE_INDEX.get('frame_total') == 6
+	assert get_index_faces(0) == []
+	assert len(get_index_faces(5)) == 1
+
+	clear_face_index()
+	remove_directory(face_index_path)
+
+
+def test_create_file_hash() -> None:
+	prepare_test_output_directory()
+	file_path = get_test_output_file('content.bin')
+
+	with open(file_path, 'wb') as file:
+		file.write(bytes(range(256)) * 16384)
+	file_hash = create_file_hash(file_path)
+
+	assert create_file_hash(file_path) == file_hash
+	assert create_static_file_hash.cache_info().hits > 0
+
+	with open(file_path, 'r+b') as file:
+		file.seek(1024 ** 2 + 1)
+		file.write(b'x')
+	file_stat = os.stat(file_path)
+	os.utime(file_path, ns = (file_stat.st_atime_ns, file_stat.st_mtime_ns + 1000))
+
+	assert create_file_hash(file_path) != file_hash
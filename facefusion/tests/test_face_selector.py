@@ -0,0 +1,87 @@
+from typing import List
+
+import numpy
+
+from facefusion.face_selector import calc_face_distance, find_face_assignments, find_similar_faces
+from facefusion.typing import Face, FaceSet
+
+
+def create_face(direction : List[float]) -> Face:
+	normed_embedding = numpy.array(direction + [ 0.0 ] * (512 - len(direction)))
+	normed_embedding = normed_embedding / numpy.linalg.norm(normed_embedding)
+	return Face(
+		bounding_box = numpy.array([ 0, 0, 64, 64 ]),
+		score_set =
+		{
+			'detector': 0.75,
+			'landmarker': 0.5
+		},
+		landmark_set =
+		{
+			'5': numpy.zeros((5, 2)),
+			'5/68': numpy.zeros((5, 2)),
+			'68': numpy.zeros((68, 2)),
+			'68/5': numpy.zeros((68, 2))
+		},
+		angle = 0,
+		embedding = normed_embedding,
+		normed_embedding = normed_embedding,
+		gender = 'male',
+		age = range(20, 30),
+		race = 'asian'
+	)
+
+
+def find_similar_faces_by_loop(faces : List[Face], reference_faces : FaceSet, face_distance : float) -> List[Face]:
+	similar_faces : List[Face] = []
+
+	for reference_set in reference_faces:
+		if not similar_faces:
+			for face in faces:
+				if any(calc_face_distance(face, reference_face) < face_distance for reference_face in reference_faces[reference_set]):
+					similar_faces.append(face)
+	return similar_faces
+
+
+def test_find_similar_faces() -> None:
+	faces = [ create_face([ 1, 0, 0 ]), create_face([ 0, 1, 0 ]), create_face([ 0, 0, 1 ]), create_face([ 1, 0.1, 0 ]) ]
+	reference_faces =\
+	{
+		'first': [ create_face([ 0, 0, -1 ]) ],
+		'second': [ create_face([ 0, 1, 0.1 ]), create_face([ 1, 0, 0 ]) ],
+		'third': [ create_face([ 0, 0, 1 ]) ]
+	}
+
+	for face_distance in [ 0.1, 0.5, 1.5, 2.5 ]:
+		assert find_similar_faces(faces, reference_faces, face_distance) == find_similar_faces_by_loop(faces, reference_faces, face_distance)
+	assert find_similar_faces(faces, reference_faces, 0.1) == [ faces[0], faces[1], faces[3] ]
+	assert find_similar_faces(faces, {}, 0.1) == []
+
+
+def test_find_similar_faces_order() -> None:
+	faces = [ create_face([ 0, 0, 1 ]), create_face([ 0, 1, 0 ]), create_face([ 1, 0, 0 ]) ]
+	reference_faces =\
+	{
+		'first': [ create_face([ 1, 0, 0 ]), create_face([ 0, 0, 1 ]) ],
+		'second': [ create_face([ 0, 1, 0 ]), create_face([ 0, 0, 1 ]), create_face([ 1, 0, 0 ]) ]
+	}
+
+	assert find_similar_faces(faces, reference_faces, 0.5) == [ faces[0], faces[2] ]
+	assert find_similar_faces(faces[::-1], reference_faces, 0.5) == [ faces[2], faces[0] ]
+	assert find_similar_faces(faces, { 'second': reference_faces.get('second'), 'first': reference_faces.get('first') }, 0.5) == faces
+
+
+def test_find_face_assignments() -> None:
+	faces = [ create_face([ 1, 0, 0 ]), create_face([ 0, 1, 0 ]), create_face([ 0, 0, 1 ]) ]
+	reference_faces =\
+	{
+		'first': [ create_face([ 0, 1, 0 ]) ],
+		'second': [ create_face([ 1, 0.1, 0 ]), create_face([ 1, 0, 0 ]) ]
+	}
+	face_assignments = find_face_assignments(faces, reference_faces, 0.5)
+
+	assert [ face_assignment.get('face') for face_assignment in face_assignments ] == [ faces[0], faces[1] ]
+	assert [ face_assignment.get('reference_set') for face_assignment in face_assignments ] == [ 'second', 'first' ]
+	assert face_assignments[0].get('reference_face') is reference_faces.get('second')[1]
+	assert numpy.isclose(face_assignments[0].get('face_distance'), 0)
+	assert find_face_assignments(faces, {}, 0.5) == []
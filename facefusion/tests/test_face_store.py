@@ -0,0 +1,110 @@
+from functools import partial
+from typing import Tuple
+
+import numpy
+import pytest
+
+from facefusion import state_manager
+from facefusion.face_store import clear_static_faces, create_frame_hash, create_frame_key, get_face_store, get_face_store_statistics, get_static_faces, set_static_faces
+from facefusion.frame_context import clear_frame_context, create_frame_context, set_frame_context
+from facefusion.statistics import create_face_store_statistics
+from facefusion.typing import Age, Face, Gender, Race, VisionFrame
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	state_manager.init_item('target_path', 'target.mp4')
+	state_manager.init_item('face_store_memory_limit', 0)
+	clear_static_faces()
+	clear_frame_context()
+
+
+def create_face() -> Face:
+	face_landmark_5 = numpy.zeros((5, 2), dtype = numpy.float32)
+	face_landmark_68 = numpy.zeros((68, 2), dtype = numpy.float32)
+	return Face(
+		bounding_box = numpy.array([ 0, 0, 64, 64 ], dtype = numpy.float32),
+		score_set =
+		{
+			'detector': 0.75,
+			'landmarker': 0.5
+		},
+		landmark_set =
+		{
+			'5': face_landmark_5,
+			'5/68': face_landmark_5,
+			'68': face_landmark_68,
+			'68/5': face_landmark_68
+		},
+		angle = 0,
+		embedding = numpy.zeros(512),
+		normed_embedding = numpy.zeros(512),
+		gender = 'male',
+		age = range(20, 30),
+		race = 'asian'
+	)
+
+
+def classify_crop(crop_vision_frame : VisionFrame) -> Tuple[Gender, Age, Race]:
+	return 'male', range(20, 30), 'asian'
+
+
+def test_create_frame_key() -> None:
+	vision_frame = numpy.full((64, 64, 3), 128, dtype = numpy.uint8)
+
+	assert create_frame_hash(numpy.zeros((64, 64, 3), dtype = numpy.uint8)) is None
+	assert create_frame_hash(vision_frame) == create_frame_hash(vision_frame.copy())
+	assert create_frame_hash(vision_frame) != create_frame_hash(numpy.full((32, 128, 3), 128, dtype = numpy.uint8))
+	assert create_frame_key(vision_frame) == create_frame_hash(vision_frame)
+
+	set_frame_context(create_frame_context(vision_frame, 7))
+	frame_key = create_frame_key(vision_frame)
+
+	assert frame_key.startswith('target.mp4|')
+	assert frame_key.endswith('#7')
+
+	state_manager.init_item('trim_frame_start', 10)
+
+	assert create_frame_key(vision_frame) != frame_key
+
+	state_manager.init_item('trim_frame_start', None)
+	state_manager.init_item('face_detector_score', 0.7)
+
+	assert create_frame_key(vision_frame) != frame_key
+
+	state_manager.init_item('face_detector_score', None)
+
+
+def test_static_faces() -> None:
+	vision_frame = numpy.full((64, 64, 3), 128, dtype = numpy.uint8)
+	faces = [ create_face() ]
+
+	assert get_static_faces(vision_frame) is None
+
+	set_static_faces(vision_frame, faces)
+
+	assert get_static_faces(vision_frame) is faces
+	assert get_face_store_statistics() ==\
+	{
+		'hits': 1,
+		'misses': 1,
+		'evictions': 0
+	}
+	assert create_face_store_statistics(get_face_store(), get_face_store_statistics()).get('face_store_hit_rate') == 0.5
+
+
+def test_evict_static_faces() -> None:
+	vision_frames = [ numpy.full((512, 512, 3), index + 1, dtype = numpy.uint8) for index in range(3) ]
+	faces = [ create_face() ]
+	faces[0].face_analysis['classify_face'] = partial(classify_crop, numpy.zeros((512, 512, 3), dtype = numpy.uint8))
+
+	state_manager.init_item('face_store_memory_limit', 2)
+	set_static_faces(vision_frames[0], faces)
+	set_static_faces(vision_frames[1], faces)
+	get_static_faces(vision_frames[0])
+	set_static_faces(vision_frames[2], faces)
+
+	assert get_static_faces(vision_frames[0]) is faces
+	assert get_static_faces(vision_frames[1]) is None
+	assert get_static_faces(vision_frames[2]) is faces
+	assert get_face_store_statistics().get('evictions') == 1
@@ -0,0 +1,68 @@
+from typing import Optional
+
+import numpy
+import pytest
+
+from facefusion import state_manager
+from facefusion.processors.modules.face_swapper import find_reference_faces, split_face_passes
+from facefusion.typing import Embedding, Face
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('download_providers', [ 'github' ])
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('face_swapper_model', 'inswapper_128')
+	state_manager.init_item('face_swapper_pixel_boost', '256x256')
+	state_manager.init_item('reference_face_distance', 0.5)
+
+
+def create_face(offset_x : float, offset_y : float, normed_embedding : Optional[Embedding] = None) -> Face:
+	face_landmark_5 = numpy.array([ [ 40, 50 ], [ 88, 50 ], [ 64, 75 ], [ 45, 100 ], [ 83, 100 ] ], dtype = numpy.float32) + [ offset_x, offset_y ]
+	return Face(
+		bounding_box = numpy.array([ 20, 20, 108, 128 ]) + [ offset_x, offset_y ] * 2,
+		score_set =
+		{
+			'detector': 0.75,
+			'landmarker': 0.5
+		},
+		landmark_set =
+		{
+			'5': face_landmark_5,
+			'5/68': face_landmark_5,
+			'68': numpy.zeros((68, 2)),
+			'68/5': numpy.zeros((68, 2))
+		},
+		angle = 0,
+		embedding = numpy.zeros(512),
+		normed_embedding = numpy.zeros(512) if normed_embedding is None else normed_embedding,
+		gender = 'male',
+		age = range(20, 30),
+		race = 'asian'
+	)
+
+
+def test_split_face_passes() -> None:
+	faces = [ create_face(0, 0), create_face(400, 0), create_face(60, 0), create_face(800, 400) ]
+
+	assert split_face_passes([]) == []
+	assert split_face_passes(faces[:2]) == [ faces[:2] ]
+	assert split_face_passes(faces) == [ faces[:2], faces[2:] ]
+
+
+def test_find_reference_faces() -> None:
+	faces = [ create_face(0, 0, numpy.eye(512)[0]), create_face(400, 0, numpy.eye(512)[1]) ]
+	reference_faces =\
+	{
+		'origin': [ faces[0] ],
+		'face_swapper': [ faces[1] ]
+	}
+	state_manager.init_item('reference_face_pairs', [ (0, 0) ])
+
+	assert find_reference_faces(faces, reference_faces) == [ faces[0] ]
+
+	state_manager.init_item('reference_face_pairs', [ (0, 0), (10, 1) ])
+
+	assert find_reference_faces(faces, reference_faces) == faces
+
+	state_manager.init_item('reference_face_pairs', None)
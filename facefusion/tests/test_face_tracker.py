@@ -0,0 +1,148 @@
+from typing import Tuple
+
+import cv2
+import numpy
+import pytest
+
+from facefusion import face_tracker, state_manager
+from facefusion.face_selector import calc_face_distances
+from facefusion.face_tracker import FACE_TRACK_DISTANCE_LIMIT, clear_face_tracks, create_reference_faces_key, create_track_distance_key, get_track_distances, set_track_distances, start_face_track, track_faces
+from facefusion.frame_context import clear_frame_context, create_frame_context, get_frame_number, set_frame_context, update_frame_context
+from facefusion.typing import Embedding, Face, VisionFrame
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('face_tracker_interval', 4)
+	state_manager.init_item('face_tracker_score', 0.5)
+	state_manager.init_item('face_landmarker_score', 0.5)
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_face_tracks()
+	clear_frame_context()
+
+
+def create_vision_frame(seed : int) -> VisionFrame:
+	noise_frame = numpy.random.RandomState(seed).rand(256, 256, 3) * 255
+	return cv2.GaussianBlur(noise_frame, (0, 0), 2).astype(numpy.uint8)
+
+
+def create_face() -> Face:
+	face_landmark_5 = numpy.array([ [ 110, 115 ], [ 146, 115 ], [ 128, 130 ], [ 112, 150 ], [ 144, 150 ] ], dtype = numpy.float32)
+	face_landmark_68 = numpy.stack(numpy.meshgrid(numpy.linspace(96, 160, 17), numpy.linspace(100, 160, 4)), axis = -1).reshape(-1, 2)[:68].astype(numpy.float32)
+	normed_embedding = numpy.ones(512) / numpy.sqrt(512)
+	return Face(
+		bounding_box = numpy.array([ 88, 88, 168, 168 ], dtype = numpy.float32),
+		score_set =
+		{
+			'detector': 0.75,
+			'landmarker': 0.0
+		},
+		landmark_set =
+		{
+			'5': face_landmark_5,
+			'5/68': face_landmark_5,
+			'68': face_landmark_68,
+			'68/5': face_landmark_68
+		},
+		angle = 0,
+		embedding = normed_embedding,
+		normed_embedding = normed_embedding,
+		gender = 'male',
+		age = range(20, 30),
+		race = 'asian'
+	)
+
+
+def track_vision_frame(vision_frame : VisionFrame, frame_number : int) -> VisionFrame:
+	set_frame_context(create_frame_context(vision_frame, frame_number))
+	return vision_frame
+
+
+def test_track_faces() -> None:
+	vision_frame = track_vision_frame(create_vision_frame(0), 0)
+	faces = start_face_track(vision_frame, [ create_face() ])
+
+	assert faces[0].track_id is not None
+
+	for frame_number in range(1, 4):
+		vision_frame = track_vision_frame(numpy.roll(create_vision_frame(0), (2 * frame_number, 3 * frame_number), axis = (0, 1)), frame_number)
+		track_faces_result = track_faces(vision_frame)
+
+		assert track_faces_result
+		assert track_faces_result[0].track_id == faces[0].track_id
+		assert numpy.allclose(track_faces_result[0].bounding_box, faces[0].bounding_box + [ 3 * frame_number, 2 * frame_number ] * 2, atol = 1)
+		assert numpy.allclose(track_faces_result[0].landmark_set.get('5'), faces[0].landmark_set.get('5') + [ 3 * frame_number, 2 * frame_number ], atol = 1)
+
+	assert track_faces(track_vision_frame(create_vision_frame(0), 4)) is None
+
+
+def test_track_faces_scene_cut() -> None:
+	start_face_track(track_vision_frame(create_vision_frame(0), 0), [ create_face() ])
+
+	assert track_faces(track_vision_frame(create_vision_frame(1) // 4, 1)) is None
+	assert track_faces(track_vision_frame(create_vision_frame(0), 3)) is None
+
+
+def test_track_faces_without_frame_number() -> None:
+	vision_frame = create_vision_frame(0)
+	faces = start_face_track(vision_frame, [ create_face() ])
+
+	assert faces[0].track_id is None
+	assert track_faces(vision_frame) is None
+
+	frame_context = create_frame_context(vision_frame, 0)
+	set_frame_context(frame_context)
+
+	assert get_frame_number(vision_frame) == 0
+
+	update_frame_context(frame_context, vision_frame.copy(), 'invalidate')
+
+	assert frame_context.get('frame_number') is None
+
+
+def test_track_distances() -> None:
+	face = start_face_track(track_vision_frame(create_vision_frame(0), 0), [ create_face() ])[0]
+	reference_faces = { 'reference': [ create_face() ] }
+	track_distance_key = create_track_distance_key(face, create_reference_faces_key(reference_faces))
+
+	assert get_track_distances(track_distance_key) is None
+	assert numpy.allclose(calc_face_distances([ face ], reference_faces), [ [ 0 ] ])
+	assert numpy.allclose(get_track_distances(track_distance_key), [ 0 ])
+	assert create_track_distance_key(face, create_reference_faces_key({ 'reference': [ create_face() ] })) == track_distance_key
+
+	reference_faces['reference'].append(create_face())
+
+	assert create_track_distance_key(face, create_reference_faces_key(reference_faces)) != track_distance_key
+
+	for track_id in range(FACE_TRACK_DISTANCE_LIMIT * 2):
+		set_track_distances((track_id, 'reference'), numpy.zeros(1))
+
+	assert len(face_tracker.FACE_TRACK_DISTANCES) == FACE_TRACK_DISTANCE_LIMIT
+	assert get_track_distances((0, 'reference')) is None
+	assert get_track_distances((FACE_TRACK_DISTANCE_LIMIT * 2 - 1, 'reference')) is not None
+
+	clear_face_tracks()
+
+
+def test_share_face_analysis() -> None:
+	face = create_face()
+	calc_totals = []
+
+	def calc_embedding() -> Tuple[Embedding, Embedding]:
+		calc_totals.append(1)
+		return numpy.zeros(512), numpy.zeros(512)
+
+	face.face_analysis['embedding'] = None
+	face.face_analysis['calc_embedding'] = calc_embedding
+	track_face = start_face_track(track_vision_frame(create_vision_frame(0), 0), [ face ])[0]
+	track_face_result = track_faces(track_vision_frame(create_vision_frame(0), 1))
+
+	assert track_face_result
+	assert track_face_result[0].embedding.shape == (512,)
+	assert track_face.embedding is track_face_result[0].embedding
+	assert face.embedding is track_face.embedding
+	assert calc_totals == [ 1 ]
@@ -5,7 +5,7 @@ import pytest
 
 from facefusion import process_manager, state_manager
 from facefusion.download import conditional_download
-from facefusion.ffmpeg import concat_video, extract_frames, read_audio_buffer, replace_audio, restore_audio
+from facefusion.ffmpeg import concat_video, extract_frames, open_video_decoder, read_audio_buffer, read_video_frames, replace_audio, restore_audio
 from facefusion.filesystem import copy_file
 from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_file_path, get_temp_frame_paths
 from .helper import get_test_example_file, get_test_examples_directory, get_test_output_file, prepare_test_output_directory
@@ -62,6 +62,24 @@ def test_extract_frames() -> None:
 		clear_temp_directory(target_path)
 
 
+def test_read_video_frames() -> None:
+	stream_set =\
+	[
+		(get_test_example_file('target-240p-25fps.mp4'), 0, 270, 324),
+		(get_test_example_file('target-240p-25fps.mp4'), 224, 270, 55),
+		(get_test_example_file('target-240p-30fps.mp4'), 124, 224, 100),
+		(get_test_example_file('target-240p-60fps.mp4'), 0, 100, 50)
+	]
+
+	for target_path, trim_frame_start, trim_frame_end, frame_total in stream_set:
+		decoder_process = open_video_decoder(target_path, '452x240', 30.0, trim_frame_start, trim_frame_end)
+		vision_frames = list(read_video_frames(decoder_process, '452x240'))
+
+		assert len(vision_frames) == frame_total
+		assert vision_frames[0].shape == (240, 452, 3)
+		assert decoder_process.wait() == 0
+
+
 def test_concat_video() -> None:
 	output_path = get_test_output_file('test-concat-video.mp4')
 	temp_output_paths =\
@@ -0,0 +1,89 @@
+import numpy
+
+from facefusion.face_helper import estimate_matrix_by_face_landmark_5
+from facefusion.frame_context import clear_frame_context, create_frame_context, get_frame_faces, set_frame_context, set_frame_faces, update_frame_context
+from facefusion.typing import Face
+
+
+def create_face() -> Face:
+	face_landmark_5 = numpy.array([ [ 40, 50 ], [ 80, 50 ], [ 60, 70 ], [ 45, 90 ], [ 75, 90 ] ], dtype = numpy.float32)
+	return Face(
+		bounding_box = numpy.array([ 20, 20, 100, 120 ]),
+		score_set =
+		{
+			'detector': 0.75,
+			'landmarker': 0.5
+		},
+		landmark_set =
+		{
+			'5': face_landmark_5,
+			'5/68': face_landmark_5,
+			'68': numpy.zeros((68, 2)),
+			'68/5': numpy.zeros((68, 2))
+		},
+		angle = 0,
+		embedding = numpy.zeros(512),
+		normed_embedding = numpy.zeros(512),
+		gender = 'male',
+		age = range(20, 30),
+		race = 'asian'
+	)
+
+
+def test_frame_faces() -> None:
+	vision_frame = numpy.zeros((128, 128, 3), dtype = numpy.uint8)
+	faces = [ create_face() ]
+
+	assert set_frame_faces(vision_frame, faces) is False
+
+	set_frame_context(create_frame_context(vision_frame))
+
+	assert set_frame_faces(vision_frame, faces) is True
+	assert get_frame_faces(vision_frame) is faces
+	assert get_frame_faces(vision_frame.copy()) is None
+
+	clear_frame_context()
+
+	assert get_frame_faces(vision_frame) is None
+
+
+def test_update_frame_context() -> None:
+	vision_frame = numpy.zeros((128, 128, 3), dtype = numpy.uint8)
+	faces = [ create_face() ]
+	frame_context = create_frame_context(vision_frame)
+	set_frame_context(frame_context)
+	set_frame_faces(vision_frame, faces)
+
+	keep_vision_frame = vision_frame.copy()
+	update_frame_context(frame_context, keep_vision_frame, 'keep')
+
+	assert get_frame_faces(keep_vision_frame) is faces
+
+	invalidate_vision_frame = keep_vision_frame.copy()
+	update_frame_context(frame_context, invalidate_vision_frame, 'invalidate')
+
+	assert get_frame_faces(invalidate_vision_frame) is None
+
+	set_frame_faces(invalidate_vision_frame, faces)
+	resize_vision_frame = numpy.zeros((256, 256, 3), dtype = numpy.uint8)
+	update_frame_context(frame_context, resize_vision_frame, 'keep')
+
+	assert get_frame_faces(resize_vision_frame) is None
+
+	clear_frame_context()
+
+
+def test_frame_context_matrices() -> None:
+	vision_frame = numpy.zeros((128, 128, 3), dtype = numpy.uint8)
+	face = create_face()
+	frame_context = create_frame_context(vision_frame)
+	set_frame_context(frame_context)
+	set_frame_faces(vision_frame, [ face ])
+
+	affine_matrix = estimate_matrix_by_face_landmark_5(face.landmark_set.get('5/68'), 'arcface_128_v2', (128, 128))
+
+	assert len(frame_context.get('matrices')) == 1
+	assert estimate_matrix_by_face_landmark_5(face.landmark_set.get('5/68'), 'arcface_128_v2', (128, 128)) is affine_matrix
+	assert estimate_matrix_by_face_landmark_5(face.landmark_set.get('5/68').copy(), 'arcface_128_v2', (128, 128)) is not affine_matrix
+
+	clear_frame_context()
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy
+
+from facefusion.inference_batcher import InferenceBatcher
+
+
+class FakeInferenceSession:
+	def __init__(self, batch_shape : Any, has_batch_outputs : bool = True) -> None:
+		self.batch_shape = batch_shape
+		self.has_batch_outputs = has_batch_outputs
+		self.batch_totals : List[int] = []
+
+	def get_inputs(self) -> List[SimpleNamespace]:
+		return [ SimpleNamespace(name = 'input', shape = [ self.batch_shape, 3 ]) ]
+
+	def run(self, output_names : Optional[List[str]], input_feed : Dict[str, Any], run_options : Any = None) -> List[Any]:
+		self.batch_totals.append(len(input_feed.get('input')))
+		if self.has_batch_outputs:
+			return [ input_feed.get('input') * 2 ]
+		return [ numpy.sum(input_feed.get('input'), axis = 0) * 2 ]
+
+
+def test_run_batched() -> None:
+	inference_session = FakeInferenceSession('batch')
+	inference_batcher = InferenceBatcher(inference_session, 8, 0.1, 8) #type:ignore[arg-type]
+	input_values = [ numpy.full((1, 3), index, dtype = numpy.float32) for index in range(8) ]
+
+	with ThreadPoolExecutor(max_workers = 8) as executor:
+		outputs = list(executor.map(lambda input_value : inference_batcher.run(None, { 'input': input_value }), input_values))
+
+	for input_value, output in zip(input_values, outputs):
+		assert numpy.array_equal(output[0], input_value * 2)
+	assert sum(inference_session.batch_totals) == 8
+	assert len(inference_session.batch_totals) < 8
+
+
+def test_run_fixed_batch() -> None:
+	inference_session = FakeInferenceSession(1)
+	inference_batcher = InferenceBatcher(inference_session, 8, 0.1, 8) #type:ignore[arg-type]
+	input_value = numpy.ones((1, 3), dtype = numpy.float32)
+
+	assert numpy.array_equal(inference_batcher.run(None, { 'input': input_value })[0], input_value * 2)
+	assert inference_session.batch_totals == [ 1 ]
+	assert inference_batcher.get_inputs()[0].shape == [ 1, 3 ]
+
+
+def test_run_without_batch_outputs() -> None:
+	inference_session = FakeInferenceSession('batch', False)
+	inference_batcher = InferenceBatcher(inference_session, 8, 0.1, 8) #type:ignore[arg-type]
+	input_values = [ numpy.full((1, 3), index, dtype = numpy.float32) for index in range(8) ]
+
+	for _ in range(2):
+		with ThreadPoolExecutor(max_workers = 8) as executor:
+			outputs = list(executor.map(lambda input_value : inference_batcher.run(None, { 'input': input_value }), input_values))
+
+		for input_value, output in zip(input_values, outputs):
+			assert numpy.array_equal(output[0], input_value[0] * 2)
+
+	assert inference_batcher.has_batch_outputs is False
+	assert inference_session.batch_totals.count(1) == 16
+	assert sum(batch_total > 1 for batch_total in inference_session.batch_totals) == 1
+
+
+def test_run_single_thread() -> None:
+	inference_session = FakeInferenceSession('batch')
+	inference_batcher = InferenceBatcher(inference_session, 8, 10, 1) #type:ignore[arg-type]
+	input_value = numpy.ones((1, 3), dtype = numpy.float32)
+	start_time = perf_counter()
+
+	assert numpy.array_equal(inference_batcher.run(None, { 'input': input_value })[0], input_value * 2)
+	assert perf_counter() - start_time < 1
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+import pytest
+from onnx import helper
+from onnxruntime import InferenceSession
+
+from facefusion.inference_binder import IO_BINDING_RUN_OPTIONS, InferenceBinder
+from .helper import create_test_model, get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	prepare_test_output_directory()
+	create_test_model(get_test_output_file('relu.onnx'), [ helper.make_node('Relu', [ 'input' ], [ 'output' ]) ], [ 'batch', 4 ], [ 'batch', 4 ])
+
+
+def test_run_bound() -> None:
+	inference_binder = InferenceBinder(InferenceSession(get_test_output_file('relu.onnx'), providers = [ 'CPUExecutionProvider' ]))
+	outputs = []
+
+	for input_value in [ [ [ -1, 2, -3, 4 ] ], [ [ 5, -6, 7, -8 ] ] ]:
+		output = inference_binder.run(None, { 'input': numpy.array(input_value, dtype = numpy.float64) }, IO_BINDING_RUN_OPTIONS)[0]
+		outputs.append(output)
+
+		assert output.tolist() == numpy.maximum(input_value, 0).tolist()
+	assert outputs[0] is outputs[1]
+
+	output = inference_binder.run(None, { 'input': numpy.ones((2, 4), dtype = numpy.float32) }, IO_BINDING_RUN_OPTIONS)[0]
+
+	assert output.shape == (2, 4)
+	assert inference_binder.run(None, { 'input': numpy.ones((1, 4), dtype = numpy.float32) })[0] is not outputs[0]
+
+
+def test_run_bound_per_thread() -> None:
+	inference_binder = InferenceBinder(InferenceSession(get_test_output_file('relu.onnx'), providers = [ 'CPUExecutionProvider' ]))
+
+	def run_bound(index : int) -> bool:
+		for _ in range(20):
+			input_value = numpy.full((1, 4), index, dtype = numpy.float32)
+			output = inference_binder.run(None, { 'input': input_value }, IO_BINDING_RUN_OPTIONS)[0]
+
+			if not numpy.array_equal(output, input_value):
+				return False
+		return True
+
+	with ThreadPoolExecutor(max_workers = 4) as executor:
+		assert all(executor.map(run_bound, range(4)))
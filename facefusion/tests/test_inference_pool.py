@@ -1,10 +1,10 @@
 from unittest.mock import patch
 
 import pytest
-from onnxruntime import InferenceSession
 
 from facefusion import content_analyser, state_manager
 from facefusion.inference_manager import INFERENCE_POOLS, get_inference_pool
+from facefusion.inference_profiler import InferenceProfiler
 
 
 @pytest.fixture(scope = 'module', autouse = True)
@@ -21,11 +21,11 @@ def test_get_inference_pool() -> None:
 	with patch('facefusion.inference_manager.detect_app_context', return_value = 'cli'):
 		get_inference_pool('test', model_sources)
 
-		assert isinstance(INFERENCE_POOLS.get('cli').get('test.cpu').get('content_analyser'), InferenceSession)
+		assert isinstance(INFERENCE_POOLS.get('cli').get('test.cpu').get('content_analyser'), InferenceProfiler)
 
 	with patch('facefusion.inference_manager.detect_app_context', return_value = 'ui'):
 		get_inference_pool('test', model_sources)
 
-		assert isinstance(INFERENCE_POOLS.get('ui').get('test.cpu').get('content_analyser'), InferenceSession)
+		assert isinstance(INFERENCE_POOLS.get('ui').get('test.cpu').get('content_analyser'), InferenceProfiler)
 
 	assert INFERENCE_POOLS.get('cli').get('test.cpu').get('content_analyser') == INFERENCE_POOLS.get('ui').get('test.cpu').get('content_analyser')
@@ -0,0 +1,53 @@
+import numpy
+import pytest
+from onnx import helper
+from onnxruntime import InferenceSession
+
+from facefusion.inference_binder import InferenceBinder
+from facefusion.inference_profiler import InferenceProfiler, calc_histogram_percentile, clear_inference_profiles, create_histogram, get_inference_profiles, update_histogram
+from facefusion.statistics import create_inference_statistics
+from .helper import create_test_model, get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	prepare_test_output_directory()
+	create_test_model(get_test_output_file('relu.onnx'), [ helper.make_node('Relu', [ 'input' ], [ 'output' ]) ], [ 'batch', 4 ], [ 'batch', 4 ])
+
+
+def test_record_inference() -> None:
+	clear_inference_profiles()
+	inference_profiler = InferenceProfiler(InferenceBinder(InferenceSession(get_test_output_file('relu.onnx'), providers = [ 'CPUExecutionProvider' ])), 'test.relu') #type:ignore[arg-type]
+
+	for batch_total in [ 1, 2, 3 ]:
+		assert inference_profiler.run(None, { 'input': numpy.ones((batch_total, 4), dtype = numpy.float32) })[0].shape == (batch_total, 4)
+
+	inference_profile = get_inference_profiles().get('test.relu')
+
+	assert inference_profile.get('call_total') == 3
+	assert inference_profile.get('batch_total') == 6
+	assert inference_profile.get('queue_wait').get('total') == 3
+	assert inference_profile.get('run_time').get('total') == 3
+
+	inference_statistics = create_inference_statistics(get_inference_profiles()).get('test.relu')
+
+	assert inference_statistics.get('total_calls') == 3
+	assert inference_statistics.get('average_batch_size') == 2
+	assert inference_statistics.get('run_time').get('max_ms') > 0
+
+	clear_inference_profiles()
+
+	assert get_inference_profiles() == {}
+
+
+def test_calc_histogram_percentile() -> None:
+	inference_histogram = create_histogram()
+
+	assert calc_histogram_percentile(inference_histogram, 0.5) == 0
+
+	for value in [ 0.001 ] * 90 + [ 0.1 ] * 10:
+		update_histogram(inference_histogram, value)
+
+	assert 0.001 <= calc_histogram_percentile(inference_histogram, 0.5) < 0.002
+	assert 0.1 <= calc_histogram_percentile(inference_histogram, 0.99) < 0.2
+	assert calc_histogram_percentile(inference_histogram, 1) == 0.1
@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy
+import pytest
+from onnx import helper
+from onnxruntime import ExecutionMode
+
+from facefusion import inference_manager, state_manager
+from facefusion.filesystem import is_file, remove_file
+from facefusion.inference_manager import calc_inference_pool_footprint, calc_replica_count, clear_inference_pool, create_dummy_input_feed, create_inference_devices, create_inference_pool, create_inference_replicas, create_inference_session, create_session_options, evict_inference_pools, get_cpu_cores, get_inference_pool, get_optimized_model_path, get_temp_optimized_model_path, measure_inference_latency, split_cpu_cores, warm_up_inference_session
+from facefusion.inference_replicas import InferenceReplicas
+from facefusion.inference_scheduler import InferenceScheduler
+from .helper import create_test_model, get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('execution_mode', 'sequential')
+	state_manager.init_item('execution_graph_optimization', 'all')
+	state_manager.init_item('video_memory_strategy', 'strict')
+	prepare_test_output_directory()
+	create_test_model(get_test_output_file('relu.onnx'), [ helper.make_node('Relu', [ 'input' ], [ 'output' ]) ], [ 'batch', 4 ], [ 'batch', 4 ])
+
+
+def test_create_session_options() -> None:
+	session_options = create_session_options()
+
+	assert session_options.execution_mode == ExecutionMode.ORT_SEQUENTIAL
+	assert session_options.inter_op_num_threads == 1
+	assert session_options.enable_cpu_mem_arena is False
+
+	state_manager.init_item('execution_mode', 'parallel')
+	session_options = create_session_options()
+
+	assert session_options.execution_mode == ExecutionMode.ORT_PARALLEL
+
+	state_manager.init_item('execution_mode', 'sequential')
+
+
+def test_create_inference_session_with_optimized_model() -> None:
+	model_path = get_test_output_file('relu.onnx')
+	optimized_model_path = get_optimized_model_path(model_path, [ 'cpu' ])
+	remove_file(optimized_model_path)
+
+	assert get_optimized_model_path(model_path, [ 'cuda' ]) is None
+
+	with patch('facefusion.inference_manager.detect_static_cpu_identity', return_value = 'other'):
+		assert get_optimized_model_path(model_path, [ 'cpu' ]) != optimized_model_path
+
+	for _ in range(2):
+		inference_session = create_inference_session(model_path, '0', [ 'cpu' ])
+		output = inference_session.run(None, { 'input': numpy.array([ [ -1, 2, -3, 4 ] ], dtype = numpy.float32) })[0]
+
+		assert is_file(optimized_model_path)
+		assert not is_file(get_temp_optimized_model_path(optimized_model_path))
+		assert output.tolist() == [ [ 0, 2, 0, 4 ] ]
+
+	remove_file(optimized_model_path)
+
+
+def test_split_cpu_cores() -> None:
+	cpu_cores = get_cpu_cores()
+	replica_cores = split_cpu_cores(cpu_cores, 2)
+
+	assert len(replica_cores) == 2
+	assert split_cpu_cores([ 0, 1, 2, 3, 4 ], 2) == [ [ 0, 1 ], [ 2, 3, 4 ] ]
+	assert split_cpu_cores([ 0 ], 2) == [ [ 0 ], [ 0 ] ]
+
+
+def test_create_inference_replicas() -> None:
+	model_path = get_test_output_file('relu.onnx')
+	inference_session = create_inference_session(model_path, '0', [ 'cpu' ])
+
+	assert measure_inference_latency(inference_session) is not None
+	assert calc_replica_count(model_path, [ 'cuda' ], 4, None) == 1
+
+	state_manager.init_item('video_memory_strategy', 'tolerant')
+
+	assert calc_replica_count(model_path, [ 'cpu' ], 16, 0.01) == 4
+	assert calc_replica_count(model_path, [ 'cpu' ], 16, 0.1) == 4
+	assert calc_replica_count(model_path, [ 'cpu' ], 8, 0.1) == 2
+
+	state_manager.init_item('inference_memory_limit', 1)
+
+	with open(get_test_output_file('large.onnx'), 'wb') as model_file:
+		model_file.truncate(400 * 1024 ** 2)
+
+	assert calc_replica_count(get_test_output_file('large.onnx'), [ 'cpu' ], 16, 0.01) == 2
+
+	remove_file(get_test_output_file('large.onnx'))
+	state_manager.init_item('inference_memory_limit', 0)
+	inference_replicas = create_inference_replicas(model_path, '0', [ 'cpu' ])
+
+	if len(get_cpu_cores()) > 1:
+		assert isinstance(inference_replicas, InferenceReplicas)
+	assert inference_replicas.run(None, { 'input': numpy.array([ [ -1, 2, -3, 4 ] ], dtype = numpy.float32) })[0].tolist() == [ [ 0, 2, 0, 4 ] ]
+
+	state_manager.init_item('video_memory_strategy', 'strict')
+
+	state_manager.init_item('execution_replica_count', 2)
+	inference_replicas = create_inference_replicas(model_path, '0', [ 'cpu' ])
+
+	if len(get_cpu_cores()) > 1:
+		assert isinstance(inference_replicas, InferenceReplicas)
+	assert inference_replicas.get_inputs()[0].name == 'input'
+	assert inference_replicas.run(None, { 'input': numpy.array([ [ -1, 2, -3, 4 ] ], dtype = numpy.float32) })[0].tolist() == [ [ 0, 2, 0, 4 ] ]
+
+	state_manager.init_item('execution_replica_count', 0)
+	remove_file(get_optimized_model_path(model_path, [ 'cpu' ]))
+
+
+def test_create_inference_devices() -> None:
+	model_path = get_test_output_file('relu.onnx')
+	inference_scheduler = create_inference_devices(model_path, [ '0', '1' ], [ 'cpu' ])
+
+	assert isinstance(inference_scheduler, InferenceScheduler)
+	assert inference_scheduler.execution_device_ids == [ '0', '1' ]
+	assert len(inference_scheduler.inference_sessions) == 2
+	assert inference_scheduler.run(None, { 'input': numpy.array([ [ -1, 2, -3, 4 ] ], dtype = numpy.float32) })[0].tolist() == [ [ 0, 2, 0, 4 ] ]
+	assert inference_scheduler.inference_loads == [ 0, 0 ]
+
+	remove_file(get_optimized_model_path(model_path, [ 'cpu' ]))
+
+
+def test_route_to_least_loaded_device() -> None:
+	inference_scheduler = InferenceScheduler([], [ '0', '1', '2' ])
+	inference_scheduler.inference_loads = [ 0, 0, 0 ]
+
+	assert [ inference_scheduler.acquire_session() for _ in range(4) ] == [ 0, 1, 2, 0 ]
+
+	inference_scheduler.release_session(1)
+
+	assert inference_scheduler.acquire_session() == 1
+
+
+def test_evict_inference_pools() -> None:
+	model_path = get_test_output_file('relu.onnx')
+	inference_pool = create_inference_pool('relu', { 'relu': { 'url': '', 'path': model_path } }, [ '0', '1' ], [ 'cpu' ])
+
+	assert calc_inference_pool_footprint({ 'relu': { 'url': '', 'path': model_path } }, inference_pool) > 0
+
+	state_manager.init_item('inference_memory_limit', 1)
+	for inference_context, used_at in [ ('first', 1), ('second', 3), ('third', 2) ]:
+		inference_manager.INFERENCE_POOLS['cli'][inference_context] = inference_pool
+		inference_manager.INFERENCE_POOL_USAGES[inference_context] =\
+		{
+			'footprint': 512 * 1024 ** 2,
+			'used_at': used_at
+		}
+	evict_inference_pools('first')
+
+	assert list(inference_manager.INFERENCE_POOL_USAGES.keys()) == [ 'first', 'second' ]
+	assert 'third' not in inference_manager.INFERENCE_POOLS.get('cli')
+
+	clear_inference_pool('first')
+
+	assert 'first' in inference_manager.INFERENCE_POOL_USAGES
+
+	state_manager.init_item('inference_memory_limit', 0)
+	for inference_context in [ 'first', 'second' ]:
+		inference_manager.INFERENCE_POOLS['cli'].pop(inference_context)
+		inference_manager.INFERENCE_POOL_USAGES.pop(inference_context)
+	remove_file(get_optimized_model_path(model_path, [ 'cpu' ]))
+
+
+def test_warm_up_inference_pool() -> None:
+	model_path = get_test_output_file('relu.onnx')
+	state_manager.init_item('execution_device_id', '0')
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('execution_batch_size', 1)
+
+	with ThreadPoolExecutor(max_workers = 4) as executor:
+		inference_pools = list(executor.map(lambda _ : get_inference_pool('relu', { 'relu': { 'url': '', 'path': model_path } }), range(4)))
+
+	assert all(inference_pool is inference_pools[0] for inference_pool in inference_pools)
+	assert create_dummy_input_feed(inference_pools[0].get('relu')).get('input').shape == (1, 4)
+	assert warm_up_inference_session(inference_pools[0].get('relu')) is True
+	assert warm_up_inference_session(create_inference_devices(model_path, [ '0', '1' ], [ 'cpu' ])) is True
+
+	clear_inference_pool('relu')
+	remove_file(get_optimized_model_path(model_path, [ 'cpu' ]))
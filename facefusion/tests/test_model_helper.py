@@ -0,0 +1,93 @@
+from time import perf_counter
+
+import numpy
+import pytest
+from onnx import helper, numpy_helper
+from onnxruntime import InferenceSession
+
+from facefusion import state_manager
+from facefusion.filesystem import is_file
+from facefusion.hash_helper import get_hash_path, validate_hash
+from facefusion.inference_manager import resolve_model_path
+from facefusion.model_helper import conditional_dynamic_batch_model, conditional_quantize_model, get_dynamic_batch_model_path, get_quantized_model_path, has_dynamic_batch
+from .helper import create_test_model, get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	prepare_test_output_directory()
+	weight = numpy_helper.from_array(numpy.random.rand(64, 64).astype(numpy.float32), 'weight')
+	shape = numpy_helper.from_array(numpy.array([ 1, 64 ], dtype = numpy.int64), 'shape')
+	create_test_model(get_test_output_file('matmul.onnx'), [ helper.make_node('MatMul', [ 'input', 'weight' ], [ 'output' ]) ], [ 'batch', 64 ], [ 'batch', 64 ], [ weight ])
+	create_test_model(get_test_output_file('matmul_fixed.onnx'), [ helper.make_node('MatMul', [ 'input', 'weight' ], [ 'output' ]) ], [ 1, 64 ], [ 1, 64 ], [ weight ])
+	create_test_model(get_test_output_file('reshape_fixed.onnx'), [ helper.make_node('MatMul', [ 'input', 'weight' ], [ 'product' ]), helper.make_node('Reshape', [ 'product', 'shape' ], [ 'output' ]) ], [ 1, 64 ], [ 1, 64 ], [ weight, shape ])
+
+
+def test_get_quantized_model_path() -> None:
+	assert get_quantized_model_path('.assets/models/inswapper_128.onnx') == '.assets/models/inswapper_128_int8.onnx'
+
+
+def test_conditional_quantize_model() -> None:
+	model_path = get_test_output_file('matmul.onnx')
+	quantized_model_path = conditional_quantize_model(model_path)
+	input_value = numpy.random.rand(1, 64).astype(numpy.float32)
+
+	assert quantized_model_path == get_test_output_file('matmul_int8.onnx')
+	assert is_file(get_hash_path(quantized_model_path))
+	assert validate_hash(quantized_model_path)
+
+	output = InferenceSession(model_path, providers = [ 'CPUExecutionProvider' ]).run(None, { 'input': input_value })[0]
+	quantized_output = InferenceSession(quantized_model_path, providers = [ 'CPUExecutionProvider' ]).run(None, { 'input': input_value })[0]
+
+	assert numpy.abs(output - quantized_output).max() < numpy.abs(output).max() * 0.05
+
+
+def test_resolve_model_path() -> None:
+	model_path = get_test_output_file('matmul.onnx')
+	state_manager.init_item('execution_quantized_models', [ 'matmul_int8' ])
+
+	assert resolve_model_path(model_path, [ 'cpu' ]) == get_test_output_file('matmul_int8.onnx')
+	assert resolve_model_path(model_path, [ 'cuda' ]) == model_path
+
+	state_manager.init_item('execution_quantized_models', [])
+
+	assert resolve_model_path(model_path, [ 'cpu' ]) == model_path
+
+
+def test_conditional_dynamic_batch_model() -> None:
+	model_path = get_test_output_file('matmul_fixed.onnx')
+	dynamic_batch_model_path = conditional_dynamic_batch_model(model_path)
+	input_value = numpy.random.rand(3, 64).astype(numpy.float32)
+
+	assert has_dynamic_batch(get_test_output_file('matmul.onnx')) is True
+	assert conditional_dynamic_batch_model(get_test_output_file('matmul.onnx')) == get_test_output_file('matmul.onnx')
+	assert has_dynamic_batch(model_path) is False
+	assert dynamic_batch_model_path == get_dynamic_batch_model_path(model_path)
+	assert validate_hash(dynamic_batch_model_path)
+	assert has_dynamic_batch(dynamic_batch_model_path) is True
+	assert InferenceSession(dynamic_batch_model_path, providers = [ 'CPUExecutionProvider' ]).run(None, { 'input': input_value })[0].shape == (3, 64)
+	assert conditional_dynamic_batch_model(get_test_output_file('reshape_fixed.onnx')) is None
+	assert not is_file(get_dynamic_batch_model_path(get_test_output_file('reshape_fixed.onnx')))
+
+
+def test_benchmark_quantized_matmul() -> None:
+	weight = numpy_helper.from_array(numpy.random.rand(1024, 1024).astype(numpy.float32), 'weight')
+	create_test_model(get_test_output_file('matmul_large.onnx'), [ helper.make_node('MatMul', [ 'input', 'weight' ], [ 'output' ]) ], [ 'batch', 1024 ], [ 'batch', 1024 ], [ weight ])
+	input_feed = { 'input': numpy.random.rand(64, 1024).astype(numpy.float32) }
+
+	def benchmark_run(model_path : str) -> float:
+		inference_session = InferenceSession(model_path, providers = [ 'CPUExecutionProvider' ])
+		inference_session.run(None, input_feed)
+		run_times = []
+
+		for _ in range(32):
+			start_time = perf_counter()
+			inference_session.run(None, input_feed)
+			run_times.append(perf_counter() - start_time)
+		return float(numpy.median(run_times))
+
+	fp32_time = benchmark_run(get_test_output_file('matmul_large.onnx'))
+	quantized_time = benchmark_run(conditional_quantize_model(get_test_output_file('matmul_large.onnx')))
+
+	assert fp32_time > 0
+	assert quantized_time < fp32_time
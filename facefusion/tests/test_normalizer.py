@@ -1,4 +1,4 @@
-from facefusion.normalizer import normalize_fps, normalize_padding
+from facefusion.normalizer import normalize_fps, normalize_model_concurrency, normalize_padding, normalize_reference_face_pairs
 
 
 def test_normalize_padding() -> None:
@@ -14,3 +14,16 @@ def test_normalize_fps() -> None:
 	assert normalize_fps(25.0) == 25.0
 	assert normalize_fps(61.0) == 60.0
 	assert normalize_fps(None) is None
+
+
+def test_normalize_reference_face_pairs() -> None:
+	assert normalize_reference_face_pairs([ '107:0', '229:1' ]) == [ (107, 0), (229, 1) ]
+	assert normalize_reference_face_pairs([ '107' ]) == [ (107, 0) ]
+	assert normalize_reference_face_pairs([ 'invalid', '-1:0' ]) is None
+	assert normalize_reference_face_pairs(None) is None
+
+
+def test_normalize_model_concurrency() -> None:
+	assert normalize_model_concurrency([ 'face_detector:2', 'face_enhancer:1' ]) == { 'face_detector': 2, 'face_enhancer': 1 }
+	assert normalize_model_concurrency([ 'invalid:1', 'face_detector:-1' ]) is None
+	assert normalize_model_concurrency(None) is None
@@ -0,0 +1,126 @@
+import threading
+from time import sleep
+from types import SimpleNamespace
+from typing import Iterator, List
+
+import numpy
+import pytest
+
+from facefusion import process_manager, state_manager
+from facefusion.processors.core import calc_pick_total, create_frame_schedule, multi_process_frames, multi_process_stream, update_frame_latency
+from facefusion.typing import QueuePayload, UpdateProgress, VisionFrame
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('execution_queue_count', 1)
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('log_level', 'error')
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	process_manager.start()
+
+
+def test_calc_pick_total() -> None:
+	frame_schedule = create_frame_schedule(4)
+
+	assert calc_pick_total(frame_schedule, 100) == 1
+	assert calc_pick_total(frame_schedule, 0) == 1
+
+	update_frame_latency(frame_schedule, 0.01)
+
+	assert calc_pick_total(frame_schedule, 1000) == 50
+	assert calc_pick_total(frame_schedule, 100) == 12
+
+	update_frame_latency(frame_schedule, 1.99)
+
+	assert frame_schedule.get('frame_latency') == 1.0
+	assert calc_pick_total(frame_schedule, 1000) == 1
+
+
+def test_multi_process_frames_in_order() -> None:
+	temp_frame_paths = [ str(frame_number).zfill(4) + '.png' for frame_number in range(64) ]
+	processed_frame_numbers : List[int] = []
+	completed_frame_numbers : List[int] = []
+	processed_lock = threading.Lock()
+
+	def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+		for queue_payload in process_manager.manage(queue_payloads):
+			if queue_payload.get('frame_number') % 8 == 0:
+				sleep(0.05)
+			with processed_lock:
+				processed_frame_numbers.append(queue_payload.get('frame_number'))
+			update_progress(1)
+
+	multi_process_frames([], temp_frame_paths, process_frames, completed_frame_numbers.extend)
+
+	assert sorted(processed_frame_numbers) == list(range(64))
+	assert completed_frame_numbers == list(range(64))
+
+
+def test_multi_process_frames_stopping() -> None:
+	temp_frame_paths = [ str(frame_number).zfill(4) + '.png' for frame_number in range(64) ]
+	processed_frame_numbers : List[int] = []
+
+	def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+		for queue_payload in process_manager.manage(queue_payloads):
+			processed_frame_numbers.append(queue_payload.get('frame_number'))
+			if len(processed_frame_numbers) == 8:
+				process_manager.stop()
+			update_progress(1)
+
+	multi_process_frames([], temp_frame_paths, process_frames)
+
+	assert len(processed_frame_numbers) < 64
+
+	process_manager.end()
+
+
+def test_multi_process_stream_in_order() -> None:
+	read_frame_numbers : List[int] = []
+	written_frame_numbers : List[int] = []
+
+	def read_vision_frames() -> Iterator[VisionFrame]:
+		for frame_number in range(64):
+			read_frame_numbers.append(frame_number)
+			yield numpy.full((8, 8, 3), frame_number, dtype = numpy.uint8)
+
+	def process_vision_frame(source_paths : List[str], frame_number : int, vision_frame : VisionFrame) -> VisionFrame:
+		if frame_number % 8 == 0:
+			sleep(0.05)
+		return vision_frame + 1
+
+	def write_vision_frame(vision_frame : VisionFrame) -> None:
+		written_frame_numbers.append(int(vision_frame[0, 0, 0]) - 1)
+
+	processor_module = SimpleNamespace(__name__ = 'facefusion.processors.modules.face_debugger', process_vision_frame = process_vision_frame)
+	multi_process_stream([], [ processor_module ], read_vision_frames(), write_vision_frame, 64) #type:ignore[list-item]
+
+	assert read_frame_numbers == list(range(64))
+	assert written_frame_numbers == list(range(64))
+
+
+def test_multi_process_stream_broken_pipe() -> None:
+	read_frame_numbers : List[int] = []
+
+	def read_vision_frames() -> Iterator[VisionFrame]:
+		for frame_number in range(256):
+			read_frame_numbers.append(frame_number)
+			yield numpy.zeros((8, 8, 3), dtype = numpy.uint8)
+
+	def process_vision_frame(source_paths : List[str], frame_number : int, vision_frame : VisionFrame) -> VisionFrame:
+		sleep(0.001)
+		return vision_frame
+
+	def write_vision_frame(vision_frame : VisionFrame) -> None:
+		raise BrokenPipeError
+
+	processor_module = SimpleNamespace(__name__ = 'facefusion.processors.modules.face_debugger', process_vision_frame = process_vision_frame)
+
+	with pytest.raises(BrokenPipeError):
+		multi_process_stream([], [ processor_module ], read_vision_frames(), write_vision_frame, 256) #type:ignore[list-item]
+
+	assert len(read_frame_numbers) < 256
@@ -1,8 +1,8 @@
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 
 import pytest
 
-from facefusion.program_helper import find_argument_group, validate_actions
+from facefusion.program_helper import find_argument_group, validate_actions, validate_model_concurrency, validate_reference_face_pair
 
 
 def test_find_argument_group() -> None:
@@ -38,3 +38,37 @@ def test_validate_actions() -> None:
 			action.default = args[action.dest]
 
 	assert validate_actions(program) is False
+
+
+def test_validate_reference_face_pair() -> None:
+	program = ArgumentParser()
+	program.add_argument('--reference-face-pairs', type = validate_reference_face_pair, nargs = '+')
+
+	assert program.parse_args([ '--reference-face-pairs', '107:0', '229' ]).reference_face_pairs == [ '107:0', '229' ]
+
+	for reference_face_pair in [ 'invalid', '-1:0', '107:', '107:0:1' ]:
+		with pytest.raises(ArgumentTypeError):
+			validate_reference_face_pair(reference_face_pair)
+		with pytest.raises(SystemExit):
+			program.parse_args([ '--reference-face-pairs', reference_face_pair ])
+
+	program.set_defaults(reference_face_pairs = [ '107:0' ])
+
+	assert validate_actions(program) is True
+
+	program.set_defaults(reference_face_pairs = [ '107:0', 'invalid' ])
+
+	assert validate_actions(program) is False
+
+
+def test_validate_model_concurrency() -> None:
+	program = ArgumentParser()
+	program.add_argument('--execution-model-concurrency', type = validate_model_concurrency, nargs = '+')
+
+	assert program.parse_args([ '--execution-model-concurrency', 'face_detector:2', 'face_enhancer:1' ]).execution_model_concurrency == [ 'face_detector:2', 'face_enhancer:1' ]
+
+	for model_concurrency in [ 'invalid:1', 'face_detector', 'face_detector:', 'face_detector:-1' ]:
+		with pytest.raises(ArgumentTypeError):
+			validate_model_concurrency(model_concurrency)
+		with pytest.raises(SystemExit):
+			program.parse_args([ '--execution-model-concurrency', model_concurrency ])
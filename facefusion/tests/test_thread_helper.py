@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from facefusion import state_manager
+from facefusion.thread_helper import NULL_CONTEXT, THREAD_SEMAPHORE, conditional_model_semaphore, resolve_model_concurrency
+
+
+def test_resolve_model_concurrency() -> None:
+	state_manager.init_item('execution_concurrency', 0)
+	state_manager.init_item('execution_model_concurrency', None)
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+
+	assert resolve_model_concurrency('facefusion.face_detector') == 0
+	assert conditional_model_semaphore('facefusion.face_detector') is NULL_CONTEXT
+
+	state_manager.init_item('execution_providers', [ 'directml' ])
+
+	assert resolve_model_concurrency('facefusion.face_detector') == 1
+	assert conditional_model_semaphore('facefusion.face_detector') is THREAD_SEMAPHORE
+	assert conditional_model_semaphore('facefusion.processors.modules.face_enhancer') is THREAD_SEMAPHORE
+
+	state_manager.init_item('execution_concurrency', 2)
+
+	assert resolve_model_concurrency('facefusion.face_detector') == 2
+	assert conditional_model_semaphore('facefusion.face_detector') is conditional_model_semaphore('facefusion.face_detector')
+	assert conditional_model_semaphore('facefusion.face_detector') is not conditional_model_semaphore('facefusion.processors.modules.face_enhancer')
+
+	state_manager.init_item('execution_model_concurrency', { 'face_enhancer': 1 })
+
+	assert resolve_model_concurrency('facefusion.face_detector') == 2
+	assert resolve_model_concurrency('facefusion.processors.modules.face_enhancer') == 1
+
+	state_manager.init_item('execution_concurrency', 0)
+	state_manager.init_item('execution_model_concurrency', None)
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+
+
+def test_limit_model_concurrency() -> None:
+	state_manager.init_item('execution_concurrency', 0)
+	state_manager.init_item('execution_model_concurrency', { 'face_detector': 2, 'face_enhancer': 1 })
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+
+	def count_concurrent_runs(model_context : str, model_concurrency : int) -> int:
+		run_lock = threading.Lock()
+		run_barrier = threading.Barrier(model_concurrency, timeout = 5)
+		run_counts : List[int] = [ 0, 0 ]
+
+		def forward(_ : int) -> None:
+			with conditional_model_semaphore(model_context):
+				with run_lock:
+					run_counts[0] += 1
+					run_counts[1] = max(run_counts[0], run_counts[1])
+				run_barrier.wait()
+				with run_lock:
+					run_counts[0] -= 1
+
+		with ThreadPoolExecutor(max_workers = 4) as executor:
+			list(executor.map(forward, range(model_concurrency * 8)))
+		return run_counts[1]
+
+	assert count_concurrent_runs('facefusion.face_detector', 2) == 2
+	assert count_concurrent_runs('facefusion.processors.modules.face_enhancer', 1) == 1
+
+	state_manager.init_item('execution_model_concurrency', None)